@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from functools import lru_cache
 
@@ -5,7 +6,8 @@ import yaml
 
 
 CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.yaml"
-DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+# DATA_DIR can be pointed elsewhere (e.g. a scratch dir for load tests)
+DATA_DIR = Path(os.environ.get("DATA_DIR") or Path(__file__).resolve().parent.parent / "data")
 
 
 def load_yaml_config() -> dict:
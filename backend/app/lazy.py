@@ -0,0 +1,26 @@
+"""Deferred imports for heavy libraries.
+
+``pd = lazy_import("pandas")`` registers the module but only executes it on
+first attribute access, so importing the app (and binding the port) doesn't
+pay for pandas, NumPy or PyArrow until a request or the warm-up needs them.
+Modules using this must not touch the library at import time; annotations
+stay lazy via ``from __future__ import annotations``.
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -1,12 +1,18 @@
 import logging
+import time
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.config import get_config
-from app.services.orchestrator import initialize
+from app.services import metrics, orchestrator
+from app.services import screener as screener_service
+from app.services.data_fetcher import UpstreamUnavailable
+from app.services.symbol_guard import UnknownTickerError
 from app.routers import health, heat_score, indicators, regime, action_plan, report, tickers
+from app.routers import correlation, latest, metrics as metrics_router, profiles, screener, sql
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,10 +24,12 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting S&P 500 Analysis Dashboard...")
-    initialize()
-    logger.info("Initialization complete, API ready")
+    # Bind the port right away; tickers are warmed in the background
+    orchestrator.start_warmup()
+    logger.info("API ready, warming up data in the background")
     yield
     logger.info("Shutting down...")
+    screener_service.shutdown()
 
 
 app = FastAPI(
@@ -30,6 +38,36 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+
+@app.exception_handler(UnknownTickerError)
+async def unknown_ticker_handler(request: Request, exc: UnknownTickerError):
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+
+@app.exception_handler(UpstreamUnavailable)
+async def upstream_unavailable_handler(request: Request, exc: UpstreamUnavailable):
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template, not the raw path, to bound cardinality
+        route = request.scope.get("route")
+        metrics.HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status),
+        )
+
+
 cfg = get_config()
 app.add_middleware(
     CORSMiddleware,
@@ -46,3 +84,9 @@ app.include_router(regime.router, prefix="/api")
 app.include_router(action_plan.router, prefix="/api")
 app.include_router(report.router, prefix="/api")
 app.include_router(tickers.router, prefix="/api")
+app.include_router(metrics_router.router, prefix="/api")
+app.include_router(profiles.router, prefix="/api")
+app.include_router(sql.router, prefix="/api")
+app.include_router(screener.router, prefix="/api")
+app.include_router(latest.router, prefix="/api")
+app.include_router(correlation.router, prefix="/api")
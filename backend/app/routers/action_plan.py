@@ -3,8 +3,9 @@ from fastapi import APIRouter, HTTPException, Query
 from app.schemas import ActionPlanResponse
 from app.services.orchestrator import get_state, get_default_ticker
 from app.i18n import t as tr, translate_reasoning
+from app.routers.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/action-plan", response_model=ActionPlanResponse)
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from app.schemas import CorrelationResponse
+from app.services import correlation
+from app.routers.timing import TimedRoute
+from app.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+router = APIRouter(route_class=TimedRoute)
+
+
+def _round(values, digits: int = 4):
+    # Nested lists for JSON; NaN (not enough data, zero variance) becomes null.
+    # Rounded as whole arrays: the rolling matrices can be large
+    a = np.round(np.asarray(values, dtype=float), digits)
+    return np.where(np.isnan(a), None, a).tolist()
+
+
+@router.get("/correlation", response_model=CorrelationResponse)
+def get_correlation(
+    tickers: list[str] = Query([], description="Tickers to include (default: every stored ticker)"),
+    window: int = Query(None, ge=5, le=1000, description="Sessions in the window"),
+    benchmark: str = Query(None, description="Benchmark for betas (default from config)"),
+    history: int = Query(0, ge=0, le=2000, description="Sessions of rolling beta/correlation to return"),
+    matrix_history: int = Query(
+        0, ge=0, le=2000, description="Sessions of full rolling correlation/covariance matrices to return"
+    ),
+):
+    symbols = [s.strip().upper() for t in tickers for s in t.split(",") if s.strip()]
+    try:
+        result = correlation.matrix(
+            symbols or None,
+            window=window,
+            benchmark=benchmark.upper() if benchmark else None,
+            history=history,
+            matrix_history=matrix_history,
+        )
+    except correlation.TooManyCells as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return CorrelationResponse(
+        tickers=result.tickers,
+        benchmark=result.benchmark,
+        window=result.window,
+        as_of=result.as_of,
+        observations=result.observations,
+        correlation=_round(result.correlation),
+        covariance=_round(result.covariance, 8),
+        volatility=_round(result.volatility),
+        beta=_round(result.beta),
+        performance=_round(result.performance),
+        relative_strength=_round(result.relative_strength),
+        history_dates=result.history_dates,
+        rolling_beta=_round(result.rolling_beta),
+        rolling_correlation=_round(result.rolling_correlation),
+        excluded=result.excluded,
+        matrix_dates=result.matrix_dates,
+        rolling_correlation_matrix=_round(result.rolling_correlation_matrix)
+        if result.rolling_correlation_matrix is not None else [],
+        rolling_covariance_matrix=_round(result.rolling_covariance_matrix, 8)
+        if result.rolling_covariance_matrix is not None else [],
+    )
@@ -1,39 +1,70 @@
+from dataclasses import asdict
+
 from fastapi import APIRouter, Query
 
-from app.schemas import HealthResponse
-from app.services.orchestrator import get_state, refresh_ticker, get_default_ticker
+from app.schemas import HealthResponse, CacheStatsResponse, MemoryResponse, StateMemoryInfo
+from app.services.orchestrator import (
+    get_state, refresh_ticker, get_default_ticker, cache_stats, memory_usage,
+)
+from app.services.state_cache import process_memory, state_memory
+from app.routers.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/health", response_model=HealthResponse)
 def health(ticker: str = Query(None)):
     t = ticker or get_default_ticker()
-    s = get_state(t)
+    # Report "initializing" instead of blocking while the warm-up runs
+    s = get_state(t, wait=False)
     return HealthResponse(
         status="ok" if s.ready else "initializing",
         active_ticker=s.active_ticker,
         used_fallback=s.used_fallback,
         fallback_reason=s.fallback_reason,
         last_refresh=s.last_refresh,
-        hourly_rows=len(s.hourly_df),
-        daily_rows=len(s.daily_df),
+        hourly_rows=s.rows("hourly"),
+        daily_rows=s.rows("daily"),
         ready=s.ready,
+        version=s.version,
+        memory_bytes=state_memory(s).total_bytes,
     )
 
 
 @router.post("/refresh", response_model=HealthResponse)
 def refresh_data(ticker: str = Query(None)):
     t = ticker or get_default_ticker()
-    refresh_ticker(t)
-    s = get_state(t)
+    s = refresh_ticker(t)
     return HealthResponse(
         status="ok" if s.ready else "initializing",
         active_ticker=s.active_ticker,
         used_fallback=s.used_fallback,
         fallback_reason=s.fallback_reason,
         last_refresh=s.last_refresh,
-        hourly_rows=len(s.hourly_df),
-        daily_rows=len(s.daily_df),
+        hourly_rows=s.rows("hourly"),
+        daily_rows=s.rows("daily"),
         ready=s.ready,
+        version=s.version,
+        memory_bytes=state_memory(s).total_bytes,
+    )
+
+
+@router.get("/health/cache", response_model=CacheStatsResponse)
+def state_cache_stats():
+    return CacheStatsResponse(**asdict(cache_stats()))
+
+
+@router.get("/health/memory", response_model=MemoryResponse)
+def memory_footprint():
+    usage = memory_usage()
+    rss, peak = process_memory()
+    return MemoryResponse(
+        process_rss_bytes=rss,
+        peak_rss_bytes=peak,
+        cached_bytes=sum(m.total_bytes for m in usage.values()),
+        mapped_bytes=sum(m.mapped_bytes for m in usage.values()),
+        states=[
+            StateMemoryInfo(ticker=t, total_bytes=m.total_bytes, **asdict(m))
+            for t, m in sorted(usage.items(), key=lambda kv: -kv[1].total_bytes)
+        ],
     )
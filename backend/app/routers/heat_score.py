@@ -1,10 +1,11 @@
 from fastapi import APIRouter, HTTPException, Query
 
-from app.schemas import HeatScoreResponse, ScoreComponentSchema
+from app.schemas import HeatScoreResponse, IntradayHeatScoreResponse, ScoreComponentSchema
 from app.services.orchestrator import get_state, get_default_ticker
-from app.i18n import t as tr, translate_description
+from app.i18n import t as tr, translate_description, translate_items
+from app.routers.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/heat-score", response_model=HeatScoreResponse)
@@ -14,18 +15,35 @@ def get_heat_score(ticker: str = Query(None), lang: str = Query("en")):
     if not s.ready or s.heat_score is None:
         raise HTTPException(status_code=503, detail="Data not ready")
 
+    intraday = None
+    if s.intraday_heat_score is not None and s.intraday_regime is not None:
+        intraday = IntradayHeatScoreResponse(
+            bar_time=s.intraday_bar[0],
+            score=s.intraday_heat_score.score,
+            label=tr(s.intraday_heat_score.label, lang),
+            components=_components(s.intraday_heat_score, lang),
+            regime=tr(s.intraday_regime.regime.value, lang),
+            risk_flags=translate_items([f.value for f in s.intraday_regime.risk_flags], lang),
+            confidence=s.intraday_regime.confidence,
+        )
+
     return HeatScoreResponse(
         score=s.heat_score.score,
         label=tr(s.heat_score.label, lang),
-        components=[
-            ScoreComponentSchema(
-                name=tr(c.name, lang),
-                raw_value=c.raw_value,
-                normalized=c.normalized,
-                weight=c.weight,
-                contribution=c.contribution,
-                description=translate_description(c.description, lang),
-            )
-            for c in s.heat_score.components
-        ],
+        components=_components(s.heat_score, lang),
+        intraday=intraday,
     )
+
+
+def _components(heat, lang: str) -> list[ScoreComponentSchema]:
+    return [
+        ScoreComponentSchema(
+            name=tr(c.name, lang),
+            raw_value=c.raw_value,
+            normalized=c.normalized,
+            weight=c.weight,
+            contribution=c.contribution,
+            description=translate_description(c.description, lang),
+        )
+        for c in heat.components
+    ]
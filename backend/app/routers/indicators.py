@@ -1,9 +1,13 @@
+from datetime import datetime, timedelta, timezone
+
 from fastapi import APIRouter, HTTPException, Query
 
 from app.schemas import IndicatorsResponse, OHLCVPoint, IndicatorPoint
+from app.services import breadth, resample
 from app.services.orchestrator import get_state, get_default_ticker
+from app.routers.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 def _safe_float(val) -> float | None:
@@ -18,17 +22,25 @@ def _safe_float(val) -> float | None:
 
 @router.get("/indicators", response_model=IndicatorsResponse)
 def get_indicators(
-    timeframe: str = Query("daily", pattern="^(daily|hourly)$"),
+    timeframe: str = Query("daily", pattern=f"^(daily|hourly|{'|'.join(resample.TIMEFRAMES)})$"),
     ticker: str = Query(None),
+    days: int = Query(None, ge=1, description="Only the last N days of bars"),
 ):
     t = ticker or get_default_ticker()
     s = get_state(t)
     if not s.ready:
         raise HTTPException(status_code=503, detail="Data not ready")
 
-    df = s.daily_df if timeframe == "daily" else s.hourly_df
-    if df.empty:
-        raise HTTPException(status_code=404, detail=f"No {timeframe} data available")
+    start = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+    if timeframe in resample.TIMEFRAMES:
+        # Built from the stored bars; no download
+        df = resample.indicators(s.active_ticker, timeframe, start=start)
+        if df.empty:
+            raise HTTPException(status_code=404, detail=f"No {timeframe} data available")
+    else:
+        if s.rows(timeframe) == 0:
+            raise HTTPException(status_code=404, detail=f"No {timeframe} data available")
+        df = s.frame(timeframe, start=start)
 
     ohlcv = []
     for ts, row in df.iterrows():
@@ -75,4 +87,5 @@ def get_indicators(
         bb_lower=_series("BBL_20_2.0"),
         volatility=_series("volatility"),
         drawdown=_series("drawdown"),
+        breadth={col: _series(col) for col in breadth.SERIES if col in df.columns},
     )
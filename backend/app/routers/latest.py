@@ -0,0 +1,42 @@
+import time
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.schemas import LatestResponse, LatestRow
+from app.services import latest_table
+from app.routers.timing import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("/latest", response_model=LatestResponse)
+def get_latest(
+    where: list[str] = Query([], description='Numeric conditions, e.g. "rsi<30" (all must hold)'),
+    regime: str = Query(None),
+    label: str = Query(None),
+    action: str = Query(None),
+    flag: list[str] = Query([], description="Risk flags that must all be set"),
+    sort: str = Query("score", pattern=f"^({'|'.join(latest_table.SORT_FIELDS)})$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    limit: int = Query(50, ge=1, le=1000),
+):
+    start = time.perf_counter()
+    try:
+        conditions = [latest_table.Condition.parse(w) for w in where]
+        total, rows = latest_table.TABLE.query(
+            conditions,
+            regime=regime,
+            label=label,
+            action=action,
+            flags=flag,
+            sort=sort,
+            descending=order == "desc",
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return LatestResponse(
+        total=total,
+        elapsed_us=round((time.perf_counter() - start) * 1e6, 1),
+        rows=[LatestRow(**r) for r in rows],
+    )
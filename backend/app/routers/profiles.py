@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from app.schemas import ProfileArmResponse, ProfileInfo, ProfileListResponse
+from app.services import profiler, symbol_guard
+
+# A plain router on purpose: TimedRoute would treat the admin token header
+# as a request to profile these endpoints too
+router = APIRouter()
+
+
+def require_admin(x_profile_token: str = Header(None)) -> None:
+    if not profiler.enabled():
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not profiler.authorized(x_profile_token):
+        raise HTTPException(status_code=403, detail="Invalid profile token")
+
+
+@router.get(
+    "/admin/profiles",
+    response_model=ProfileListResponse,
+    dependencies=[Depends(require_admin)],
+)
+def list_profiles():
+    return ProfileListResponse(profiles=[ProfileInfo(**p) for p in profiler.list_profiles()])
+
+
+@router.get("/admin/profiles/{name}", dependencies=[Depends(require_admin)])
+def get_profile(name: str, format: str = Query("text", pattern="^(text|pstats)$")):
+    path = profiler.profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"No profile named {name}")
+    if format == "pstats":
+        return FileResponse(path, media_type="application/octet-stream", filename=name)
+    return PlainTextResponse(profiler.summarize(path))
+
+
+@router.post(
+    "/admin/profiles/arm",
+    response_model=ProfileArmResponse,
+    dependencies=[Depends(require_admin)],
+)
+def arm_refresh_profile(ticker: str = Query(...)):
+    symbol_guard.check_symbol(ticker)
+    target = f"refresh:{ticker}"
+    profiler.arm(target)
+    return ProfileArmResponse(target=target)
@@ -3,8 +3,9 @@ from fastapi import APIRouter, HTTPException, Query
 from app.schemas import ReportResponse
 from app.services.orchestrator import get_state, get_default_ticker
 from app.i18n import translate_report
+from app.routers.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/report", response_model=ReportResponse)
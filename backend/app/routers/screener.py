@@ -0,0 +1,48 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter, Query
+
+from app.schemas import ScreenerEntry, ScreenerRefreshResponse, ScreenerResponse
+from app.services import screener
+from app.routers.timing import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("/screener", response_model=ScreenerResponse)
+def get_screener(
+    sort: str = Query("score", pattern=f"^({'|'.join(screener.SORT_FIELDS)})$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    regime: str = Query(None),
+    label: str = Query(None),
+    min_score: float = Query(None, ge=0, le=100),
+    max_score: float = Query(None, ge=0, le=100),
+    include_errors: bool = Query(False),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+):
+    results = screener.results()
+    ranked = screener.rank(
+        results.rows,
+        sort=sort,
+        descending=order == "desc",
+        regime=regime,
+        label=label,
+        min_score=min_score,
+        max_score=max_score,
+        include_errors=include_errors,
+    )
+    return ScreenerResponse(
+        as_of=results.as_of,
+        running=screener.is_running(),
+        universe_size=results.universe_size,
+        duration_s=results.duration_s,
+        total=len(ranked),
+        entries=[ScreenerEntry(**asdict(r)) for r in ranked[offset:offset + limit]],
+    )
+
+
+@router.post("/screener/refresh", response_model=ScreenerRefreshResponse, status_code=202)
+def refresh_screener():
+    started = screener.start()
+    return ScreenerRefreshResponse(started=started, running=screener.is_running())
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.schemas import SqlQueryRequest
+from app.services import sql_engine
+from app.routers.timing import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.post("/sql")
+def run_sql(body: SqlQueryRequest, x_sql_token: str | None = Header(default=None)):
+    """Run a read-only SELECT over the store; rows stream back as NDJSON."""
+    if not sql_engine.enabled():
+        raise HTTPException(status_code=404, detail="SQL endpoint is disabled")
+    if not sql_engine.authorized(x_sql_token):
+        raise HTTPException(status_code=403, detail="Invalid SQL token")
+    try:
+        lines = sql_engine.stream(body.query, body.max_rows)
+    except sql_engine.QueryRejected as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except sql_engine.QueryBusy as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except sql_engine.QueryTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
@@ -2,8 +2,9 @@ from fastapi import APIRouter
 
 from app.config import get_config
 from app.schemas import TickersResponse, TickerInfo
+from app.routers.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/tickers", response_model=TickersResponse)
@@ -0,0 +1,121 @@
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Iterator
+
+from fastapi import HTTPException, Request
+from fastapi.routing import APIRoute
+
+from app.services import metrics, profiler
+
+# Set per request by TimedRoute; the wrapped endpoint appends its own runtime
+_endpoint_seconds: ContextVar[list[float] | None] = ContextVar("endpoint_seconds", default=None)
+
+# Set when an admin asked for this request to be profiled; the endpoint
+# wrapper stores the capture result (its stored name) in it
+_profile_request: ContextVar[dict | None] = ContextVar("profile_request", default=None)
+
+
+def _record_endpoint(elapsed: float) -> None:
+    holder = _endpoint_seconds.get()
+    if holder is not None:
+        holder.append(elapsed)
+
+
+@contextmanager
+def _maybe_profile() -> Iterator[None]:
+    """Profile the endpoint if this request asked for it.
+
+    Entered inside the endpoint wrapper so cProfile runs on the thread that
+    executes the endpoint (sync endpoints run in the threadpool).
+    """
+    req = _profile_request.get()
+    if req is None:
+        yield
+        return
+    try:
+        with profiler.capture(req["label"]) as result:
+            req["result"] = result
+            yield
+    except profiler.ProfilerBusy as e:
+        raise HTTPException(status_code=429, detail=f"Profiler busy: {e}")
+
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    # include_router() rebuilds routes from the already wrapped endpoint
+    if getattr(endpoint, "_timed", False):
+        return endpoint
+    if inspect.iscoroutinefunction(endpoint):
+        @wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                with _maybe_profile():
+                    return await endpoint(*args, **kwargs)
+            finally:
+                _record_endpoint(time.perf_counter() - start)
+        async_wrapper._timed = True
+        return async_wrapper
+
+    @wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            with _maybe_profile():
+                return endpoint(*args, **kwargs)
+        finally:
+            _record_endpoint(time.perf_counter() - start)
+    wrapper._timed = True
+    return wrapper
+
+
+def _profile_token(request: Request) -> str | None:
+    # Header only: query strings end up in access logs and browser history
+    return request.headers.get("x-profile-token")
+
+
+class TimedRoute(APIRoute):
+    """Route that records how long FastAPI spends around the endpoint.
+
+    The handler's total time minus the endpoint's own runtime is what goes
+    into validating the response model and encoding it to JSON. Requests
+    carrying the admin profile token are also run under the profiler, and
+    the stored capture is named in the ``X-Profile-Id`` response header.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route = self.path
+
+        async def timed_handler(request: Request):
+            profile_req = None
+            token = _profile_token(request)
+            if token is not None and profiler.enabled():
+                if not profiler.authorized(token):
+                    raise HTTPException(status_code=403, detail="Invalid profile token")
+                profile_req = {"label": f"{request.method} {route}"}
+
+            holder: list[float] = []
+            timing_token = _endpoint_seconds.set(holder)
+            profile_token = _profile_request.set(profile_req)
+            start = time.perf_counter()
+            try:
+                response = await handler(request)
+            finally:
+                total = time.perf_counter() - start
+                _endpoint_seconds.reset(timing_token)
+                _profile_request.reset(profile_token)
+                if holder:
+                    metrics.HTTP_SERIALIZATION_SECONDS.observe(
+                        max(total - holder[0], 0.0), route=route
+                    )
+            if profile_req is not None and "result" in profile_req:
+                response.headers["X-Profile-Id"] = profile_req["result"]["name"]
+            return response
+
+        return timed_handler
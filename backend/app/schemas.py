@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class TickerInfo(BaseModel):
@@ -20,6 +20,50 @@ class HealthResponse(BaseModel):
     hourly_rows: int
     daily_rows: int
     ready: bool
+    version: int
+    memory_bytes: int
+
+
+class CacheStatsResponse(BaseModel):
+    entries: int
+    pinned: int
+    resident_bytes: int
+    max_entries: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class StateMemoryInfo(BaseModel):
+    ticker: str
+    hourly_bytes: int
+    daily_bytes: int
+    report_bytes: int
+    results_bytes: int
+    mapped_bytes: int
+    total_bytes: int
+
+
+class MemoryResponse(BaseModel):
+    process_rss_bytes: int | None
+    peak_rss_bytes: int
+    cached_bytes: int
+    mapped_bytes: int
+    states: list[StateMemoryInfo]
+
+
+class ProfileInfo(BaseModel):
+    name: str
+    size_bytes: int
+
+
+class ProfileListResponse(BaseModel):
+    profiles: list[ProfileInfo]
+
+
+class ProfileArmResponse(BaseModel):
+    target: str
 
 
 class ScoreComponentSchema(BaseModel):
@@ -31,10 +75,22 @@ class ScoreComponentSchema(BaseModel):
     description: str
 
 
+class IntradayHeatScoreResponse(BaseModel):
+    bar_time: str
+    score: float
+    label: str
+    components: list[ScoreComponentSchema]
+    regime: str
+    risk_flags: list[str]
+    confidence: float
+
+
 class HeatScoreResponse(BaseModel):
     score: float
     label: str
     components: list[ScoreComponentSchema]
+    # Same score on the latest hourly bar, with ranges scaled for the timeframe
+    intraday: IntradayHeatScoreResponse | None = None
 
 
 class RegimeResponse(BaseModel):
@@ -89,3 +145,93 @@ class IndicatorsResponse(BaseModel):
     bb_lower: list[IndicatorPoint]
     volatility: list[IndicatorPoint]
     drawdown: list[IndicatorPoint]
+    # Breadth series, for the "@BREADTH" pseudo-ticker
+    breadth: dict[str, list[IndicatorPoint]] = {}
+
+
+class SqlQueryRequest(BaseModel):
+    query: str = Field(..., min_length=1)
+    max_rows: int | None = Field(None, ge=1)
+
+
+class ScreenerEntry(BaseModel):
+    ticker: str
+    score: float | None
+    label: str | None
+    regime: str | None
+    confidence: float | None
+    risk_flags: list[str]
+    close: float | None
+    change_1d: float | None
+    rsi: float | None
+    drawdown: float | None
+    last_bar: str | None
+    error: str | None
+
+
+class ScreenerResponse(BaseModel):
+    as_of: str | None
+    running: bool
+    universe_size: int
+    duration_s: float
+    total: int
+    entries: list[ScreenerEntry]
+
+
+class ScreenerRefreshResponse(BaseModel):
+    started: bool
+    running: bool
+
+
+class LatestRow(BaseModel):
+    ticker: str
+    active_ticker: str
+    close: float | None
+    change_1d: float | None
+    rsi: float | None
+    macd_hist: float | None
+    bb_pct: float | None
+    dist_ma50: float | None
+    dist_ma200: float | None
+    drawdown: float | None
+    volatility: float | None
+    momentum_5d: float | None
+    score: float | None
+    confidence: float | None
+    intraday_score: float | None
+    regime: str | None
+    label: str | None
+    action: str | None
+    risk_flags: list[str]
+    last_bar: str
+    version: int
+
+
+class LatestResponse(BaseModel):
+    total: int
+    elapsed_us: float
+    rows: list[LatestRow]
+
+
+class CorrelationResponse(BaseModel):
+    tickers: list[str]
+    benchmark: str | None
+    window: int
+    as_of: str | None
+    observations: int
+    # Matrices are row-major, indexed like `tickers`
+    correlation: list[list[float | None]]
+    covariance: list[list[float | None]]
+    volatility: list[float | None]
+    beta: list[float | None]
+    performance: list[float | None]
+    relative_strength: list[list[float | None]]
+    history_dates: list[str]
+    rolling_beta: list[list[float | None]]
+    rolling_correlation: list[list[float | None]]
+    # Tickers left out for missing too many of the window's sessions
+    excluded: list[str]
+    # One matrix per date, with `matrix_history`
+    matrix_dates: list[str]
+    rolling_correlation_matrix: list[list[list[float | None]]]
+    rolling_covariance_matrix: list[list[list[float | None]]]
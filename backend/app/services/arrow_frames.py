@@ -0,0 +1,114 @@
+"""Memory-mapped Arrow IPC frames.
+
+Indicator frames are written as uncompressed Arrow IPC files and opened
+through a memory map, so a frame costs no resident memory until its pages
+are touched and re-opening it needs no parquet decode or pandas copy.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import weakref
+from datetime import datetime
+from pathlib import Path
+
+from app.lazy import lazy_import
+
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
+
+logger = logging.getLogger(__name__)
+
+
+def write_frame(df: pd.DataFrame, path: Path, metadata: dict[str, str] | None = None) -> None:
+    """Atomically write *df* as an Arrow IPC file that maps back zero-copy.
+
+    Float NaNs are kept as values rather than converted to nulls, so float
+    columns come back as views into the mapped file. *metadata* is added to
+    the schema metadata (see ``ArrowFrame.metadata``).
+    """
+    table = pa.Table.from_pandas(df)
+    if metadata:
+        table = table.replace_schema_metadata(
+            {**table.schema.metadata, **{k.encode(): v.encode() for k, v in metadata.items()}}
+        )
+    for i, name in enumerate(table.column_names):
+        if name in df.columns and df[name].dtype.kind == "f":
+            table = table.set_column(
+                i, table.schema.field(i), pa.array(df[name].to_numpy(), from_pandas=False)
+            )
+    tmp = path.with_suffix(".arrow.tmp")
+    with pa.ipc.new_file(tmp, table.schema) as writer:
+        writer.write_table(table)
+    # Readers that mapped the previous file keep their (unlinked) copy
+    os.replace(tmp, path)
+
+
+def read_frame(path: Path) -> pd.DataFrame:
+    """Memory-map an Arrow IPC file into a read-only DataFrame."""
+    return ArrowFrame(path).to_pandas()
+
+
+class ArrowFrame:
+    """Lazy handle on a memory-mapped frame.
+
+    Only the file footer is read on open. ``to_pandas()`` builds read-only
+    pandas views over the mapped buffers and reuses them while any caller
+    still holds one.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._table = pa.ipc.open_file(pa.memory_map(str(self.path), "r")).read_all()
+        self._view: weakref.ref | None = None
+
+    def __len__(self) -> int:
+        return self._table.num_rows
+
+    @property
+    def empty(self) -> bool:
+        return self._table.num_rows == 0
+
+    @property
+    def columns(self) -> list[str]:
+        return self._table.column_names
+
+    @property
+    def table(self) -> pa.Table:
+        """The mapped Arrow table itself (index as a regular column)."""
+        return self._table
+
+    @property
+    def metadata(self) -> dict[str, str]:
+        """Schema metadata written with the frame, besides pandas' own."""
+        raw = self._table.schema.metadata or {}
+        return {k.decode(): v.decode() for k, v in raw.items() if k != b"pandas"}
+
+    @property
+    def mapped_nbytes(self) -> int:
+        """Size of the mapped buffers (shared page cache, not private memory)."""
+        return self._table.nbytes
+
+    def to_pandas(self) -> pd.DataFrame:
+        df = self._view() if self._view is not None else None
+        if df is None:
+            df = self._table.to_pandas(split_blocks=True)
+            self._view = weakref.ref(df)
+        return df
+
+    def tail(self, n: int) -> pd.DataFrame:
+        start = max(self._table.num_rows - n, 0)
+        return self._table.slice(start).to_pandas(split_blocks=True)
+
+    def since(self, start: datetime) -> pd.DataFrame:
+        """Rows at or after *start*; only that slice is converted."""
+        index_col = self._table.schema.pandas_metadata["index_columns"][0]
+        stamps = self._table.column(index_col).to_numpy()
+        target = pd.Timestamp(start).tz_convert("UTC").tz_localize(None).to_datetime64()
+        first = int(stamps.searchsorted(target))
+        return self._table.slice(first).to_pandas(split_blocks=True)
+
+
+def as_pandas(frame: "pd.DataFrame | ArrowFrame") -> pd.DataFrame:
+    return frame.to_pandas() if isinstance(frame, ArrowFrame) else frame
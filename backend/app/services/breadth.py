@@ -0,0 +1,193 @@
+"""Market breadth across every ticker with stored daily bars.
+
+The daily closes of all constituents are read from the consolidated dataset
+as one aligned matrix, and each series is a vectorized reduction across its
+columns:
+
+- ``members``: names with a close that session
+- ``advancers`` / ``decliners`` and the cumulative advance/decline line
+- ``new_highs`` / ``new_lows``: closes at a ``high_low_window``-session extreme
+- ``pct_above_sma50`` / ``pct_above_sma200``
+- ``pct_trend_up`` / ``pct_trend_down`` / ``pct_range``: the share of names in
+  each regime, classified on SMA alignment as ``detect_regime`` does
+
+Percentages are 0–100, of the names with enough history for the measure.
+
+The series are stored as the daily bars of the ``@BREADTH`` pseudo-ticker,
+which the chart endpoints serve like any other ticker. They are not mirrored
+into the dataset, so breadth never counts itself. When constituents refresh,
+only the last ``overlap_sessions`` sessions are recomputed and merged. A
+constituent that joined or left the universe triggers a full recompute.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from datetime import timedelta
+
+from app.config import get_config
+from app.services import dataset, parquet_store
+from app.services.correlation import session_closes
+from app.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+TICKER = "@BREADTH"
+SERIES = (
+    "members", "advancers", "decliners", "ad_line", "new_highs", "new_lows",
+    "pct_above_sma50", "pct_above_sma200", "pct_trend_up", "pct_trend_down", "pct_range",
+)
+
+# Sessions a constituent's close is carried over a gap (e.g. its exchange's holiday)
+_FILL_LIMIT = 5
+
+_lock = threading.Lock()
+
+
+def _cfg() -> dict:
+    return get_config().get("breadth", {})
+
+
+def enabled() -> bool:
+    return _cfg().get("enabled", True) and dataset.enabled()
+
+
+def _pct(count, total):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, 100.0 * count / total, np.nan)
+
+
+def compute(closes: pd.DataFrame, high_low_window: int = 252) -> pd.DataFrame:
+    """Breadth series for the wide, session-aligned *closes* (one column per name).
+
+    ``ad_line`` starts from zero at the first row.
+    """
+    filled = closes.ffill(limit=_FILL_LIMIT)
+    c = filled.to_numpy(dtype=float)
+    present = ~np.isnan(c)
+    change = np.diff(c, axis=0, prepend=np.full((1, c.shape[1]), np.nan))
+    advancers = (change > 0).sum(axis=1)
+    decliners = (change < 0).sum(axis=1)
+
+    sma50 = filled.rolling(50).mean().to_numpy()
+    sma200 = filled.rolling(200).mean().to_numpy()
+    high = filled.rolling(high_low_window).max().to_numpy()
+    low = filled.rolling(high_low_window).min().to_numpy()
+    with np.errstate(invalid="ignore"):
+        trend_up = (c > sma50) & (sma50 > sma200)
+        trend_down = (c < sma50) & (sma50 < sma200)
+        new_highs = (c >= high).sum(axis=1)
+        new_lows = (c <= low).sum(axis=1)
+        above50 = (c > sma50).sum(axis=1)
+        above200 = (c > sma200).sum(axis=1)
+    has50, has200 = ~np.isnan(sma50), ~np.isnan(sma200)
+    classified = has200.sum(axis=1)
+    up, down = trend_up.sum(axis=1), trend_down.sum(axis=1)
+
+    return pd.DataFrame(
+        {
+            "members": present.sum(axis=1).astype(float),
+            "advancers": advancers.astype(float),
+            "decliners": decliners.astype(float),
+            "ad_line": np.cumsum(advancers - decliners).astype(float),
+            "new_highs": new_highs.astype(float),
+            "new_lows": new_lows.astype(float),
+            "pct_above_sma50": _pct(above50, has50.sum(axis=1)),
+            "pct_above_sma200": _pct(above200, classified),
+            "pct_trend_up": _pct(up, classified),
+            "pct_trend_down": _pct(down, classified),
+            "pct_range": _pct(classified - up - down, classified),
+        },
+        index=closes.index,
+    )
+
+
+def constituents() -> list[str]:
+    return [t for t in dataset.tickers("daily") if t != TICKER]
+
+
+def _stamp_file():
+    return parquet_store.ticker_dir(TICKER) / "constituents.json"
+
+
+def _read_stamp() -> dict[str, int | None]:
+    try:
+        with open(_stamp_file(), "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable breadth stamp: {e}")
+        return {}
+
+
+def _write_stamp(stamp: dict[str, int | None]) -> None:
+    path = _stamp_file()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(stamp, f)
+    tmp.replace(path)
+
+
+def _read_closes(tickers: list[str], since: pd.Timestamp | None) -> pd.DataFrame:
+    closes = dataset.read_matrix("daily", tickers=tickers, start=since)
+    return session_closes(closes) if not closes.empty else closes
+
+
+def update() -> int | None:
+    """Bring the stored breadth series up to date with its constituents.
+
+    Returns the store version of the series, or None when there is nothing
+    to compute from. Cheap when no constituent changed since the last call.
+    """
+    if not enabled():
+        return None
+    with _lock:
+        tickers = constituents()
+        stamp = {t: parquet_store.store_version(t) for t in tickers}
+        previous = _read_stamp()
+        version = parquet_store.store_version(TICKER)
+        if stamp == previous and version is not None:
+            return version
+        if not tickers:
+            return version
+
+        window = _cfg().get("high_low_window", 252)
+        overlap = _cfg().get("overlap_sessions", 10)
+        stored = parquet_store.load("daily", ticker=TICKER, columns=["ad_line"])
+        fresh = None
+        if set(stamp) == set(previous) and len(stored) > overlap:
+            # A refresh only rewrites recent bars: recompute the overlap, with
+            # enough history before it for the 200-session and high/low windows
+            cut = stored.index[-overlap]
+            lookback = max(200, window) + overlap
+            since = cut - timedelta(days=int(lookback * 7 / 5 * 1.1) + 14)
+            fresh = compute(_read_closes(tickers, since), window)
+            before = fresh.index < cut
+            if before.any():
+                # Continue the cumulative line from the last row kept
+                base = stored.loc[stored.index < cut, "ad_line"].iloc[-1]
+                fresh["ad_line"] += base - fresh.loc[before, "ad_line"].iloc[-1]
+                fresh = fresh[~before]
+                mode = "incremental"
+            else:
+                fresh = None
+        if fresh is None:
+            fresh = compute(_read_closes(tickers, None), window)
+            mode = "full"
+
+        if not fresh.empty:
+            parquet_store.save(fresh, "daily", ticker=TICKER)
+        _write_stamp(stamp)
+        logger.info(f"Breadth {mode} update over {len(tickers)} names: {len(fresh)} sessions")
+        return parquet_store.store_version(TICKER)
+
+
+def load() -> pd.DataFrame:
+    return parquet_store.load("daily", ticker=TICKER)
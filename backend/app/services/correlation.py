@@ -0,0 +1,324 @@
+"""Cross-ticker correlation, beta and relative strength.
+
+Daily closes of all stored tickers come from the consolidated dataset in one
+scan. They are aligned on session date and turned into log returns; a return
+is missing where the ticker has no close that session or the one before.
+Every pair is measured over the sessions both tickers have a return
+(pairwise-complete), so one gappy ticker doesn't shrink everyone's window.
+Tickers with returns on fewer than ``min_coverage`` of the window's sessions
+are left out and reported as excluded. The return matrix then gives:
+
+- the correlation and covariance matrix over the last ``window`` sessions
+  (masked matrix products)
+- optionally the same matrices over time, updated one session at a time by
+  adding the entering and subtracting the leaving session's moments
+- each ticker's beta and correlation to a benchmark over time, from
+  cumulative sums of the rolling moments: O(T·N), no per-window or
+  per-pair loops
+- relative strength, as the ratio of every pair's growth over the window
+
+Results are cached until any of the involved tickers is written again.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from app.config import get_config
+from app.services import dataset, parquet_store
+from app.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+_CACHE_SIZE = 16
+_cache: OrderedDict[tuple, "CorrelationResult"] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class CorrelationResult:
+    tickers: list[str]
+    benchmark: str | None
+    window: int
+    as_of: str | None
+    observations: int
+    correlation: np.ndarray   # N×N
+    covariance: np.ndarray    # N×N, daily log returns
+    volatility: np.ndarray    # N, annualized
+    beta: np.ndarray          # N, against the benchmark
+    performance: np.ndarray   # N, log growth over the window
+    relative_strength: np.ndarray  # N×N, growth of row ticker / column ticker
+    history_dates: list[str]
+    rolling_beta: np.ndarray         # H×N
+    rolling_correlation: np.ndarray  # H×N, to the benchmark
+    excluded: list[str] = field(default_factory=list)  # too few sessions in the window
+    matrix_dates: list[str] = field(default_factory=list)
+    rolling_correlation_matrix: np.ndarray | None = None  # M×N×N
+    rolling_covariance_matrix: np.ndarray | None = None   # M×N×N
+
+
+class TooManyCells(ValueError):
+    """The requested rolling matrices exceed ``correlation.max_matrix_cells``."""
+
+
+def _cfg() -> dict:
+    return get_config().get("correlation", {})
+
+
+def session_closes(closes: pd.DataFrame) -> pd.DataFrame:
+    """Align daily closes from different exchanges on session date.
+
+    Daily bars are stamped at local midnight, e.g. 04:00 UTC in New York or
+    22:00 UTC (the day before) in Frankfurt. Shifting by 12h before taking
+    the date maps both to the session they belong to.
+    """
+    dates = (closes.index + pd.Timedelta(hours=12)).normalize()
+    return closes.groupby(dates).last()
+
+
+def log_returns(closes: pd.DataFrame) -> pd.DataFrame:
+    """Log returns of session-aligned *closes*, NaN where either close is
+    missing. Sessions where no ticker has a return are dropped."""
+    return np.log(closes).diff().iloc[1:].dropna(how="all")
+
+
+def min_observations(window: int, coverage: float) -> int:
+    """Sessions a pair needs in a *window* for its statistics to be reported."""
+    return max(2, math.ceil(window * coverage))
+
+
+def _pairwise(n, sx, sxx, sxy, min_obs: int) -> tuple[np.ndarray, np.ndarray]:
+    """Covariance and correlation from pairwise window sums.
+
+    ``n[i, j]`` counts the sessions where both i and j have a return,
+    ``sx[i, j]`` and ``sxx[i, j]`` sum i's returns and squares over those
+    sessions, ``sxy[i, j]`` sums the products. Pairs with fewer than
+    *min_obs* sessions are NaN. Matches pandas' pairwise ``cov``/``corr``.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = (sxy - sx * np.swapaxes(sx, -1, -2) / n) / (n - 1)
+        var = (sxx - sx * sx / n) / (n - 1)
+        corr = cov / np.sqrt(var * np.swapaxes(var, -1, -2))
+    short = n < min_obs
+    cov, corr = np.where(short, np.nan, cov), np.where(short, np.nan, corr)
+    diagonal = np.arange(cov.shape[-1])
+    sd = np.sqrt(cov[..., diagonal, diagonal])
+    corr[..., diagonal, diagonal] = np.where(sd > 0, 1.0, np.nan)
+    return cov, corr
+
+
+def _window_sums(m: np.ndarray, x: np.ndarray) -> tuple[np.ndarray, ...]:
+    mf = m.astype(float)
+    return mf.T @ mf, x.T @ mf, (x * x).T @ mf, x.T @ x
+
+
+def rolling_matrices(returns: np.ndarray, window: int, count: int, min_obs: int) -> tuple[np.ndarray, np.ndarray]:
+    """Covariance and correlation matrices of the last *count* windows.
+
+    The first window's sums come from one set of matrix products; each later
+    window adds the outer products of the session entering it and subtracts
+    those of the session leaving it, so every step costs O(N²) however long
+    the window is.
+    """
+    t, n = returns.shape
+    count = min(count, max(t - window + 1, 0))
+    if count <= 0:
+        return np.empty((0, n, n)), np.empty((0, n, n))
+    m = ~np.isnan(returns)
+    x = np.where(m, returns, 0.0)
+    mf = m.astype(float)
+    first = t - window - count + 1
+    sums = list(_window_sums(m[first:first + window], x[first:first + window]))
+    out = np.empty((4, count, n, n))
+    out[:, 0] = sums
+    for k in range(1, count):
+        new, old = first + window + k - 1, first + k - 1
+        for s, (a, b) in enumerate(((mf, mf), (x, mf), (x * x, mf), (x, x))):
+            sums[s] += np.outer(a[new], b[new]) - np.outer(a[old], b[old])
+        out[:, k] = sums
+    return _pairwise(*out, min_obs)
+
+
+def rolling_moments(
+    returns: np.ndarray, benchmark: np.ndarray, window: int, min_obs: int | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Rolling beta and correlation of each column of *returns* to *benchmark*.
+
+    Window sums come from differences of cumulative sums, so every window
+    costs O(N) regardless of its length. Each column is measured over the
+    sessions where both it and the benchmark have a return; windows with
+    fewer than *min_obs* such sessions (default: all of them) and rows
+    before the first full window are NaN.
+    """
+    t = len(returns)
+    if t < window:
+        empty = np.full((t, returns.shape[1]), np.nan)
+        return empty, empty.copy()
+    m = ~np.isnan(returns) & ~np.isnan(benchmark)[:, None]
+    x = np.where(m, returns, 0.0)
+    b = np.where(m, benchmark[:, None], 0.0)
+
+    def window_sums(v: np.ndarray) -> np.ndarray:
+        c = np.cumsum(np.vstack([np.zeros((1, v.shape[1])), v]), axis=0)
+        return c[window:] - c[:-window]
+
+    n = window_sums(m.astype(float))
+    sx, sxx = window_sums(x), window_sums(x * x)
+    sb, sbb = window_sums(b), window_sums(b * b)
+    sxb = window_sums(x * b)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = (sxb - sx * sb / n) / (n - 1)
+        var_x = (sxx - sx * sx / n) / (n - 1)
+        var_b = (sbb - sb * sb / n) / (n - 1)
+        beta = cov / var_b
+        corr = cov / np.sqrt(var_x * var_b)
+    short = n < (min_obs or window)
+    beta[short] = corr[short] = np.nan
+    pad = np.full((window - 1, returns.shape[1]), np.nan)
+    return np.vstack([pad, beta]), np.vstack([pad, corr])
+
+
+def compute(
+    closes: pd.DataFrame,
+    window: int,
+    benchmark: str | None = None,
+    history: int = 0,
+    trading_days: int = 252,
+    min_coverage: float = 0.8,
+    matrix_history: int = 0,
+) -> CorrelationResult:
+    """Statistics for the wide *closes* frame (one column per ticker)."""
+    sessions = session_closes(closes) if not closes.empty else closes
+    returns = log_returns(sessions) if not closes.empty else pd.DataFrame(columns=closes.columns)
+    # Leave out tickers missing from too many of the window's sessions
+    counts = returns.tail(window).notna().sum()
+    needed = len(returns.tail(window)) * min_coverage
+    excluded = [t for t in returns.columns if counts[t] < needed]
+    if excluded:
+        logger.info(f"Correlation excludes {excluded}: returns on fewer than {needed:.0f} sessions")
+        sessions = sessions.drop(columns=excluded)
+        returns = returns.drop(columns=excluded).dropna(how="all")
+
+    tickers = list(returns.columns)
+    r = returns.to_numpy(dtype=float)
+    n = len(tickers)
+    last = r[-window:]
+    obs = len(last)
+    min_obs = min_observations(window, min_coverage)
+
+    m = ~np.isnan(last)
+    sums = _window_sums(m, np.where(m, last, 0.0))
+    cov, corr = _pairwise(*sums, max(2, min(obs, min_obs)))
+    sd = np.sqrt(np.diag(cov))
+
+    if obs:
+        # Log growth from the close before the window to the last close
+        log_closes = np.log(sessions).ffill()
+        before = log_closes.index.get_loc(returns.index[-obs]) - 1
+        performance = (log_closes.iloc[-1] - log_closes.iloc[before]).to_numpy(dtype=float)
+    else:
+        performance = np.full(n, np.nan)
+    relative_strength = np.exp(performance[:, None] - performance[None, :])
+
+    if benchmark in tickers and obs >= 2:
+        b = tickers.index(benchmark)
+        # The benchmark's variance over the sessions each ticker shares with it
+        count, sx, sxx = sums[0][b], sums[1][b], sums[2][b]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            beta = cov[:, b] / ((sxx - sx * sx / count) / (count - 1))
+    else:
+        beta = np.full(n, np.nan)
+
+    if history and benchmark in tickers:
+        rolling_beta, rolling_corr = rolling_moments(r, r[:, tickers.index(benchmark)], window, min_obs)
+        rolling_beta, rolling_corr = rolling_beta[-history:], rolling_corr[-history:]
+        history_dates = [d.date().isoformat() for d in returns.index[-history:]]
+    else:
+        rolling_beta = rolling_corr = np.empty((0, n))
+        history_dates = []
+
+    if matrix_history:
+        rolling_cov, rolling_corr_matrix = rolling_matrices(r, window, matrix_history, min_obs)
+        matrix_dates = [d.date().isoformat() for d in returns.index[len(r) - len(rolling_cov):]]
+    else:
+        rolling_cov = rolling_corr_matrix = None
+        matrix_dates = []
+
+    return CorrelationResult(
+        tickers=tickers,
+        benchmark=benchmark if benchmark in tickers else None,
+        window=window,
+        as_of=returns.index[-1].date().isoformat() if len(returns) else None,
+        observations=obs,
+        correlation=corr,
+        covariance=cov,
+        volatility=sd * np.sqrt(trading_days),
+        beta=beta,
+        performance=performance,
+        relative_strength=relative_strength,
+        history_dates=history_dates,
+        rolling_beta=rolling_beta,
+        rolling_correlation=rolling_corr,
+        excluded=excluded,
+        matrix_dates=matrix_dates,
+        rolling_correlation_matrix=rolling_corr_matrix,
+        rolling_covariance_matrix=rolling_cov,
+    )
+
+
+def matrix(
+    tickers: list[str] | None = None,
+    window: int | None = None,
+    benchmark: str | None = None,
+    history: int = 0,
+    matrix_history: int = 0,
+) -> CorrelationResult:
+    """Statistics for *tickers* (default: every ticker in the dataset), cached.
+
+    Raises TooManyCells if *matrix_history* matrices over these tickers
+    exceed ``correlation.max_matrix_cells``.
+    """
+    cfg = _cfg()
+    window = window or cfg.get("window", 60)
+    benchmark = benchmark or cfg.get("benchmark", "SPY")
+    tickers = sorted(set(tickers)) if tickers else dataset.tickers("daily")
+    cells = matrix_history * len(tickers) ** 2
+    if cells > cfg.get("max_matrix_cells", 100_000):
+        raise TooManyCells(
+            f"{matrix_history} matrices over {len(tickers)} tickers is {cells} cells "
+            f"(limit {cfg.get('max_matrix_cells', 100_000)})"
+        )
+    # Manifest versions bump on every write, so a refresh misses the cache
+    versions = tuple(parquet_store.store_version(t) for t in tickers)
+    key = (tuple(tickers), window, benchmark, history, matrix_history, versions)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    # Enough calendar days for window + history sessions, with holidays
+    sessions = window + max(history, matrix_history) + 1
+    start = datetime.now(timezone.utc) - timedelta(days=int(sessions * 7 / 5 * 1.2) + 14)
+    closes = dataset.read_matrix("daily", tickers=tickers, start=start) if tickers else pd.DataFrame()
+    trading_days = get_config()["indicators"]["trading_days_per_year"]
+    result = compute(
+        closes.reindex(columns=tickers), window, benchmark, history, trading_days,
+        min_coverage=cfg.get("min_coverage", 0.8), matrix_history=matrix_history,
+    )
+    logger.info(
+        f"Correlation over {len(result.tickers)} tickers, window {window}: "
+        f"{result.observations} sessions as of {result.as_of}"
+    )
+    with _cache_lock:
+        _cache[key] = result
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
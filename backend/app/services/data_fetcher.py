@@ -1,14 +1,22 @@
+from __future__ import annotations
+
 import logging
+import os
 from typing import Optional
 
-import pandas as pd
-import yfinance as yf
-
 from app.config import get_config
+from app.lazy import lazy_import
+
+pd = lazy_import("pandas")
+yf = lazy_import("yfinance")
 
 logger = logging.getLogger(__name__)
 
 
+class UpstreamUnavailable(RuntimeError):
+    """Upstream returned no bars without confirming the symbol is unknown."""
+
+
 class FetchResult:
     def __init__(
         self,
@@ -25,9 +33,18 @@ class FetchResult:
         self.fallback_reason = fallback_reason
 
 
+def _source() -> str:
+    """``yfinance`` or ``synthetic`` (offline, deterministic; for load tests)."""
+    return os.environ.get("DATA_SOURCE") or get_config()["data"].get("source", "yfinance")
+
+
 def _download(ticker: str, interval: str, period: str) -> pd.DataFrame:
     logger.info(f"Downloading {ticker} interval={interval} period={period}")
-    df = yf.download(ticker, interval=interval, period=period, progress=False)
+    if _source() == "synthetic":
+        from app.services import synthetic_source
+        df = synthetic_source.download(ticker, interval, period)
+    else:
+        df = yf.download(ticker, interval=interval, period=period, progress=False)
     if isinstance(df.columns, pd.MultiIndex):
         df.columns = df.columns.droplevel(1)
     if df.index.tz is None:
@@ -54,6 +71,33 @@ def _download(ticker: str, interval: str, period: str) -> pd.DataFrame:
     return df
 
 
+def symbol_exists(ticker: str) -> Optional[bool]:
+    """Whether upstream knows *ticker*.
+
+    False only when upstream says the symbol is missing (no timezone or no
+    prices on record). None when it can't tell: rate limits, network errors
+    and other failures must not mark a valid symbol as unknown.
+    """
+    if _source() == "synthetic":
+        return True
+    from yfinance.exceptions import YFTickerMissingError
+
+    try:
+        df = yf.Ticker(ticker).history(period="1mo", interval="1d", raise_errors=True)
+    except YFTickerMissingError as e:
+        logger.info(f"Upstream does not know {ticker}: {e}")
+        return False
+    except Exception as e:
+        logger.warning(f"Could not confirm whether {ticker} exists: {e}")
+        return None
+    return True if not df.empty else None
+
+
+def fetch_daily(ticker: str, period: str) -> pd.DataFrame:
+    """Daily bars for *ticker* over *period* (e.g. "5d", "1mo", "2y")."""
+    return _download(ticker, "1d", period)
+
+
 def fetch_data() -> FetchResult:
     cfg = get_config()
     primary = cfg["tickers"]["primary"]
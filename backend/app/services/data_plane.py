@@ -0,0 +1,167 @@
+"""Shared on-disk data plane for multi-worker deployments.
+
+With ``uvicorn --workers N`` every process would otherwise fetch, compute and
+hold its own copy of each ticker. When the plane is enabled, a refresh runs
+under a per-ticker file lock and publishes a versioned snapshot:
+
+    DATA_DIR/<ticker>/snapshots/CURRENT        version number
+    DATA_DIR/<ticker>/snapshots/<v>/state.json  scores, regime, DCA, report
+    DATA_DIR/<ticker>/snapshots/<v>/{hourly,daily}.arrow
+
+Other workers notice the new version with a single stat of CURRENT and
+memory-map the Arrow files read-only (as lazy ArrowFrame handles), so all
+workers share one physical copy of the frames through the page cache and one
+upstream fetch per ticker.
+"""
+
+import json
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Iterator
+
+from app.config import DATA_DIR, get_config
+from app.models.enums import MarketRegime, RiskFlag
+from app.services import file_lock, parquet_store
+from app.services.arrow_frames import ArrowFrame, as_pandas, write_frame
+from app.services.dca_engine import DCAResult
+from app.services.heat_score import HeatScoreResult, ScoreComponent
+from app.services.regime_detector import RegimeResult
+
+logger = logging.getLogger(__name__)
+
+# Versions kept on disk; older ones may still be mapped by a slow reader
+_KEEP_VERSIONS = 2
+
+# State fields holding result dataclasses (stored as dicts)
+_RESULT_FIELDS = ("regime", "heat_score", "dca", "intraday_regime", "intraday_heat_score")
+
+# Held for the lifetime of the refresher process
+_refresher_fd: int | None = None
+
+# ticker → (CURRENT mtime_ns, version) so unchanged files are not re-read
+_current_cache: dict[str, tuple[int, int]] = {}
+
+
+def enabled() -> bool:
+    return get_config().get("data_plane", {}).get("enabled", False)
+
+
+def _snapshot_root(ticker: str) -> Path:
+    return parquet_store.ticker_dir(ticker) / "snapshots"
+
+
+def try_become_refresher() -> bool:
+    """Elect this process as the one that warms and refreshes on startup."""
+    global _refresher_fd
+    if _refresher_fd is None:
+        _refresher_fd = file_lock.try_acquire(DATA_DIR / ".refresher.lock")
+    return _refresher_fd is not None
+
+
+@contextmanager
+def ticker_lock(ticker: str) -> Iterator[None]:
+    """Serialize refreshes of *ticker* across worker processes.
+
+    The store's write lock: re-entrant, so the saves inside a refresh don't
+    wait on it.
+    """
+    with parquet_store.ticker_lock(ticker):
+        yield
+
+
+def current_version(ticker: str) -> int | None:
+    path = _snapshot_root(ticker) / "CURRENT"
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _current_cache.get(ticker)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    version = int(path.read_text().strip())
+    _current_cache[ticker] = (mtime, version)
+    return version
+
+
+def published_within(ticker: str, seconds: float) -> int | None:
+    """Version of the current snapshot if it was published in the last *seconds*."""
+    path = _snapshot_root(ticker) / "CURRENT"
+    try:
+        age = time.time() - path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    return current_version(ticker) if age < seconds else None
+
+
+def publish(ticker: str, fields: dict[str, Any]) -> int:
+    """Write a new snapshot from PipelineState fields; returns its version.
+
+    Callers must hold ``ticker_lock(ticker)``.
+    """
+    root = _snapshot_root(ticker)
+    root.mkdir(parents=True, exist_ok=True)
+    version = (current_version(ticker) or 0) + 1
+
+    tmp = root / f"{version}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    write_frame(as_pandas(fields["hourly_df"]), tmp / "hourly.arrow")
+    write_frame(as_pandas(fields["daily_df"]), tmp / "daily.arrow")
+    doc = {
+        k: (asdict(v) if k in _RESULT_FIELDS and v is not None else v)
+        for k, v in fields.items()
+        if k not in ("hourly_df", "daily_df", "version")
+    }
+    with open(tmp / "state.json", "w") as f:
+        json.dump(doc, f)
+    # A crash between this rename and the CURRENT update can leave the dir behind
+    shutil.rmtree(root / str(version), ignore_errors=True)
+    os.replace(tmp, root / str(version))
+
+    current_tmp = root / "CURRENT.tmp"
+    current_tmp.write_text(str(version))
+    os.replace(current_tmp, root / "CURRENT")
+
+    for old in root.iterdir():
+        if old.is_dir() and old.name.isdigit() and int(old.name) <= version - _KEEP_VERSIONS:
+            shutil.rmtree(old, ignore_errors=True)
+
+    logger.info(f"Published snapshot v{version} for {ticker}")
+    return version
+
+
+def load(ticker: str, version: int) -> dict[str, Any]:
+    """Read snapshot *version* back as PipelineState fields."""
+    base = _snapshot_root(ticker) / str(version)
+    with open(base / "state.json", "r") as f:
+        doc = json.load(f)
+
+    for key in ("regime", "intraday_regime"):
+        if doc.get(key):
+            r = doc[key]
+            doc[key] = RegimeResult(
+                regime=MarketRegime(r["regime"]),
+                risk_flags=[RiskFlag(f) for f in r["risk_flags"]],
+                confidence=r["confidence"],
+                details=r["details"],
+            )
+    for key in ("heat_score", "intraday_heat_score"):
+        if doc.get(key):
+            h = doc[key]
+            doc[key] = HeatScoreResult(
+                score=h["score"],
+                label=h["label"],
+                components=[ScoreComponent(**c) for c in h["components"]],
+            )
+    if doc.get("dca"):
+        doc["dca"] = DCAResult(**doc["dca"])
+
+    doc["hourly_df"] = ArrowFrame(base / "hourly.arrow")
+    doc["daily_df"] = ArrowFrame(base / "daily.arrow")
+    doc["version"] = version
+    return doc
@@ -1,7 +1,11 @@
+from __future__ import annotations
+
 import logging
 
-import pandas as pd
-import numpy as np
+from app.lazy import lazy_import
+
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
 
 logger = logging.getLogger(__name__)
 
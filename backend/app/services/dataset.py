@@ -0,0 +1,161 @@
+"""Consolidated multi-ticker bar dataset for cross-ticker queries.
+
+Alongside the per-ticker store, every saved frame is mirrored into one
+hive-partitioned parquet dataset with a shared schema:
+
+    DATA_DIR/_dataset/timeframe=<tf>/ticker=<symbol>/part.parquet
+
+The save path keeps it in sync (one file per ticker and timeframe, replaced
+atomically under the ticker's write lock), so a universe-wide question such
+as "close of every ticker between two dates" is a single filtered scan
+instead of N file opens and N frame alignments.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+from app.config import get_config
+from app.services import parquet_store
+from app.lazy import lazy_import
+
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+pa = lazy_import("pyarrow")
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+TIME_COLUMN = "Datetime"
+
+
+def enabled() -> bool:
+    return get_config().get("storage", {}).get("dataset", {}).get("enabled", False)
+
+
+def root() -> Path:
+    return parquet_store.DATA_DIR / "_dataset"
+
+
+def _partition_dir(timeframe: str, ticker: str) -> Path:
+    # Hive segments are URI-decoded on read, so symbols round-trip exactly
+    return root() / f"timeframe={timeframe}" / f"ticker={quote(ticker, safe='')}"
+
+
+def mirrored(ticker: str) -> bool:
+    # Derived series (e.g. "@BREADTH") are stored like tickers but aren't bars
+    return not ticker.startswith("@")
+
+
+def _conform(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast a stored frame to the shared schema (float64 OHLCV, UTC index)."""
+    out = df.reindex(columns=list(COLUMNS)).astype("float64")
+    index = pd.DatetimeIndex(out.index)
+    index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    out.index = index.as_unit("ns")
+    out.index.name = TIME_COLUMN
+    return out
+
+
+def sync(ticker: str, timeframe: str, df: pd.DataFrame) -> None:
+    """Replace *ticker*'s partition with the full stored frame *df*.
+
+    Callers must hold ``parquet_store.ticker_lock(ticker)``.
+    """
+    folder = _partition_dir(timeframe, ticker)
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / "part.parquet"
+    # Dot-prefixed, so scans never pick up a half-written file
+    tmp = folder / ".part.parquet.tmp"
+    parquet_store._write_parquet(_conform(df), tmp, timeframe)
+    parquet_store._commit_file(tmp, path)
+
+
+def rebuild() -> int:
+    """Mirror every ticker in the store into the dataset; returns how many."""
+    count = 0
+    for meta_file in sorted(parquet_store.DATA_DIR.glob("*/metadata.json")):
+        name = meta_file.parent.name
+        manifest = parquet_store._read_manifest(name, fresh=True) or {}
+        ticker = manifest.get("ticker") or manifest.get("active_ticker") or name
+        if not mirrored(ticker):
+            continue
+        with parquet_store.ticker_lock(name):
+            for timeframe in ("hourly", "daily"):
+                df = parquet_store.load(timeframe, ticker=name)
+                if not df.empty:
+                    sync(ticker, timeframe, df)
+        count += 1
+    logger.info(f"Rebuilt consolidated dataset from {count} tickers")
+    return count
+
+
+def ensure() -> None:
+    """Build the dataset once for stores that predate it."""
+    if enabled() and not root().exists():
+        rebuild()
+
+
+def tickers(timeframe: str) -> list[str]:
+    """Symbols with a partition for *timeframe*, sorted."""
+    folder = root() / f"timeframe={timeframe}"
+    if not folder.exists():
+        return []
+    return sorted(
+        unquote(p.name.split("=", 1)[1])
+        for p in folder.iterdir()
+        if p.name.startswith("ticker=") and (p / "part.parquet").exists()
+    )
+
+
+def read_matrix(
+    timeframe: str,
+    tickers: list[str] | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    column: str = "Close",
+) -> pd.DataFrame:
+    """*column* for many tickers in [start, end) as one wide aligned frame.
+
+    One scan of the dataset: partitions outside *timeframe*/*tickers* and row
+    groups outside the time range are skipped. The result is indexed by the
+    union of all timestamps with one column per ticker (NaN where a ticker
+    has no bar).
+    """
+    import pyarrow.dataset as ds
+
+    if column not in COLUMNS:
+        raise ValueError(f"Unknown column {column!r}")
+    base = root()
+    if not (base / f"timeframe={timeframe}").exists():
+        return pd.DataFrame()
+
+    partitioning = ds.partitioning(
+        pa.schema([("timeframe", pa.string()), ("ticker", pa.string())]), flavor="hive"
+    )
+    dataset = ds.dataset(base, format="parquet", partitioning=partitioning)
+    expr = ds.field("timeframe") == timeframe
+    if tickers is not None:
+        expr &= ds.field("ticker").isin(tickers)
+    if start is not None:
+        expr &= ds.field(TIME_COLUMN) >= pd.Timestamp(start)
+    if end is not None:
+        expr &= ds.field(TIME_COLUMN) < pd.Timestamp(end)
+    table = dataset.to_table(columns=[TIME_COLUMN, "ticker", column], filter=expr)
+
+    times = table.column(TIME_COLUMN).to_numpy()
+    codes, names = pd.factorize(table.column("ticker").to_numpy(zero_copy_only=False))
+    index, rows = np.unique(times, return_inverse=True)
+    matrix = np.full((len(index), len(names)), np.nan)
+    matrix[rows, codes] = table.column(column).to_numpy()
+
+    wide = pd.DataFrame(
+        matrix,
+        index=pd.DatetimeIndex(index, name=TIME_COLUMN).tz_localize("UTC"),
+        columns=pd.Index(names, name="ticker"),
+    )
+    order = [t for t in tickers if t in wide.columns] if tickers is not None else sorted(wide.columns)
+    return wide[order]
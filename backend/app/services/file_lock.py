@@ -0,0 +1,82 @@
+"""Advisory inter-process file locks.
+
+Locks are re-entrant per thread, so code holding a ticker lock can call
+helpers that take the same lock. Other threads and processes block until
+it is released.
+"""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+_held = threading.local()
+
+
+def _lock_fd(fd: int, blocking: bool) -> bool:
+    if fcntl is not None:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(fd, flags)
+        except BlockingIOError:
+            return False
+        return True
+    mode = msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK
+    try:
+        msvcrt.locking(fd, mode, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock_fd(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def try_acquire(path: Path) -> int | None:
+    """Take an exclusive lock without blocking and keep it until the process
+    exits. Returns the descriptor holding it, or None if another process has it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    if _lock_fd(fd, blocking=False):
+        return fd
+    os.close(fd)
+    return None
+
+
+@contextmanager
+def locked(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on *path* for the duration of the block."""
+    held: set[str] = getattr(_held, "paths", None) or set()
+    _held.paths = held
+    key = str(path)
+    if key in held:
+        yield
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        _lock_fd(fd, blocking=True)
+        held.add(key)
+        try:
+            yield
+        finally:
+            held.discard(key)
+            _unlock_fd(fd)
+    finally:
+        os.close(fd)
@@ -35,10 +35,41 @@ def _linear_map(value: float, in_lo: float, in_hi: float) -> float:
     return _clamp(normalized, 0.0, 100.0)
 
 
-def compute_heat_score(latest: dict) -> HeatScoreResult:
+# Ranges of moves measured over a fixed number of bars; drawdown is measured
+# from the running high and doesn't shrink with the bar length
+_BAR_SCALED = (
+    "macd_clamp", "ma_trend_range", "volatility_range", "momentum_range", "distance_ma200_range",
+)
+
+
+def bar_scale(timeframe: str = "daily") -> float:
+    """Typical move over N bars of *timeframe*, relative to N daily bars.
+
+    Price moves grow with the square root of time, so an hourly bar
+    (1/bars_per_session of a session) scales by sqrt(1/bars_per_session).
+    """
+    if timeframe == "daily":
+        return 1.0
+    bars = get_config()["heat_score"].get("intraday", {}).get("bars_per_session", 7)
+    return (1.0 / bars) ** 0.5
+
+
+def normalization(timeframe: str = "daily") -> dict:
+    """Normalization ranges for scoring bars of *timeframe*."""
     cfg = get_config()["heat_score"]
-    weights = cfg["weights"]
     norm = cfg["normalization"]
+    if timeframe == "daily":
+        return norm
+    scale = bar_scale(timeframe)
+    scaled = {k: [v * scale for v in r] if k in _BAR_SCALED else r for k, r in norm.items()}
+    return {**scaled, **(cfg.get("intraday", {}).get("normalization") or {})}
+
+
+def compute_heat_score(latest: dict, timeframe: str = "daily") -> HeatScoreResult:
+    """Score the *latest* indicator row of a *timeframe* frame."""
+    cfg = get_config()["heat_score"]
+    weights = cfg["weights"]
+    norm = normalization(timeframe)
     labels_cfg = cfg["labels"]
 
     components: list[ScoreComponent] = []
@@ -156,6 +187,6 @@ def compute_heat_score(latest: dict) -> HeatScoreResult:
             label = lbl.replace("_", " ").title()
             break
 
-    logger.info(f"Heat Score = {score:.1f} ({label})")
+    logger.info(f"Heat Score = {score:.1f} ({label}, {timeframe})")
 
     return HeatScoreResult(score=score, label=label, components=components)
@@ -1,36 +1,75 @@
-import logging
+from __future__ import annotations
 
-import numpy as np
-import pandas as pd
-import ta as ta_lib
+import logging
 
 from app.config import get_config
+from app.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+ta_lib = lazy_import("ta")
 
 logger = logging.getLogger(__name__)
 
 
+# Raw closes stay float64 in compact mode: drawdown, MA distances and the
+# report's "Latest Close" are computed from them
+_FULL_PRECISION = {"Close"}
+
+
+def compact_enabled() -> bool:
+    return get_config().get("storage", {}).get("compact", False)
+
+
+def compact(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast a price/indicator frame for storage.
+
+    Float columns other than Close become float32, whose relative rounding
+    error is at most 2**-24 (about 6e-8): under 0.0001 on a 1,000 price and
+    far below the two decimals prices, percentages and scores are displayed
+    with. Volume becomes the smallest unsigned integer that holds it, if it
+    is whole and has no gaps. tests/test_compact.py checks these bounds.
+    """
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if col in _FULL_PRECISION or s.dtype.kind != "f":
+            out[col] = s
+        elif col == "Volume":
+            whole = s.notna().all() and (s >= 0).all() and (s % 1 == 0).all()
+            if whole:
+                out[col] = s.astype(np.uint32 if s.max() < 2**32 else np.uint64)
+            else:
+                out[col] = s
+        else:
+            out[col] = s.astype(np.float32)
+    return pd.DataFrame(out, index=df.index)
+
+
 def compute_indicators(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty or len(df) < 2:
         logger.warning("Not enough data to compute indicators")
         return df
 
     cfg = get_config()["indicators"]
-    df = df.copy()
+    # New columns are collected and joined once, instead of copying the
+    # input up front and inserting into it column by column
+    ind: dict[str, pd.Series] = {}
 
-    close = df["Close"]
-    high = df["High"]
-    low = df["Low"]
+    close = df["Close"].astype(np.float64, copy=False)
+    high = df["High"].astype(np.float64, copy=False)
+    low = df["Low"].astype(np.float64, copy=False)
 
     # RSI
-    df["RSI_14"] = ta_lib.momentum.RSIIndicator(close, window=cfg["rsi_period"]).rsi()
+    ind["RSI_14"] = ta_lib.momentum.RSIIndicator(close, window=cfg["rsi_period"]).rsi()
 
     # SMAs
     for period in cfg["sma_periods"]:
-        df[f"SMA_{period}"] = ta_lib.trend.SMAIndicator(close, window=period).sma_indicator()
+        ind[f"SMA_{period}"] = ta_lib.trend.SMAIndicator(close, window=period).sma_indicator()
 
     # EMAs
     for period in cfg["ema_periods"]:
-        df[f"EMA_{period}"] = ta_lib.trend.EMAIndicator(close, window=period).ema_indicator()
+        ind[f"EMA_{period}"] = ta_lib.trend.EMAIndicator(close, window=period).ema_indicator()
 
     # MACD
     macd = ta_lib.trend.MACD(
@@ -39,44 +78,48 @@ def compute_indicators(df: pd.DataFrame) -> pd.DataFrame:
         window_fast=cfg["macd_fast"],
         window_sign=cfg["macd_signal"],
     )
-    df["MACD_12_26_9"] = macd.macd()
-    df["MACDs_12_26_9"] = macd.macd_signal()
-    df["MACDh_12_26_9"] = macd.macd_diff()
+    ind["MACD_12_26_9"] = macd.macd()
+    ind["MACDs_12_26_9"] = macd.macd_signal()
+    ind["MACDh_12_26_9"] = macd.macd_diff()
 
     # Bollinger Bands
     bb = ta_lib.volatility.BollingerBands(
         close, window=cfg["bb_period"], window_dev=cfg["bb_std"]
     )
-    df["BBU_20_2.0"] = bb.bollinger_hband()
-    df["BBM_20_2.0"] = bb.bollinger_mavg()
-    df["BBL_20_2.0"] = bb.bollinger_lband()
-    df["BBP_20_2.0"] = bb.bollinger_pband()
+    ind["BBU_20_2.0"] = bb.bollinger_hband()
+    ind["BBM_20_2.0"] = bb.bollinger_mavg()
+    ind["BBL_20_2.0"] = bb.bollinger_lband()
+    ind["BBP_20_2.0"] = bb.bollinger_pband()
 
     # ATR
-    df["ATRr_14"] = ta_lib.volatility.AverageTrueRange(
+    ind["ATRr_14"] = ta_lib.volatility.AverageTrueRange(
         high, low, close, window=cfg["atr_period"]
     ).average_true_range()
 
     # Log returns
-    df["log_return"] = np.log(close / close.shift(1))
+    ind["log_return"] = np.log(close / close.shift(1))
 
     # Rolling volatility (annualized)
     window = cfg["volatility_window"]
     trading_days = cfg["trading_days_per_year"]
-    df["volatility"] = df["log_return"].rolling(window).std() * np.sqrt(trading_days)
+    ind["volatility"] = ind["log_return"].rolling(window).std() * np.sqrt(trading_days)
 
     # Drawdown
     cummax = close.cummax()
-    df["drawdown"] = (close - cummax) / cummax
+    ind["drawdown"] = (close - cummax) / cummax
 
     # Distance to MA50 and MA200
-    if "SMA_50" in df.columns:
-        df["dist_ma50"] = (close - df["SMA_50"]) / df["SMA_50"]
-    if "SMA_200" in df.columns:
-        df["dist_ma200"] = (close - df["SMA_200"]) / df["SMA_200"]
+    if "SMA_50" in ind:
+        ind["dist_ma50"] = (close - ind["SMA_50"]) / ind["SMA_50"]
+    if "SMA_200" in ind:
+        ind["dist_ma200"] = (close - ind["SMA_200"]) / ind["SMA_200"]
 
     # 5-day momentum (percent change)
-    df["momentum_5d"] = close.pct_change(5)
+    ind["momentum_5d"] = close.pct_change(5)
+
+    df = pd.concat([df, pd.DataFrame(ind, index=df.index)], axis=1)
+    if compact_enabled():
+        df = compact(df)
 
     logger.info(f"Indicators computed: {len(df)} rows, {len(df.columns)} columns")
     return df
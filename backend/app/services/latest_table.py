@@ -0,0 +1,224 @@
+"""Columnar table of every ticker's latest indicators and results.
+
+One row per ticker, stored as a struct of NumPy arrays. Strings are
+dictionary-coded and risk flags are a bitmask. Each publish overwrites the
+ticker's row in place, and rows outlive eviction of the full state from the
+cache. A cross-ticker question ("oversold and in Trend Up, best score
+first") is then a few vectorized comparisons and an argpartition over N
+rows, rather than a walk over N pipeline states.
+"""
+
+from __future__ import annotations
+
+import logging
+import operator
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from app.models.enums import RiskFlag
+from app.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+# Table field → indicator column of the latest daily row
+INDICATOR_FIELDS = {
+    "close": "Close",
+    "rsi": "RSI_14",
+    "macd_hist": "MACDh_12_26_9",
+    "bb_pct": "BBP_20_2.0",
+    "dist_ma50": "dist_ma50",
+    "dist_ma200": "dist_ma200",
+    "drawdown": "drawdown",
+    "volatility": "volatility",
+    "momentum_5d": "momentum_5d",
+}
+NUMERIC_FIELDS = (*INDICATOR_FIELDS, "change_1d", "score", "confidence", "intraday_score")
+CODED_FIELDS = ("regime", "label", "action")
+SORT_FIELDS = (*NUMERIC_FIELDS, "ticker", "last_bar")
+
+_FLAG_BITS = {flag.value: 1 << i for i, flag in enumerate(RiskFlag)}
+
+_OPS: dict[str, Callable] = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "=": operator.eq,
+}
+_CONDITION_RE = re.compile(r"^\s*([a-z_0-9]+)\s*(<=|>=|<|>|=)\s*(-?[0-9.]+(?:e-?[0-9]+)?)\s*$")
+
+
+@dataclass(frozen=True)
+class Condition:
+    field: str
+    op: str
+    value: float
+
+    @classmethod
+    def parse(cls, text: str) -> "Condition":
+        """``"rsi<30"`` → Condition("rsi", "<", 30.0)."""
+        m = _CONDITION_RE.match(text)
+        if m is None or m.group(1) not in NUMERIC_FIELDS:
+            raise ValueError(f"Bad condition {text!r}; expected <field><op><number>")
+        return cls(m.group(1), m.group(2), float(m.group(3)))
+
+
+def _num(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class LatestTable:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows: dict[str, int] = {}
+        self._tickers: list[str] = []
+        self._active: list[str] = []
+        self._n = 0
+        self._dictionaries: dict[str, dict[str, int]] = {f: {} for f in CODED_FIELDS}
+        self._values: dict[str, list[str]] = {f: [] for f in CODED_FIELDS}
+        # Arrays are allocated on first use so importing this module stays cheap
+        self._numeric: dict = {}
+        self._codes: dict = {}
+        self._flags = self._last_bar = self._version = None
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _grow(self) -> None:
+        if self._flags is None:
+            self._numeric = {f: np.full(0, np.nan) for f in NUMERIC_FIELDS}
+            self._codes = {f: np.full(0, -1, dtype=np.int16) for f in CODED_FIELDS}
+            self._flags = np.zeros(0, dtype=np.uint8)
+            self._last_bar = np.zeros(0, dtype=np.int64)
+            self._version = np.zeros(0, dtype=np.int64)
+        capacity = max(len(self._flags) * 2, 64)
+        for arrays, fill in ((self._numeric, np.nan), (self._codes, -1)):
+            for f, a in arrays.items():
+                grown = np.full(capacity, fill, dtype=a.dtype)
+                grown[: len(a)] = a
+                arrays[f] = grown
+        for name in ("_flags", "_last_bar", "_version"):
+            a = getattr(self, name)
+            grown = np.zeros(capacity, dtype=a.dtype)
+            grown[: len(a)] = a
+            setattr(self, name, grown)
+
+    def _code(self, field: str, value: str | None) -> int:
+        if value is None:
+            return -1
+        codes = self._dictionaries[field]
+        if value not in codes:
+            codes[value] = len(self._values[field])
+            self._values[field].append(value)
+        return codes[value]
+
+    def upsert(self, ticker: str, state) -> None:
+        """Overwrite *ticker*'s row from a ready PipelineState."""
+        if not state.ready or state.heat_score is None:
+            return
+        tail = state.daily_df.tail(2)
+        if len(tail) == 0:
+            return
+        latest = tail.iloc[-1]
+        prev_close = _num(tail.iloc[-2]["Close"]) if len(tail) > 1 else float("nan")
+        values = {f: _num(latest.get(col)) for f, col in INDICATOR_FIELDS.items()}
+        values["change_1d"] = values["close"] / prev_close - 1
+        values["score"] = state.heat_score.score
+        values["confidence"] = state.regime.confidence if state.regime else float("nan")
+        intraday = state.intraday_heat_score
+        values["intraday_score"] = intraday.score if intraday is not None else float("nan")
+        flags = 0
+        for flag in state.regime.risk_flags if state.regime else ():
+            flags |= _FLAG_BITS[flag.value]
+
+        with self._lock:
+            row = self._rows.get(ticker)
+            if row is None:
+                if self._flags is None or self._n == len(self._flags):
+                    self._grow()
+                row = self._n
+                self._rows[ticker] = row
+                self._tickers.append(ticker)
+                self._active.append(state.active_ticker)
+                self._n += 1
+            self._active[row] = state.active_ticker
+            for f, v in values.items():
+                self._numeric[f][row] = v
+            regime = state.regime.regime.value if state.regime else None
+            self._codes["regime"][row] = self._code("regime", regime)
+            self._codes["label"][row] = self._code("label", state.heat_score.label)
+            self._codes["action"][row] = self._code("action", state.dca.action if state.dca else None)
+            self._flags[row] = flags
+            self._last_bar[row] = pd.Timestamp(tail.index[-1]).value
+            self._version[row] = state.version
+
+    def query(
+        self,
+        conditions: list[Condition] = (),
+        regime: str | None = None,
+        label: str | None = None,
+        action: str | None = None,
+        flags: list[str] = (),
+        sort: str = "score",
+        descending: bool = False,
+        limit: int | None = None,
+    ) -> tuple[int, list[dict]]:
+        """Rows matching every filter, sorted, at most *limit*; also the match count.
+
+        *flags* must all be set. Rows missing the sort field go last.
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Unknown sort field {sort!r}")
+        unknown = [f for f in flags if f not in _FLAG_BITS]
+        if unknown:
+            raise ValueError(f"Unknown risk flag {unknown[0]!r}")
+
+        with self._lock:
+            n = self._n
+            if n == 0:
+                return 0, []
+            mask = np.ones(n, dtype=bool)
+            for c in conditions:
+                mask &= _OPS[c.op](self._numeric[c.field][:n], c.value)
+            for field, wanted in (("regime", regime), ("label", label), ("action", action)):
+                if wanted is not None:
+                    code = self._dictionaries[field].get(wanted, -2)
+                    mask &= self._codes[field][:n] == code
+            if flags:
+                bits = sum(_FLAG_BITS[f] for f in flags)
+                mask &= (self._flags[:n] & bits) == bits
+            rows = np.flatnonzero(mask)
+            rows = self._order(rows, sort, descending, limit)
+            return int(mask.sum()), [self._row(int(r)) for r in rows]
+
+    def _order(self, rows, sort: str, descending: bool, limit: int | None):
+        if sort == "ticker":
+            rows = np.array(sorted(rows, key=lambda r: self._tickers[r], reverse=descending), dtype=int)
+            return rows[:limit]
+        keys = self._last_bar[rows].astype(float) if sort == "last_bar" else self._numeric[sort][rows]
+        # NaNs sort last either way
+        keys = np.where(np.isnan(keys), np.inf, -keys if descending else keys)
+        if limit is not None and limit < len(rows):
+            top = np.argpartition(keys, limit - 1)[:limit]
+            return rows[top[np.argsort(keys[top], kind="stable")]]
+        return rows[np.argsort(keys, kind="stable")]
+
+    def _row(self, r: int) -> dict:
+        out: dict[str, Any] = {"ticker": self._tickers[r], "active_ticker": self._active[r]}
+        for f, a in self._numeric.items():
+            v = float(a[r])
+            out[f] = None if v != v else v
+        for f, a in self._codes.items():
+            code = int(a[r])
+            out[f] = self._values[f][code] if code >= 0 else None
+        out["risk_flags"] = [name for name, bit in _FLAG_BITS.items() if self._flags[r] & bit]
+        out["last_bar"] = pd.Timestamp(int(self._last_bar[r]), tz="UTC").isoformat()
+        out["version"] = int(self._version[r])
+        return out
+
+
+TABLE = LatestTable()
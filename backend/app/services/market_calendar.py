@@ -0,0 +1,179 @@
+"""Rule-based exchange session calendars.
+
+Sessions and holidays are computed locally from fixed rules (weekends,
+fixed-date and moveable holidays), so freshness checks never touch the
+network. Only the exchanges we actually track are modelled; tickers on
+any other venue fall back to the plain age-based check.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Exchange:
+    code: str
+    tz: str
+    open: time
+    close: time
+
+
+NYSE = Exchange(code="NYSE", tz="America/New_York", open=time(9, 30), close=time(16, 0))
+XETRA = Exchange(code="XETRA", tz="Europe/Berlin", open=time(9, 0), close=time(17, 30))
+EURONEXT_AMS = Exchange(code="AMS", tz="Europe/Amsterdam", open=time(9, 0), close=time(17, 30))
+# Börse Frankfurt floor trading: longer hours than Xetra, same holidays
+FRANKFURT = Exchange(code="FRA", tz="Europe/Berlin", open=time(8, 0), close=time(22, 0))
+
+# Yahoo Finance symbol suffix → exchange. Symbols without a suffix are US listings.
+_SUFFIXES: dict[str, Exchange] = {
+    "AS": EURONEXT_AMS,
+    "DE": XETRA,
+    "F": FRANKFURT,
+}
+
+# Quote currencies of Yahoo crypto pairs (BTC-USD, ETH-EUR). Other dashed
+# symbols are US share classes such as BRK-B or BF-B.
+_CRYPTO_QUOTES = frozenset({"USD", "USDT", "USDC", "EUR", "GBP", "JPY", "CAD", "AUD", "BTC", "ETH"})
+
+# Search horizon for the next session; longer than any real exchange closure.
+_MAX_LOOKAHEAD_DAYS = 14
+
+
+def exchange_for(ticker: str) -> Exchange | None:
+    """Resolve the exchange a Yahoo Finance symbol trades on, if modelled."""
+    if ticker.startswith("^") or "=" in ticker:
+        # Indices and FX follow their own hours
+        return None
+    if "-" in ticker and ticker.rsplit("-", 1)[1].upper() in _CRYPTO_QUOTES:
+        # Crypto pairs trade around the clock
+        return None
+    if "." not in ticker:
+        return NYSE
+    suffix = ticker.rsplit(".", 1)[1].upper()
+    return _SUFFIXES.get(suffix)
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th given weekday of a month (n=-1 for the last one)."""
+    if n > 0:
+        first = date(year, month, 1)
+        offset = (weekday - first.weekday()) % 7
+        return first + timedelta(days=offset + 7 * (n - 1))
+    nxt = date(year + month // 12, month % 12 + 1, 1)
+    last = nxt - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(d: date) -> date:
+    """US rule: Saturday holidays move to Friday, Sunday holidays to Monday."""
+    if d.weekday() == 5:
+        return d - timedelta(days=1)
+    if d.weekday() == 6:
+        return d + timedelta(days=1)
+    return d
+
+
+@lru_cache(maxsize=64)
+def holidays(exchange_code: str, year: int) -> frozenset[date]:
+    easter = _easter(year)
+    good_friday = easter - timedelta(days=2)
+    easter_monday = easter + timedelta(days=1)
+
+    if exchange_code == NYSE.code:
+        days = {
+            _nth_weekday(year, 1, 0, 3),   # Martin Luther King Jr. Day
+            _nth_weekday(year, 2, 0, 3),   # Presidents' Day
+            good_friday,
+            _nth_weekday(year, 5, 0, -1),  # Memorial Day
+            _observed(date(year, 7, 4)),
+            _nth_weekday(year, 9, 0, 1),   # Labor Day
+            _nth_weekday(year, 11, 3, 4),  # Thanksgiving
+            _observed(date(year, 12, 25)),
+        }
+        # New Year's Day on a Saturday is not observed on the prior Friday
+        new_year = date(year, 1, 1)
+        if new_year.weekday() != 5:
+            days.add(_observed(new_year))
+        if year >= 2022:
+            days.add(_observed(date(year, 6, 19)))  # Juneteenth
+        return frozenset(days)
+
+    days = {
+        date(year, 1, 1),
+        good_friday,
+        easter_monday,
+        date(year, 5, 1),
+        date(year, 12, 25),
+        date(year, 12, 26),
+    }
+    if exchange_code in (XETRA.code, FRANKFURT.code):
+        days.update({date(year, 12, 24), date(year, 12, 31)})
+    return frozenset(days)
+
+
+def is_trading_day(exchange: Exchange, d: date) -> bool:
+    return d.weekday() < 5 and d not in holidays(exchange.code, d.year)
+
+
+def session_bounds(exchange: Exchange, d: date) -> tuple[datetime, datetime]:
+    """Open/close of the session on local date *d*, as UTC datetimes."""
+    tz = ZoneInfo(exchange.tz)
+    start = datetime.combine(d, exchange.open, tzinfo=tz).astimezone(timezone.utc)
+    end = datetime.combine(d, exchange.close, tzinfo=tz).astimezone(timezone.utc)
+    return start, end
+
+
+def next_session_open(exchange: Exchange, after: datetime) -> datetime:
+    """First session open strictly after *after*."""
+    d = after.astimezone(ZoneInfo(exchange.tz)).date()
+    for _ in range(_MAX_LOOKAHEAD_DAYS):
+        if is_trading_day(exchange, d):
+            start, _ = session_bounds(exchange, d)
+            if start > after:
+                return start
+        d += timedelta(days=1)
+    raise RuntimeError(f"No {exchange.code} session within {_MAX_LOOKAHEAD_DAYS} days of {after}")
+
+
+def next_expected_bar(
+    exchange: Exchange,
+    last_bar: datetime,
+    last_refresh: datetime,
+    interval: timedelta = timedelta(hours=1),
+) -> datetime:
+    """Earliest time at which upstream can have data newer than what we stored.
+
+    *last_bar* is the start of the newest stored bar and *last_refresh* the
+    moment it was fetched. A bar fetched before its session closed may still
+    have been forming, so the session close is itself an expected update.
+    """
+    local_day = last_bar.astimezone(ZoneInfo(exchange.tz)).date()
+    if is_trading_day(exchange, local_day):
+        start, end = session_bounds(exchange, local_day)
+        if start <= last_bar < end:
+            candidate = last_bar + interval
+            if candidate < end:
+                return candidate
+            if last_refresh < end:
+                return end
+    return next_session_open(exchange, max(last_bar, last_refresh))
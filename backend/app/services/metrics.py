@@ -0,0 +1,202 @@
+"""Minimal in-process metrics with Prometheus text exposition.
+
+Recording is a dict lookup and a few integer updates under a lock, so it is
+cheap enough to leave on everywhere; text is only rendered when /api/metrics
+is scraped.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry: list["_Metric"] = []
+
+# Called before each render to refresh gauges that are cheaper to read on scrape
+_collectors: list[Callable[[], None]] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, k)} {v}"
+            for k, v in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = buckets
+        # labels → [per-bucket counts (+Inf last), sum, count]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[key] = series
+            series[0][idx] += 1
+            series[1] += value
+            series[2] += 1
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for key, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cumulative += c
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
+
+
+def add_collector(fn: Callable[[], None]) -> None:
+    _collectors.append(fn)
+
+
+def render() -> str:
+    for collect in _collectors:
+        collect()
+    lines: list[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ── Application metrics ───────────────────────────────────────
+# ``ticker`` labels on these never-pruned series are the configured symbols
+# or "other" (symbol_guard.metric_label)
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    "pipeline_stage_seconds",
+    "Time spent in each pipeline stage",
+    ("stage", "ticker", "timeframe"),
+)
+PIPELINE_ROWS = Counter(
+    "pipeline_rows_total",
+    "Rows produced by each pipeline stage",
+    ("stage", "ticker", "timeframe"),
+)
+STORE_BYTES_WRITTEN = Counter(
+    "store_bytes_written_total",
+    "Bytes written to the parquet store",
+    ("ticker", "timeframe"),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route", "status"),
+)
+HTTP_SERIALIZATION_SECONDS = Histogram(
+    "http_response_serialization_seconds",
+    "Time spent validating and encoding the response after the endpoint returned",
+    ("route",),
+)
+STATE_MEMORY_BYTES = Gauge(
+    "state_memory_bytes",
+    "Private memory held by each cached pipeline state",
+    ("ticker", "part"),
+)
+STATE_MAPPED_BYTES = Gauge(
+    "state_mapped_bytes",
+    "Memory-mapped (shared page cache) bytes referenced by each cached state",
+    ("ticker",),
+)
+PROCESS_RESIDENT_BYTES = Gauge(
+    "process_resident_memory_bytes",
+    "Resident set size of the API process",
+)
+PROCESS_PEAK_RESIDENT_BYTES = Gauge(
+    "process_peak_resident_memory_bytes",
+    "Peak resident set size of the API process",
+)
+SQL_QUERY_SECONDS = Histogram(
+    "sql_query_duration_seconds",
+    "SQL endpoint query time including streaming, by outcome",
+    ("outcome",),
+)
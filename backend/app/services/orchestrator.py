@@ -1,106 +1,244 @@
+from __future__ import annotations
+
+import itertools
 import logging
 import threading
-from dataclasses import dataclass, field
+from contextlib import nullcontext
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime, timezone
 from typing import Optional
 
-import pandas as pd
-
 from app.config import get_config
-from app.services.data_fetcher import fetch_data, fetch_ticker_data, FetchResult
+from app.services.data_fetcher import fetch_data, fetch_ticker_data, symbol_exists, FetchResult, UpstreamUnavailable
 from app.services.data_validator import validate
-from app.services import parquet_store
+from app.services.arrow_frames import ArrowFrame, as_pandas
+from app.services import breadth, data_plane, dataset, latest_table, metrics, parquet_store, profiler, symbol_guard
 from app.services.indicator_engine import compute_indicators
 from app.services.regime_detector import detect_regime, RegimeResult
 from app.services.heat_score import compute_heat_score, HeatScoreResult
 from app.services.dca_engine import compute_dca, DCAResult
 from app.services.report_generator import generate_report
+from app.services.singleflight import SingleFlight
+from app.services.state_cache import StateCache, CacheStats, StateMemory, process_memory
+from app.lazy import lazy_import
+
+pd = lazy_import("pandas")
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True)
 class PipelineState:
+    """Immutable snapshot of one ticker's pipeline output.
+
+    A refresh builds a complete new snapshot and publishes it with a single
+    reference swap, so a reader holding a snapshot always sees a consistent
+    set of frames, scores and report. The frames are shared between readers
+    and must never be mutated in place.
+    """
+
     active_ticker: str = ""
     used_fallback: bool = False
     fallback_reason: Optional[str] = None
-    hourly_df: pd.DataFrame = field(default_factory=pd.DataFrame)
-    daily_df: pd.DataFrame = field(default_factory=pd.DataFrame)
+    # Either materialized frames or lazy memory-mapped handles; use frame()
+    hourly_df: pd.DataFrame | ArrowFrame = field(default_factory=lambda: pd.DataFrame())
+    daily_df: pd.DataFrame | ArrowFrame = field(default_factory=lambda: pd.DataFrame())
     regime: Optional[RegimeResult] = None
     heat_score: Optional[HeatScoreResult] = None
     dca: Optional[DCAResult] = None
     report: str = ""
     last_refresh: Optional[str] = None
     ready: bool = False
-
-
-# Per-ticker states — populated on startup and on demand
-_states: dict[str, PipelineState] = {}
+    version: int = 0
+    # Heat score and regime of the latest hourly bar, and that bar's
+    # [timestamp, close]; None when intraday scoring is off or there is no hourly data
+    intraday_heat_score: Optional[HeatScoreResult] = None
+    intraday_regime: Optional[RegimeResult] = None
+    intraday_bar: Optional[list] = None
+
+    def frame(self, timeframe: str, start: datetime | None = None) -> pd.DataFrame:
+        """Indicator frame for *timeframe*, materializing a mapped handle if needed.
+
+        With *start*, only rows from then on (a mapped frame converts just
+        that slice).
+        """
+        df = self.daily_df if timeframe == "daily" else self.hourly_df
+        if start is None:
+            return as_pandas(df)
+        if isinstance(df, ArrowFrame):
+            return df.since(start)
+        return df[df.index >= start] if not df.empty else df
+
+    def rows(self, timeframe: str) -> int:
+        return len(self.daily_df if timeframe == "daily" else self.hourly_df)
+
+
+# Monotonic snapshot version, bumped for every published state
+_versions = itertools.count(1)
+
+
+# Per-ticker states — populated on startup and on demand, bounded by the
+# cache budget (evicted tickers are reloaded from the parquet store)
+_cache_cfg = get_config().get("cache", {})
+_states = StateCache(
+    max_entries=_cache_cfg.get("max_states", 16),
+    max_bytes=int(_cache_cfg.get("max_state_mb", 1024) * 1024 * 1024),
+)
 
 # Default ticker symbol (set on startup)
 _default_ticker: str = "SPY"
 
-# Per-ticker locks to prevent parallel fetches for the same ticker
-_locks: dict[str, threading.Lock] = {}
-_locks_lock = threading.Lock()
+# Keys served by another ticker's snapshot (the default ticker when the
+# primary/fallback fetch resolved to a different symbol)
+_aliases: dict[str, str] = {}
 
+# Every refresh entry point goes through this: concurrent refreshes of one
+# ticker share a single download + pipeline run, and a refresh that finished
+# within the debounce window is reused.
+_refresh_flight: SingleFlight[PipelineState] = SingleFlight(
+    get_config()["data"].get("refresh_debounce_seconds", 0)
+)
 
-def _get_ticker_lock(ticker: str) -> threading.Lock:
-    with _locks_lock:
-        if ticker not in _locks:
-            _locks[ticker] = threading.Lock()
-        return _locks[ticker]
+# Lazy first loads of a ticker (cache read or fetch) are coalesced the same way
+_init_flight: SingleFlight[PipelineState] = SingleFlight()
+
+# Store version each derived series' snapshot was built from
+_derived_versions: dict[str, int] = {}
+
+# Set while the startup warm-up runs in the background
+_warming = threading.Event()
 
 
 def get_default_ticker() -> str:
     return _default_ticker
 
 
+def _lazy_frames() -> bool:
+    return get_config().get("storage", {}).get("lazy_frames", False)
+
+
+def _last_rows(frame: pd.DataFrame | ArrowFrame) -> tuple[dict, dict | None]:
+    """Latest and previous row as dicts, without materializing a mapped frame."""
+    tail = frame.tail(2)
+    latest = tail.iloc[-1].to_dict()
+    prev_row = tail.iloc[-2].to_dict() if len(tail) > 1 else None
+    return latest, prev_row
+
+
+def _intraday(ticker: str, hourly: pd.DataFrame | ArrowFrame) -> dict:
+    """Intraday state fields scored on the latest hourly bar.
+
+    Scoring only needs the last two rows, and the previous snapshot's results
+    are reused until a new hourly bar arrives or the forming one changes.
+    """
+    if not get_config()["heat_score"].get("intraday", {}).get("enabled", True) or len(hourly) == 0:
+        return {}
+    latest, prev_row = _last_rows(hourly)
+    # Mapped frames have no index of their own; a one-row tail is cheap
+    bar = [hourly.tail(1).index[-1].isoformat(), _num(latest.get("Close"))]
+    # Not get(): a pipeline run must not count as a cache hit or refresh recency
+    previous = _states.peek(ticker)
+    if previous is not None and previous.intraday_bar == bar:
+        return {
+            "intraday_heat_score": previous.intraday_heat_score,
+            "intraday_regime": previous.intraday_regime,
+            "intraday_bar": bar,
+        }
+    with _stage("intraday", ticker, "hourly"):
+        return {
+            "intraday_heat_score": compute_heat_score(latest, timeframe="hourly"),
+            "intraday_regime": detect_regime(latest, prev_row, timeframe="hourly"),
+            "intraday_bar": bar,
+        }
+
+
+def _num(value) -> float | None:
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if v != v else v
+
+
+def _stage(stage: str, ticker: str, timeframe: str = ""):
+    """Time a pipeline stage into the pipeline_stage_seconds histogram."""
+    return metrics.timed(
+        metrics.PIPELINE_STAGE_SECONDS,
+        stage=stage, ticker=symbol_guard.metric_label(ticker), timeframe=timeframe,
+    )
+
+
+def _count_rows(stage: str, ticker: str, timeframe: str, frame) -> None:
+    metrics.PIPELINE_ROWS.inc(
+        len(frame), stage=stage, ticker=symbol_guard.metric_label(ticker), timeframe=timeframe
+    )
+
+
 def _run_pipeline(result: FetchResult, ticker: str) -> PipelineState:
     """Run the full analysis pipeline on fetched data."""
     # Validate
-    hourly = validate(result.hourly, label="hourly")
-    daily = validate(result.daily, label="daily")
+    with _stage("validate", ticker, "hourly"):
+        hourly = validate(result.hourly, label="hourly")
+    with _stage("validate", ticker, "daily"):
+        daily = validate(result.daily, label="daily")
+    _count_rows("validate", ticker, "hourly", hourly)
+    _count_rows("validate", ticker, "daily", daily)
 
     # Store
-    parquet_store.save(hourly, "hourly", ticker=ticker)
-    parquet_store.save(daily, "daily", ticker=ticker)
-    parquet_store.save_metadata(
+    with _stage("store", ticker, "hourly"):
+        parquet_store.save(hourly, "hourly", ticker=ticker)
+    with _stage("store", ticker, "daily"):
+        parquet_store.save(daily, "daily", ticker=ticker)
+    meta = parquet_store.save_metadata(
         result.active_ticker, result.used_fallback, result.fallback_reason,
         ticker=ticker,
+        last_bar=hourly.index.max().to_pydatetime() if not hourly.empty else None,
     )
 
     # Compute indicators
-    daily_ind = compute_indicators(daily)
-    hourly_ind = compute_indicators(hourly)
+    with _stage("indicators", ticker, "daily"):
+        daily_ind = compute_indicators(daily)
+    with _stage("indicators", ticker, "hourly"):
+        hourly_ind = compute_indicators(hourly)
+    _count_rows("indicators", ticker, "daily", daily_ind)
+    _count_rows("indicators", ticker, "hourly", hourly_ind)
 
     if daily_ind.empty:
         logger.error(f"No daily data after indicator computation for {ticker}")
-        return PipelineState(active_ticker=ticker, ready=False)
+        return PipelineState(active_ticker=ticker, ready=False, version=next(_versions))
+
+    if _lazy_frames():
+        with _stage("store_indicators", ticker, "daily"):
+            daily_ind = parquet_store.save_indicators(daily_ind, "daily", ticker=ticker)
+        with _stage("store_indicators", ticker, "hourly"):
+            hourly_ind = parquet_store.save_indicators(hourly_ind, "hourly", ticker=ticker)
 
-    latest = daily_ind.iloc[-1].to_dict()
-    prev_row = daily_ind.iloc[-2].to_dict() if len(daily_ind) > 1 else None
+    latest, prev_row = _last_rows(daily_ind)
 
     # Regime detection
-    regime = detect_regime(latest, prev_row)
+    with _stage("regime", ticker, "daily"):
+        regime = detect_regime(latest, prev_row)
 
     # Heat score
-    heat = compute_heat_score(latest)
+    with _stage("heat_score", ticker, "daily"):
+        heat = compute_heat_score(latest)
 
     # DCA
-    dca = compute_dca(heat.score, heat.label, regime.regime.value)
+    with _stage("dca", ticker):
+        dca = compute_dca(heat.score, heat.label, regime.regime.value)
 
     # Report
-    report = generate_report(
-        heat=heat,
-        regime=regime,
-        dca=dca,
-        active_ticker=result.active_ticker,
-        used_fallback=result.used_fallback,
-        fallback_reason=result.fallback_reason,
-        latest=latest,
-    )
+    with _stage("report", ticker):
+        report = generate_report(
+            heat=heat,
+            regime=regime,
+            dca=dca,
+            active_ticker=result.active_ticker,
+            used_fallback=result.used_fallback,
+            fallback_reason=result.fallback_reason,
+            latest=latest,
+        )
 
-    meta = parquet_store.load_metadata(ticker=ticker)
     return PipelineState(
         active_ticker=result.active_ticker,
         used_fallback=result.used_fallback,
@@ -111,39 +249,159 @@ def _run_pipeline(result: FetchResult, ticker: str) -> PipelineState:
         heat_score=heat,
         dca=dca,
         report=report,
-        last_refresh=meta["last_refresh"] if meta else None,
+        last_refresh=meta["last_refresh"],
         ready=True,
+        version=next(_versions),
+        **_intraday(ticker, hourly_ind),
     )
 
 
-def refresh_ticker(ticker: str) -> PipelineState:
-    """Refresh data for a specific ticker."""
+def _plane_lock(ticker: str):
+    """Cross-process ticker lock when the shared data plane is enabled."""
+    return data_plane.ticker_lock(ticker) if data_plane.enabled() else nullcontext()
+
+
+def _publish(ticker: str, state: PipelineState) -> PipelineState:
+    """Make *state* the current snapshot for *ticker* (atomic swap).
+
+    With the shared data plane it is also written to disk for the other
+    workers, and takes the plane's version number.
+    """
+    if data_plane.enabled():
+        with _plane_lock(ticker):
+            version = data_plane.publish(
+                ticker, {f.name: getattr(state, f.name) for f in fields(PipelineState)}
+            )
+        state = replace(state, version=version)
+    mem = _states.put(ticker, state)
+    _aliases.pop(ticker, None)
+    latest_table.TABLE.upsert(ticker, state)
+    _log_memory(ticker, state.version, mem)
+    return state
+
+
+def _log_memory(ticker: str, version: int, mem: StateMemory) -> None:
+    rss, _ = process_memory()
+    logger.info(
+        f"Memory for {ticker} v{version}: {mem.total_bytes / 1e6:.1f} MB "
+        f"(hourly {mem.hourly_bytes / 1e6:.1f}, daily {mem.daily_bytes / 1e6:.1f}, "
+        f"report {mem.report_bytes / 1e3:.1f} kB, mapped {mem.mapped_bytes / 1e6:.1f} MB); "
+        f"cache {_states.stats().resident_bytes / 1e6:.1f} MB"
+        + (f", process RSS {rss / 1e6:.1f} MB" if rss is not None else "")
+    )
+
+
+def _adopt(ticker: str, version: int) -> PipelineState:
+    """Serve a snapshot another worker published to the data plane."""
+    state = PipelineState(**data_plane.load(ticker, version))
+    _states.put(ticker, state)
+    _aliases.pop(ticker, None)
+    latest_table.TABLE.upsert(ticker, state)
+    logger.info(f"Adopted shared snapshot v{version} for {ticker}")
+    return state
+
+
+def _refresh_ticker(ticker: str) -> PipelineState:
+    with _plane_lock(ticker), profiler.capture_if_armed(f"refresh:{ticker}"):
+        if data_plane.enabled():
+            # Another worker may have refreshed while we waited for the lock
+            version = data_plane.published_within(ticker, _refresh_flight.debounce_seconds)
+            if version is not None:
+                return _adopt(ticker, version)
+        return _fetch_and_publish(ticker)
+
+
+def _fetch_and_publish(ticker: str) -> PipelineState:
     logger.info(f"Starting pipeline refresh for {ticker}...")
-    result: FetchResult = fetch_ticker_data(ticker)
-    state = _run_pipeline(result, ticker)
-    _states[ticker] = state
+    with _stage("fetch", ticker):
+        result: FetchResult = fetch_ticker_data(ticker)
+    _count_rows("fetch", ticker, "hourly", result.hourly)
+    _count_rows("fetch", ticker, "daily", result.daily)
+    if result.hourly.empty and result.daily.empty:
+        # Empty downloads also come from outages and rate limits: only a
+        # symbol upstream confirms as missing goes into the negative cache
+        if ticker not in symbol_guard.configured_symbols() and symbol_exists(ticker) is False:
+            reason = "unknown symbol upstream"
+            symbol_guard.mark_unknown(ticker, reason)
+            raise symbol_guard.UnknownTickerError(ticker, reason)
+        raise UpstreamUnavailable(f"No bars returned by upstream for {ticker}")
+    state = _publish(ticker, _run_pipeline(result, ticker))
     logger.info(f"Pipeline refresh complete for {ticker}")
     return state
 
 
+def refresh_ticker(ticker: str) -> PipelineState:
+    """Refresh data for a specific ticker."""
+    if ticker == breadth.TICKER:
+        return _breadth_state()
+    symbol_guard.check_symbol(ticker)
+    return _refresh_flight.do(ticker, lambda: _refresh_ticker(ticker))
+
+
+def _refresh_breadth() -> PipelineState:
+    version = breadth.update()
+    state = _states.get(breadth.TICKER)
+    if version is None or (state is not None and _derived_versions.get(breadth.TICKER) == version):
+        return state or PipelineState(active_ticker=breadth.TICKER)
+    daily = breadth.load()
+    state = _publish(breadth.TICKER, PipelineState(
+        active_ticker=breadth.TICKER,
+        daily_df=daily,
+        last_refresh=datetime.now(timezone.utc).isoformat(),
+        ready=not daily.empty,
+        version=next(_versions),
+    ))
+    _derived_versions[breadth.TICKER] = version
+    return state
+
+
+def _breadth_state() -> PipelineState:
+    """The breadth pseudo-ticker, brought up to date with its constituents.
+
+    It is derived from stored bars rather than fetched, and carries no heat
+    score, regime or plan.
+    """
+    return _init_flight.do(breadth.TICKER, _refresh_breadth)
+
+
+def _refresh_default() -> PipelineState:
+    with profiler.capture_if_armed(f"refresh:{_default_ticker}"):
+        logger.info("Starting pipeline refresh (default)...")
+        with _stage("fetch", _default_ticker):
+            result: FetchResult = fetch_data()
+        _count_rows("fetch", result.active_ticker, "hourly", result.hourly)
+        _count_rows("fetch", result.active_ticker, "daily", result.daily)
+        with _plane_lock(result.active_ticker):
+            state = _publish(result.active_ticker, _run_pipeline(result, result.active_ticker))
+        # If the fetch resolved to another symbol, serve the default key from it
+        if result.active_ticker != _default_ticker:
+            if data_plane.enabled():
+                # Other workers can't see our aliases; give them the snapshot directly
+                _publish(_default_ticker, state)
+            else:
+                _aliases[_default_ticker] = result.active_ticker
+        logger.info("Pipeline refresh complete")
+        return state
+
+
 def refresh() -> PipelineState:
     """Refresh the default ticker using the original primary/fallback logic."""
-    global _states
-    logger.info("Starting pipeline refresh (default)...")
-    result: FetchResult = fetch_data()
-    ticker = result.active_ticker
-    state = _run_pipeline(result, ticker)
-    _states[ticker] = state
-    logger.info("Pipeline refresh complete")
-    return state
+    return _refresh_flight.do(_default_ticker, _refresh_default)
+
+
+def _is_stale(ticker: str) -> bool:
+    data_cfg = get_config()["data"]
+    return parquet_store.needs_refresh(
+        data_cfg["max_age_hours"],
+        ticker=ticker,
+        calendar_aware=data_cfg.get("calendar_aware", False),
+        min_refresh_minutes=data_cfg.get("min_refresh_minutes", 0),
+    )
 
 
 def initialize_ticker(ticker: str) -> PipelineState:
     """Initialize a specific ticker — load from cache or fetch."""
-    cfg = get_config()
-    max_age = cfg["data"]["max_age_hours"]
-
-    if parquet_store.needs_refresh(max_age, ticker=ticker):
+    if _is_stale(ticker):
         logger.info(f"Data for {ticker} is stale or missing, refreshing...")
         return refresh_ticker(ticker)
     else:
@@ -151,8 +409,8 @@ def initialize_ticker(ticker: str) -> PipelineState:
         return _load_from_cache(ticker)
 
 
-def initialize() -> PipelineState:
-    """Initialize on startup — loads the default ticker from config."""
+def configure() -> None:
+    """Set the default ticker from config. Cheap; runs before the port binds."""
     global _default_ticker
     cfg = get_config()
 
@@ -162,38 +420,108 @@ def initialize() -> PipelineState:
         _default_ticker = etfs[0]["symbol"]
     else:
         _default_ticker = cfg["tickers"]["fallback"]
+    _states.pin(_configured_tickers())
 
-    max_age = cfg["data"]["max_age_hours"]
 
-    if parquet_store.needs_refresh(max_age, ticker=_default_ticker):
-        logger.info("Data is stale or missing, refreshing...")
-        # Use the original primary/fallback logic for first startup
-        result: FetchResult = fetch_data()
-        state = _run_pipeline(result, result.active_ticker)
-        _states[result.active_ticker] = state
-        # If fallback was used, also store under the default ticker key
-        if result.active_ticker != _default_ticker:
-            _states[_default_ticker] = state
-        return state
-    else:
-        logger.info("Data is fresh, loading from parquet...")
-        return _load_from_cache(_default_ticker)
+def _configured_tickers() -> list[str]:
+    symbols = [e["symbol"] for e in get_config().get("etfs", [])]
+    return symbols if _default_ticker in symbols else [_default_ticker] + symbols
 
 
-def _load_from_cache(ticker: str) -> PipelineState:
-    hourly = parquet_store.load("hourly", ticker=ticker)
-    daily = parquet_store.load("daily", ticker=ticker)
-    meta = parquet_store.load_metadata(ticker=ticker)
+def initialize() -> PipelineState:
+    """Warm the configured tickers.
+
+    Whatever is persisted is served first, even if stale, so endpoints have
+    data as early as possible; stale tickers are then refreshed.
+    """
+    configure()
+    parquet_store.preload_metadata()
+    dataset.ensure()
+
+    if data_plane.enabled() and not data_plane.try_become_refresher():
+        logger.info("Another worker owns startup refresh; serving shared snapshots")
+        return PipelineState()
+
+    tickers = _configured_tickers()
+    for ticker in tickers:
+        if ticker in _states:
+            continue
+        try:
+            if _load_persisted(ticker) is not None:
+                logger.info(f"Serving persisted data for {ticker} while warming up")
+        except Exception:
+            logger.exception(f"Could not load persisted data for {ticker}")
+
+    for ticker in tickers:
+        if not _is_stale(ticker):
+            continue
+        logger.info(f"Data for {ticker} is stale or missing, refreshing...")
+        try:
+            # The default ticker keeps the original primary/fallback logic
+            refresh() if ticker == _default_ticker else refresh_ticker(ticker)
+        except Exception:
+            logger.exception(f"Warm-up refresh failed for {ticker}")
 
-    if daily.empty or meta is None:
+    return _states.get(_aliases.get(_default_ticker, _default_ticker)) or PipelineState()
+
+
+def _warm_up() -> None:
+    try:
+        initialize()
+        logger.info("Warm-up complete")
+    except Exception:
+        logger.exception("Warm-up failed")
+    finally:
+        _warming.clear()
+
+
+def start_warmup() -> threading.Thread:
+    """Run initialize() in the background so the API can accept connections."""
+    configure()
+    _warming.set()
+    thread = threading.Thread(target=_warm_up, name="warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def is_warming() -> bool:
+    return _warming.is_set()
+
+
+def _load_indicator_frames(ticker: str) -> tuple[pd.DataFrame | ArrowFrame, pd.DataFrame | ArrowFrame]:
+    """Daily/hourly indicator frames, mapped from disk when already computed."""
+    if _lazy_frames():
+        daily_ind = parquet_store.load_indicators("daily", ticker=ticker)
+        hourly_ind = parquet_store.load_indicators("hourly", ticker=ticker)
+        if daily_ind is not None and hourly_ind is not None and not daily_ind.empty:
+            return daily_ind, hourly_ind
+
+    daily_ind = compute_indicators(parquet_store.load("daily", ticker=ticker))
+    hourly_ind = compute_indicators(parquet_store.load("hourly", ticker=ticker))
+    if _lazy_frames() and not daily_ind.empty:
+        daily_ind = parquet_store.save_indicators(daily_ind, "daily", ticker=ticker)
+        hourly_ind = parquet_store.save_indicators(hourly_ind, "hourly", ticker=ticker)
+    return daily_ind, hourly_ind
+
+
+def _load_from_cache(ticker: str) -> PipelineState:
+    state = _load_persisted(ticker)
+    if state is None:
         logger.warning(f"Cache empty for {ticker}, forcing refresh")
         return refresh_ticker(ticker)
+    return state
+
 
-    daily_ind = compute_indicators(daily)
-    hourly_ind = compute_indicators(hourly)
+def _load_persisted(ticker: str) -> PipelineState | None:
+    """Build and publish a state from the store; None if nothing is stored."""
+    meta = parquet_store.load_metadata(ticker=ticker)
+    if meta is None:
+        return None
+    daily_ind, hourly_ind = _load_indicator_frames(ticker)
+    if daily_ind.empty:
+        return None
 
-    latest = daily_ind.iloc[-1].to_dict()
-    prev_row = daily_ind.iloc[-2].to_dict() if len(daily_ind) > 1 else None
+    latest, prev_row = _last_rows(daily_ind)
 
     regime = detect_regime(latest, prev_row)
     heat = compute_heat_score(latest)
@@ -220,23 +548,80 @@ def _load_from_cache(ticker: str) -> PipelineState:
         report=report,
         last_refresh=meta["last_refresh"],
         ready=True,
+        version=next(_versions),
+        **_intraday(ticker, hourly_ind),
     )
 
-    _states[ticker] = state
+    state = _publish(ticker, state)
     logger.info(f"Loaded {ticker} from cache successfully")
     return state
 
 
-def get_state(ticker: str | None = None) -> PipelineState:
-    """Get state for a ticker. Lazily initializes if not yet loaded."""
+def _ensure_loaded(ticker: str) -> PipelineState:
+    # Re-check inside the flight: a previous run may have just finished
+    state = _states.get(ticker)
+    if state is not None:
+        return state
+    if data_plane.enabled():
+        with _plane_lock(ticker):
+            version = data_plane.current_version(ticker)
+            if version is not None:
+                return _adopt(ticker, version)
+    # Not under the plane lock: a refresh takes it inside the refresh flight
+    # and re-checks the published version there. Holding it here would
+    # deadlock against a concurrent refresh_ticker leading that flight.
+    return initialize_ticker(ticker)
+
+
+def get_state(ticker: str | None = None, wait: bool = True) -> PipelineState:
+    """Get the current snapshot for a ticker. Lazily initializes if not yet loaded.
+
+    Never blocks on a refresh in progress for a loaded ticker: the previous
+    snapshot is served until the new one is published. Callers should fetch
+    the snapshot once per request and read every field from it. With
+    ``wait=False`` a ticker still being warmed up returns a not-ready state
+    instead of blocking.
+    """
     if ticker is None:
         ticker = _default_ticker
+    if ticker == breadth.TICKER:
+        return _breadth_state()
+
+    symbol_guard.check_symbol(ticker)
+    ticker = _aliases.get(ticker, ticker)
+    state = _states.get(ticker)
+    if data_plane.enabled():
+        # One stat of CURRENT tells us whether another worker published
+        version = data_plane.current_version(ticker)
+        if version is not None and (state is None or state.version != version):
+            state = _adopt(ticker, version)
+    if state is None:
+        if not wait and _warming.is_set():
+            return PipelineState(active_ticker=ticker)
+        state = _init_flight.do(ticker, lambda: _ensure_loaded(ticker))
+    return state
+
+
+def cache_stats() -> CacheStats:
+    return _states.stats()
+
+
+def memory_usage() -> dict[str, StateMemory]:
+    """Memory breakdown of every cached state, by ticker."""
+    return _states.memory()
+
+
+def _collect_memory_metrics() -> None:
+    metrics.STATE_MEMORY_BYTES.clear()
+    metrics.STATE_MAPPED_BYTES.clear()
+    for ticker, mem in memory_usage().items():
+        for part in ("hourly", "daily", "report", "results"):
+            metrics.STATE_MEMORY_BYTES.set(getattr(mem, f"{part}_bytes"), ticker=ticker, part=part)
+        metrics.STATE_MAPPED_BYTES.set(mem.mapped_bytes, ticker=ticker)
+    rss, peak = process_memory()
+    if rss is not None:
+        metrics.PROCESS_RESIDENT_BYTES.set(rss)
+    metrics.PROCESS_PEAK_RESIDENT_BYTES.set(peak)
 
-    if ticker not in _states:
-        lock = _get_ticker_lock(ticker)
-        with lock:
-            # Double-check after acquiring lock
-            if ticker not in _states:
-                initialize_ticker(ticker)
 
-    return _states.get(ticker, PipelineState())
+metrics.add_collector(_collect_memory_metrics)
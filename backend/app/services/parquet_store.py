@@ -1,60 +1,388 @@
+"""On-disk bar store: one directory per ticker.
+
+    DATA_DIR/<ticker>/metadata.json                   refresh info + manifest
+    DATA_DIR/<ticker>/{hourly,daily}/<tf>.<v>.parquet  versioned bar files
+
+Every write goes to a temp file that is fsynced and renamed into place, so a
+crash never leaves a torn file behind. metadata.json is the manifest: it is
+replaced atomically and names the exact data file of each timeframe, tagged
+with a version that increases on every write. Writers serialize per ticker on
+an advisory file lock (shared across worker processes); readers take no lock,
+resolve the manifest once and read the file it names, which is kept on disk
+for a generation after it is superseded.
+"""
+
+from __future__ import annotations
+
+import hashlib
 import json
 import logging
-from datetime import datetime, timezone
+import os
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Iterator
 
-import pandas as pd
+from app.config import DATA_DIR, get_config
+from app.services import file_lock, market_calendar, metrics, symbol_guard
+from app.services.indicator_engine import compact, compact_enabled
+from app.services.arrow_frames import ArrowFrame, write_frame
+from app.lazy import lazy_import
 
-from app.config import DATA_DIR
+pd = lazy_import("pandas")
+pa = lazy_import("pyarrow")
 
 logger = logging.getLogger(__name__)
 
+# Data files kept per timeframe (current + previous), so a reader that
+# resolved the manifest just before a write can still open its file
+_KEEP_GENERATIONS = 2
+
+# Bump when indicator_engine changes what a frame contains; persisted frames
+# stamped with another version (or indicator config) are recomputed
+_INDICATOR_SCHEMA_VERSION = 1
+
 
-def _ticker_dir(ticker: str) -> Path:
+def _safe_name(ticker: str) -> str:
     # Replace dots/slashes in ticker symbols for safe directory names
-    safe = ticker.replace(".", "_").replace("/", "_")
-    return DATA_DIR / safe
+    return ticker.replace(".", "_").replace("/", "_")
+
+
+def ticker_dir(ticker: str) -> Path:
+    return DATA_DIR / _safe_name(ticker)
 
 
 def _metadata_file(ticker: str) -> Path:
-    return _ticker_dir(ticker) / "metadata.json"
+    return ticker_dir(ticker) / "metadata.json"
 
 
 def _ensure_dirs(ticker: str):
-    base = _ticker_dir(ticker)
+    base = ticker_dir(ticker)
     (base / "hourly").mkdir(parents=True, exist_ok=True)
     (base / "daily").mkdir(parents=True, exist_ok=True)
 
 
+@contextmanager
+def ticker_lock(ticker: str) -> Iterator[None]:
+    """Serialize writers of *ticker* across threads and worker processes."""
+    with file_lock.locked(ticker_dir(ticker) / ".lock"):
+        yield
+
+
+def _fsync_dir(path: Path) -> None:
+    if not hasattr(os, "O_DIRECTORY"):  # Windows: renames are durable already
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _commit_file(tmp: Path, path: Path) -> None:
+    """Flush *tmp* to disk and atomically rename it over *path*."""
+    fd = os.open(tmp, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+    _fsync_dir(path.parent)
+
+
+def _recheck_seconds() -> float:
+    return get_config().get("storage", {}).get("metadata_recheck_seconds", 1.0)
+
+
+def _stamp(st: os.stat_result) -> tuple[int, int]:
+    # A rename always brings a new inode, even within one mtime tick
+    return (st.st_ino, st.st_mtime_ns)
+
+
+@dataclass
+class _CachedManifest:
+    stamp: tuple[int, int] | None  # of metadata.json; None while it doesn't exist
+    doc: dict | None
+    checked: float  # monotonic time of the last stat
+    # (freshness rule, epoch seconds until which the data counts as fresh)
+    fresh_until: tuple[tuple, float] | None = None
+
+
+# (DATA_DIR, ticker directory name) → parsed manifest. Kept coherent by _write_manifest for
+# this process; changes by other processes are noticed by a stat at most every
+# storage.metadata_recheck_seconds.
+_manifests: dict[tuple[Path, str], _CachedManifest] = {}
+
+
+def _read_manifest(ticker: str, fresh: bool = False) -> dict | None:
+    """Current manifest of *ticker* (shared; don't mutate).
+
+    Served from memory; *fresh* forces the stat that otherwise runs at most
+    once per recheck interval.
+    """
+    key = (DATA_DIR, _safe_name(ticker))
+    entry = _manifests.get(key)
+    now = time.monotonic()
+    if entry is not None and not fresh and now - entry.checked < _recheck_seconds():
+        return entry.doc
+
+    path = _metadata_file(ticker)
+    try:
+        with open(path, "r") as f:
+            stamp = _stamp(os.fstat(f.fileno()))
+            if entry is not None and entry.stamp == stamp:
+                entry.checked = now
+                return entry.doc
+            doc = json.load(f)
+    except FileNotFoundError:
+        stamp, doc = None, None
+    except json.JSONDecodeError:
+        # Only files written before writes were atomic can be torn
+        logger.warning(f"Unreadable metadata for {ticker}, treating as missing")
+        stamp, doc = None, None
+    _manifests[key] = _CachedManifest(stamp, doc, now)
+    return doc
+
+
+def _write_manifest(ticker: str, doc: dict) -> dict:
+    """Bump the manifest version and atomically replace metadata.json.
+
+    Callers must hold ``ticker_lock(ticker)``.
+    """
+    doc = {**doc, "version": doc.get("version", 0) + 1}
+    path = _metadata_file(ticker)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(doc, f, indent=2)
+        stamp = _stamp(os.fstat(f.fileno()))
+    _commit_file(tmp, path)
+    _manifests[(DATA_DIR, _safe_name(ticker))] = _CachedManifest(stamp, doc, time.monotonic())
+    return doc
+
+
+def preload_metadata() -> int:
+    """Read every ticker's manifest into memory; returns how many were found."""
+    count = 0
+    for path in DATA_DIR.glob("*/metadata.json"):
+        # The directory name maps to the same cache entry as the ticker
+        if _read_manifest(path.parent.name, fresh=True) is not None:
+            count += 1
+    logger.info(f"Preloaded metadata for {count} tickers")
+    return count
+
+
+def store_version(ticker: str) -> int | None:
+    """Version of *ticker*'s manifest, bumped by every write; None if nothing is stored."""
+    return (_read_manifest(ticker) or {}).get("version")
+
+
+def _resolve(ticker: str, timeframe: str, manifest: dict | None) -> Path:
+    rel = (manifest or {}).get("files", {}).get(timeframe)
+    if rel is not None:
+        return ticker_dir(ticker) / rel
+    # Layout from before the manifest: a single file rewritten in place
+    return ticker_dir(ticker) / timeframe / f"{timeframe}.parquet"
+
+
 def _parquet_path(ticker: str, timeframe: str) -> Path:
-    return _ticker_dir(ticker) / timeframe / f"{timeframe}.parquet"
+    """Data file the current manifest names for *timeframe*."""
+    return _resolve(ticker, timeframe, _read_manifest(ticker))
+
+
+def _generation(path: Path, timeframe: str) -> int | None:
+    if path.name == f"{timeframe}.parquet":
+        return 0
+    m = re.fullmatch(rf"{re.escape(timeframe)}\.(\d+)\.parquet", path.name)
+    return int(m.group(1)) if m else None
+
+
+def _prune(ticker: str, timeframe: str) -> None:
+    """Drop superseded data files and temp files left by a crashed writer.
+
+    Callers must hold ``ticker_lock(ticker)``.
+    """
+    folder = ticker_dir(ticker) / timeframe
+    for tmp in folder.glob(f"{timeframe}.*.parquet.tmp"):
+        tmp.unlink(missing_ok=True)
+    generations = sorted(
+        (g, p) for p in folder.glob(f"{timeframe}*.parquet")
+        if (g := _generation(p, timeframe)) is not None
+    )
+    for _, old in generations[:-_KEEP_GENERATIONS]:
+        old.unlink(missing_ok=True)
+
+
+def _parquet_cfg() -> dict:
+    return get_config().get("storage", {}).get("parquet", {})
+
+
+def _period_keys(index: pd.DatetimeIndex, period: str):
+    """Row-group key per row: calendar year, month or ISO week."""
+    if period == "year":
+        return index.year
+    if period == "week":
+        iso = index.isocalendar()
+        return (iso.year * 100 + iso.week).to_numpy()
+    return index.year * 100 + index.month
+
+
+def _write_parquet(df: pd.DataFrame, path: Path, timeframe: str) -> None:
+    """Write *df* with the configured codec, one row group per time period.
+
+    Row-group statistics on the time index let load(start=, end=) skip whole
+    periods, and byte-stream-split makes float columns compress far better.
+    """
+    import pyarrow.parquet as pq
+
+    cfg = _parquet_cfg()
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    floats = [c for c in df.columns if df[c].dtype.kind == "f"]
+    split = floats if cfg.get("byte_stream_split", False) else False
+    # Dictionaries rarely pay off for continuous floats
+    dictionary = [c for c in table.column_names if c not in floats]
+
+    period = cfg.get("row_group_period", {}).get(timeframe)
+    with pq.ParquetWriter(
+        path,
+        table.schema,
+        compression=cfg.get("compression", "snappy"),
+        compression_level=cfg.get("compression_level"),
+        use_byte_stream_split=split,
+        use_dictionary=dictionary,
+    ) as writer:
+        if period is None or df.empty:
+            writer.write_table(table)
+            return
+        keys = _period_keys(df.index, period)
+        # Data is sorted, so each period is one contiguous slice
+        bounds = [0] + [i for i in range(1, len(keys)) if keys[i] != keys[i - 1]] + [len(keys)]
+        for lo, hi in zip(bounds, bounds[1:]):
+            writer.write_table(table.slice(lo, hi - lo), row_group_size=hi - lo)
 
 
 def save(df: pd.DataFrame, timeframe: str, ticker: str = "SPY") -> None:
-    _ensure_dirs(ticker)
-    path = _parquet_path(ticker, timeframe)
-
-    if path.exists():
-        existing = pd.read_parquet(path)
-        combined = pd.concat([existing, df])
-        combined = combined[~combined.index.duplicated(keep="last")]
-        combined = combined.sort_index()
-        combined.to_parquet(path, engine="pyarrow")
-        logger.info(
-            f"Merged {ticker}/{timeframe}: {len(existing)}+{len(df)} "
-            f"→ {len(combined)} rows"
-        )
-    else:
-        df.to_parquet(path, engine="pyarrow")
-        logger.info(f"Saved {ticker}/{timeframe}: {len(df)} rows")
-
-
-def load(timeframe: str, ticker: str = "SPY") -> pd.DataFrame:
-    path = _parquet_path(ticker, timeframe)
+    """Merge *df* into the stored bars and publish the result as a new file."""
+    if compact_enabled():
+        df = compact(df)
+
+    with ticker_lock(ticker):
+        _ensure_dirs(ticker)
+        manifest = _read_manifest(ticker, fresh=True) or {}
+        current = _resolve(ticker, timeframe, manifest)
+        if current.exists():
+            existing = _read(current)
+            combined = pd.concat([existing, df])
+            combined = combined[~combined.index.duplicated(keep="last")]
+            combined = combined.sort_index()
+            if compact_enabled():
+                # Mixed old/new dtypes widen on concat
+                combined = compact(combined)
+            message = f"Merged {ticker}/{timeframe}: {len(existing)}+{len(df)} → {len(combined)} rows"
+        else:
+            combined = df.sort_index()
+            message = f"Saved {ticker}/{timeframe}: {len(df)} rows"
+
+        version = manifest.get("version", 0) + 1
+        path = ticker_dir(ticker) / timeframe / f"{timeframe}.{version}.parquet"
+        tmp = path.with_name(path.name + ".tmp")
+        _write_parquet(combined, tmp, timeframe)
+        _commit_file(tmp, path)
+        _write_manifest(ticker, {
+            **manifest,
+            "ticker": ticker,
+            "files": {**manifest.get("files", {}), timeframe: f"{timeframe}/{path.name}"},
+        })
+        _prune(ticker, timeframe)
+
+        from app.services import dataset
+        if dataset.enabled() and dataset.mirrored(ticker):
+            dataset.sync(ticker, timeframe, combined)
+    logger.info(f"{message} (v{version})")
+    metrics.STORE_BYTES_WRITTEN.inc(
+        path.stat().st_size, ticker=symbol_guard.metric_label(ticker), timeframe=timeframe
+    )
+
+
+def load(
+    timeframe: str,
+    ticker: str = "SPY",
+    columns: list[str] | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> pd.DataFrame:
+    """Read stored bars, optionally only *columns* and bars in [start, end).
+
+    The time range is pushed down to the reader, so row groups outside it
+    are skipped without being decompressed.
+    """
+    try:
+        return _read(_parquet_path(ticker, timeframe), columns, start, end)
+    except FileNotFoundError:
+        # Missing, or superseded and pruned since we last checked the manifest
+        path = _resolve(ticker, timeframe, _read_manifest(ticker, fresh=True))
+        return _read(path, columns, start, end) if path.exists() else pd.DataFrame()
+
+
+def _read(
+    path: Path,
+    columns: list[str] | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> pd.DataFrame:
+    import pyarrow.parquet as pq
+
+    filters = []
+    if start is not None or end is not None:
+        # The index column name comes from the footer; no data is read
+        index_col = pq.read_schema(path).pandas_metadata["index_columns"][0]
+        if start is not None:
+            filters.append((index_col, ">=", pd.Timestamp(start)))
+        if end is not None:
+            filters.append((index_col, "<", pd.Timestamp(end)))
+    table = pq.read_pandas(path, columns=columns, filters=filters or None)
+    return table.to_pandas()
+
+
+def _indicators_path(ticker: str, timeframe: str) -> Path:
+    return ticker_dir(ticker) / timeframe / "indicators.arrow"
+
+
+def _indicator_stamp() -> str:
+    """Hash of the indicator config, storage mode and schema version."""
+    spec = {
+        "version": _INDICATOR_SCHEMA_VERSION,
+        "indicators": get_config()["indicators"],
+        "compact": compact_enabled(),
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def save_indicators(df: pd.DataFrame, timeframe: str, ticker: str = "SPY") -> ArrowFrame:
+    """Persist an indicator frame as Arrow IPC and return a mapped handle on it."""
+    with ticker_lock(ticker):
+        _ensure_dirs(ticker)
+        path = _indicators_path(ticker, timeframe)
+        write_frame(df, path, metadata={"indicator_stamp": _indicator_stamp()})
+    return ArrowFrame(path)
+
+
+def load_indicators(timeframe: str, ticker: str = "SPY") -> ArrowFrame | None:
+    """Mapped indicator frame, or None if missing, older than the raw data or
+    computed under another indicator config or schema version."""
+    path = _indicators_path(ticker, timeframe)
+    raw = _parquet_path(ticker, timeframe)
     if not path.exists():
-        return pd.DataFrame()
-    df = pd.read_parquet(path)
-    return df
+        return None
+    if raw.exists() and raw.stat().st_mtime_ns > path.stat().st_mtime_ns:
+        return None
+    frame = ArrowFrame(path)
+    if frame.metadata.get("indicator_stamp") != _indicator_stamp():
+        logger.info(f"Ignoring {ticker} {timeframe} indicators computed under another config")
+        return None
+    return frame
 
 
 def save_metadata(
@@ -62,31 +390,90 @@ def save_metadata(
     used_fallback: bool,
     fallback_reason: str | None,
     ticker: str = "SPY",
-):
-    _ensure_dirs(ticker)
-    meta = {
-        "last_refresh": datetime.now(timezone.utc).isoformat(),
-        "active_ticker": active_ticker,
-        "used_fallback": used_fallback,
-        "fallback_reason": fallback_reason,
-    }
-    with open(_metadata_file(ticker), "w") as f:
-        json.dump(meta, f, indent=2)
+    last_bar: datetime | None = None,
+) -> dict:
+    """Record a completed refresh in the manifest; returns the new metadata."""
+    with ticker_lock(ticker):
+        _ensure_dirs(ticker)
+        meta = _write_manifest(ticker, {
+            **(_read_manifest(ticker, fresh=True) or {}),
+            "last_refresh": datetime.now(timezone.utc).isoformat(),
+            "active_ticker": active_ticker,
+            "used_fallback": used_fallback,
+            "fallback_reason": fallback_reason,
+            "last_bar": last_bar.isoformat() if last_bar is not None else None,
+        })
     logger.info(f"Metadata saved for {ticker}: active={active_ticker}, fallback={used_fallback}")
+    return meta
 
 
 def load_metadata(ticker: str = "SPY") -> dict | None:
-    mf = _metadata_file(ticker)
-    if not mf.exists():
+    """Metadata of the last completed refresh, or None if there was none.
+
+    Served from the in-memory index; the dict is shared, don't mutate it.
+    """
+    meta = _read_manifest(ticker)
+    if meta is None or "last_refresh" not in meta:
+        # Bars stored by a refresh that never finished
         return None
-    with open(mf, "r") as f:
-        return json.load(f)
+    return meta
 
 
-def needs_refresh(max_age_hours: float = 1.0, ticker: str = "SPY") -> bool:
+def _last_stored_bar(meta: dict, ticker: str) -> datetime | None:
+    if meta.get("last_bar"):
+        return datetime.fromisoformat(meta["last_bar"])
+    # Metadata written before last_bar was tracked: read just the index
+    path = _parquet_path(ticker, "hourly")
+    if not path.exists():
+        return None
+    index = load("hourly", ticker=ticker, columns=[]).index
+    if index.empty:
+        return None
+    return index.max().to_pydatetime()
+
+
+def needs_refresh(
+    max_age_hours: float = 1.0,
+    ticker: str = "SPY",
+    calendar_aware: bool = False,
+    min_refresh_minutes: float = 0.0,
+) -> bool:
+    """Decide whether the stored data for *ticker* is stale.
+
+    With *calendar_aware*, data stays fresh until the next bar the ticker's
+    exchange can produce after the last stored one (so nights, weekends and
+    holidays never trigger a refetch). Tickers on exchanges we don't model
+    use the plain *max_age_hours* rule.
+    """
     meta = load_metadata(ticker)
     if meta is None:
         return True
+    # The deadline only depends on the manifest and the rule, so it is
+    # computed once per refresh and the hot path is a float comparison
+    rule = (max_age_hours, calendar_aware, min_refresh_minutes)
+    entry = _manifests.get((DATA_DIR, _safe_name(ticker)))
+    cached = entry is not None and entry.doc is meta
+    if cached and entry.fresh_until is not None and entry.fresh_until[0] == rule:
+        return time.time() >= entry.fresh_until[1]
+
+    until = _fresh_until(meta, ticker, *rule).timestamp()
+    if cached:
+        entry.fresh_until = (rule, until)
+    return time.time() >= until
+
+
+def _fresh_until(
+    meta: dict,
+    ticker: str,
+    max_age_hours: float,
+    calendar_aware: bool,
+    min_refresh_minutes: float,
+) -> datetime:
     last = datetime.fromisoformat(meta["last_refresh"])
-    age = (datetime.now(timezone.utc) - last).total_seconds() / 3600
-    return age > max_age_hours
+    exchange = market_calendar.exchange_for(ticker) if calendar_aware else None
+    last_bar = _last_stored_bar(meta, ticker) if exchange is not None else None
+    if last_bar is None:
+        return last + timedelta(hours=max_age_hours)
+
+    due = market_calendar.next_expected_bar(exchange, last_bar, last)
+    return max(due, last + timedelta(minutes=min_refresh_minutes))
@@ -0,0 +1,154 @@
+"""On-demand cProfile captures for slow requests and refreshes.
+
+Profiling is off unless an admin token is configured (``profiling.token`` in
+config.yaml or the ``PROFILE_TOKEN`` environment variable). Only one capture
+runs at a time and captures are spaced at least ``min_interval_seconds``
+apart, so the hook can't be used to slow the server down. Captures are
+written as pstats files to ``DATA_DIR/profiles`` and pruned to
+``max_profiles``.
+"""
+
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+from app.config import DATA_DIR, get_config
+
+logger = logging.getLogger(__name__)
+
+_NAME_RE = re.compile(r"^[A-Za-z0-9_.=-]+\.pstats$")
+
+# Held while a capture runs; a second capture is refused rather than queued
+_running = threading.Lock()
+_last_start = float("-inf")
+_start_lock = threading.Lock()
+
+# Targets (e.g. "refresh:SPY") whose next run should be captured
+_armed: set[str] = set()
+
+
+class ProfilerBusy(RuntimeError):
+    """A capture is already running or the last one started too recently."""
+
+
+def _cfg() -> dict:
+    return get_config().get("profiling", {})
+
+
+def profiles_dir() -> Path:
+    return DATA_DIR / "profiles"
+
+
+def enabled() -> bool:
+    return bool(os.environ.get("PROFILE_TOKEN") or _cfg().get("token"))
+
+
+def authorized(token: str | None) -> bool:
+    expected = os.environ.get("PROFILE_TOKEN") or _cfg().get("token")
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(token.encode(), str(expected).encode())
+
+
+def _reserve() -> None:
+    global _last_start
+    if not _running.acquire(blocking=False):
+        raise ProfilerBusy("a profile is already being captured")
+    with _start_lock:
+        wait = _last_start + _cfg().get("min_interval_seconds", 30) - time.monotonic()
+        if wait > 0:
+            _running.release()
+            raise ProfilerBusy(f"next profile allowed in {wait:.0f}s")
+        _last_start = time.monotonic()
+
+
+def _save(profile: cProfile.Profile, label: str) -> str:
+    directory = profiles_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    safe = re.sub(r"[^A-Za-z0-9_.=-]", "_", label)[:80]
+    name = f"{stamp}-{safe}.pstats"
+    profile.dump_stats(directory / name)
+
+    keep = _cfg().get("max_profiles", 20)
+    for old in sorted(directory.glob("*.pstats"))[:-keep]:
+        old.unlink(missing_ok=True)
+    logger.info(f"Saved profile {name}")
+    return name
+
+
+@contextmanager
+def capture(label: str) -> Iterator[dict]:
+    """Profile the calling thread for the duration of the block.
+
+    Yields a dict whose ``name`` is set to the stored profile once the block
+    exits. Raises ProfilerBusy if the rate limit refuses the capture.
+    """
+    _reserve()
+    result: dict = {"name": None}
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+        try:
+            yield result
+        finally:
+            profile.disable()
+            result["name"] = _save(profile, label)
+    finally:
+        _running.release()
+
+
+def arm(target: str) -> None:
+    """Capture the next run of *target* (e.g. ``refresh:SPY``)."""
+    _armed.add(target)
+    logger.info(f"Profiler armed for {target}")
+
+
+@contextmanager
+def capture_if_armed(target: str) -> Iterator[None]:
+    """Run the block under capture() if *target* was armed and the limit allows."""
+    with ExitStack() as stack:
+        if target in _armed:
+            try:
+                stack.enter_context(capture(target))
+                _armed.discard(target)
+            except ProfilerBusy as e:
+                # Stay armed; a later run will be captured
+                logger.info(f"Skipping armed profile for {target}: {e}")
+        yield
+
+
+def list_profiles() -> list[dict]:
+    directory = profiles_dir()
+    if not directory.exists():
+        return []
+    return [
+        {"name": p.name, "size_bytes": p.stat().st_size}
+        for p in sorted(directory.glob("*.pstats"), reverse=True)
+    ]
+
+
+def profile_path(name: str) -> Path | None:
+    """Path of a stored profile, or None if *name* is invalid or missing."""
+    if not _NAME_RE.match(name):
+        return None
+    path = profiles_dir() / name
+    return path if path.exists() else None
+
+
+def summarize(path: Path, limit: int = 50) -> str:
+    """Top functions by cumulative time, as pstats prints them."""
+    out = io.StringIO()
+    stats = pstats.Stats(str(path), stream=out)
+    stats.sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
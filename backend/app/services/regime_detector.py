@@ -3,6 +3,7 @@ from dataclasses import dataclass, field
 
 from app.config import get_config
 from app.models.enums import MarketRegime, RiskFlag
+from app.services.heat_score import bar_scale
 
 logger = logging.getLogger(__name__)
 
@@ -15,8 +16,10 @@ class RegimeResult:
     details: dict[str, str] = field(default_factory=dict)
 
 
-def detect_regime(latest: dict, prev_row: dict | None = None) -> RegimeResult:
+def detect_regime(latest: dict, prev_row: dict | None = None, timeframe: str = "daily") -> RegimeResult:
     cfg = get_config()["regime"]
+    # Bar volatility shrinks with the bar length, as in the heat score ranges
+    high_volatility = cfg["high_volatility_threshold"] * bar_scale(timeframe)
     risk_flags: list[RiskFlag] = []
     details: dict[str, str] = {}
 
@@ -67,11 +70,11 @@ def detect_regime(latest: dict, prev_row: dict | None = None) -> RegimeResult:
             details["rsi"] = f"RSI={rsi:.1f} (neutral)"
 
     if volatility is not None:
-        if volatility > cfg["high_volatility_threshold"]:
+        if volatility > high_volatility:
             risk_flags.append(RiskFlag.HIGH_VOLATILITY)
             details["volatility"] = (
                 f"Annualized volatility={volatility:.1%} > "
-                f"{cfg['high_volatility_threshold']:.0%}"
+                f"{high_volatility:.0%}"
             )
         else:
             details["volatility"] = f"Annualized volatility={volatility:.1%}"
@@ -0,0 +1,115 @@
+"""Derived timeframes resampled from stored bars.
+
+``4h`` bars are built from the stored hourly bars, and ``weekly`` and
+``monthly`` bars from the stored daily bars, so they cost no download. Bars
+are bucketed in the exchange's timezone:
+
+- A 4h bar starts at the session open, then every four hours after it (for
+  NYSE: 09:30 and 13:30). Pre-market bars fall into their own bucket.
+  Venues the calendar doesn't model use UTC, with buckets from midnight.
+- A weekly or monthly bar covers the sessions of one calendar week
+  (Monday to Sunday) or month. It is stamped with its first session, so a
+  week starting on a holiday is stamped on its first trading day.
+
+Indicator frames are cached in memory per ticker and timeframe until the
+source bars are written again.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from app.config import get_config
+from app.services import market_calendar, parquet_store
+from app.services.indicator_engine import compute_indicators
+from app.lazy import lazy_import
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+# Derived timeframe → stored timeframe it is built from
+TIMEFRAMES = {"4h": "hourly", "weekly": "daily", "monthly": "daily"}
+
+_AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+# (DATA_DIR, ticker, timeframe) → (store version, indicator frame)
+_cache: OrderedDict[tuple, tuple[int | None, pd.DataFrame]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cfg() -> dict:
+    return get_config().get("resample", {})
+
+
+def _aggregate(df: pd.DataFrame, keys) -> pd.DataFrame:
+    """OHLCV bars of the groups of *keys*, stamped with each group's first bar."""
+    agg = {col: how for col, how in _AGG.items() if col in df.columns}
+    grouped = df[list(agg)].groupby(keys, sort=True)
+    out = grouped.agg(agg)
+    first = df.index.to_series().groupby(keys, sort=True).first()
+    out.index = pd.DatetimeIndex(first.to_numpy(), tz="UTC")
+    out.index.name = df.index.name
+    return out
+
+
+def resample(df: pd.DataFrame, timeframe: str, ticker: str) -> pd.DataFrame:
+    """Bars of *df* (hourly for ``4h``, daily otherwise) in *timeframe*."""
+    if df.empty or "Close" not in df.columns:
+        return df.iloc[:0]
+    if timeframe == "4h":
+        exchange = market_calendar.exchange_for(ticker)
+        local = df.index.tz_convert(exchange.tz if exchange else "UTC").tz_localize(None)
+        day = local.normalize()
+        opens = timedelta(0)
+        if exchange is not None:
+            opens = timedelta(hours=exchange.open.hour, minutes=exchange.open.minute)
+        bucket = (local - (day + opens)) // pd.Timedelta(hours=4)
+        keys = day.to_numpy() + np.asarray(bucket) * np.timedelta64(4, "h")
+    elif timeframe in ("weekly", "monthly"):
+        # Daily bars are stamped at local midnight (22:00 UTC the day before
+        # in Frankfurt, 04:00 UTC in New York); +12h lands on the session date
+        day = (df.index.tz_convert("UTC") + pd.Timedelta(hours=12)).normalize().tz_localize(None)
+        if timeframe == "weekly":
+            keys = (day - pd.to_timedelta(day.weekday, unit="D")).to_numpy()
+        else:
+            keys = np.asarray(day.year * 12 + day.month)
+    else:
+        raise ValueError(f"Unknown timeframe {timeframe!r}")
+    return _aggregate(df, keys)
+
+
+def indicators(ticker: str, timeframe: str, start: datetime | None = None) -> pd.DataFrame:
+    """Indicator frame for the derived *timeframe*, from *ticker*'s stored bars.
+
+    With *start*, only rows from then on; indicators are always computed on
+    the full history.
+    """
+    source = TIMEFRAMES[timeframe]
+    key = (parquet_store.DATA_DIR, ticker, timeframe)
+    version = parquet_store.store_version(ticker)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == version:
+            _cache.move_to_end(key)
+            frame = cached[1]
+        else:
+            frame = None
+
+    if frame is None:
+        bars = resample(parquet_store.load(source, ticker=ticker), timeframe, ticker)
+        frame = compute_indicators(bars)
+        logger.info(f"Resampled {ticker} {source} → {timeframe}: {len(frame)} bars (v{version})")
+        with _cache_lock:
+            _cache[key] = (version, frame)
+            _cache.move_to_end(key)
+            while len(_cache) > _cfg().get("cache_entries", 64):
+                _cache.popitem(last=False)
+
+    if start is not None and not frame.empty:
+        return frame[frame.index >= start]
+    return frame
@@ -0,0 +1,368 @@
+"""Universe screener: heat score and regime for hundreds of symbols.
+
+Symbols come from a universe file (one per line, ``#`` comments) and go
+through the same malformed/negative-cache check as ``?ticker=``. A run
+downloads daily bars on a bounded thread pool and sends the CPU work to a
+process pool that is started on first use and kept until the app exits. The download is incremental when bars are already stored, and
+the CPU work covers validation, merge into the store, indicators,
+``compute_heat_score`` and ``detect_regime``. The ranking is kept in memory
+and persisted to ``DATA_DIR/screener.json`` so it survives restarts.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from app.config import CONFIG_PATH, get_config
+from app.services import breadth, parquet_store, symbol_guard
+from app.services.data_fetcher import fetch_daily
+from app.services.data_validator import validate
+from app.services.heat_score import compute_heat_score
+from app.services.indicator_engine import compute_indicators
+from app.services.regime_detector import detect_regime
+from app.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+# yfinance periods and the calendar days each one safely covers
+_PERIODS = (("5d", 5), ("1mo", 28), ("3mo", 90), ("6mo", 180), ("1y", 365))
+
+
+@dataclass
+class ScreenerRow:
+    ticker: str
+    score: Optional[float] = None
+    label: Optional[str] = None
+    regime: Optional[str] = None
+    confidence: Optional[float] = None
+    risk_flags: list[str] = field(default_factory=list)
+    close: Optional[float] = None
+    change_1d: Optional[float] = None
+    rsi: Optional[float] = None
+    drawdown: Optional[float] = None
+    last_bar: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class ScreenerResults:
+    rows: list[ScreenerRow] = field(default_factory=list)
+    as_of: Optional[str] = None
+    duration_s: float = 0.0
+    universe_size: int = 0
+
+
+_lock = threading.Lock()
+_results = ScreenerResults()
+_loaded = False
+_running: threading.Thread | None = None
+
+# Analysis workers, kept across runs so each run skips worker start-up and
+# imports. Keyed by what the workers were started with.
+_pool_lock = threading.Lock()
+_pool: ProcessPoolExecutor | None = None
+_pool_key: tuple[int, str] | None = None
+
+
+def _cfg() -> dict:
+    return get_config().get("screener", {})
+
+
+def universe_path() -> Path:
+    path = Path(_cfg().get("universe_file", "universe.txt"))
+    return path if path.is_absolute() else CONFIG_PATH.parent / path
+
+
+def load_universe(path: Path | None = None) -> list[str]:
+    """Symbols in *path*, upper-cased and de-duplicated in file order."""
+    symbols: dict[str, None] = {}
+    for line in (path or universe_path()).read_text().splitlines():
+        symbol = line.split("#", 1)[0].strip().upper()
+        if symbol:
+            symbols[symbol] = None
+    return list(symbols)
+
+
+def _results_file() -> Path:
+    return parquet_store.DATA_DIR / "screener.json"
+
+
+# ── Per-symbol work ───────────────────────────────────────────
+
+def _fetch_period(ticker: str) -> str:
+    """Shortest download period that overlaps the bars already stored."""
+    full = get_config()["data"]["daily_period"]
+    stored = parquet_store.load("daily", ticker=ticker, columns=[]).index
+    if stored.empty:
+        return full
+    gap = (datetime.now(timezone.utc) - stored.max().to_pydatetime()).days
+    for period, days in _PERIODS:
+        # A few days of overlap so a bar fetched mid-session is replaced
+        if gap + 3 <= days:
+            return period
+    return full
+
+
+def _fetch(ticker: str) -> pd.DataFrame:
+    return fetch_daily(ticker, _fetch_period(ticker))
+
+
+def _num(value) -> float | None:
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if v != v else v
+
+
+def analyze(ticker: str, fetched: pd.DataFrame) -> ScreenerRow:
+    """Store *fetched* daily bars and score the ticker's full history.
+
+    Runs in a pool worker, so it only takes and returns picklable values.
+    """
+    daily = validate(fetched, label=f"{ticker} daily")
+    if not daily.empty:
+        parquet_store.save(daily, "daily", ticker=ticker)
+    history = parquet_store.load("daily", ticker=ticker)
+    if history.empty:
+        return ScreenerRow(ticker=ticker, error="no data")
+
+    ind = compute_indicators(history)
+    tail = ind.tail(2)
+    latest = tail.iloc[-1].to_dict()
+    prev_row = tail.iloc[-2].to_dict() if len(tail) > 1 else None
+    heat = compute_heat_score(latest)
+    regime = detect_regime(latest, prev_row)
+
+    close = _num(latest.get("Close"))
+    prev_close = _num(prev_row.get("Close")) if prev_row else None
+    return ScreenerRow(
+        ticker=ticker,
+        score=round(heat.score, 2),
+        label=heat.label,
+        regime=regime.regime.value,
+        confidence=round(regime.confidence, 3),
+        risk_flags=[f.value for f in regime.risk_flags],
+        close=close,
+        change_1d=(close / prev_close - 1) if close and prev_close else None,
+        rsi=_num(latest.get("RSI_14")),
+        drawdown=_num(latest.get("drawdown")),
+        last_bar=tail.index[-1].isoformat(),
+    )
+
+
+def _init_worker(data_dir: str) -> None:
+    # Spawned workers re-import the app; point them at the parent's store
+    parquet_store.DATA_DIR = Path(data_dir)
+
+
+def _process_pool(processes: int) -> Executor | None:
+    """The shared analysis pool, started on first use.
+
+    Replaced when the worker count or store directory changed since it was
+    started, or after a worker died.
+    """
+    global _pool, _pool_key
+    if processes <= 0:
+        return None
+    key = (processes, str(parquet_store.DATA_DIR))
+    with _pool_lock:
+        if _pool is not None and _pool_key != key:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            # Spawn, not fork: the API process runs threads that fork can't copy safely
+            _pool = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(key[1],),
+            )
+            _pool_key = key
+        return _pool
+
+
+def _discard_pool(pool: Executor) -> None:
+    """Drop *pool* after a worker died, so the next run starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown() -> None:
+    """Stop the analysis workers (at app exit)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+def _failed(ticker: str, error: Exception) -> ScreenerRow:
+    logger.warning(f"Screener failed for {ticker}: {error}")
+    return ScreenerRow(ticker=ticker, error=str(error) or type(error).__name__)
+
+
+def _screen(ticker: str, pool: Executor | None) -> ScreenerRow | Future:
+    """Download on the calling (I/O) thread and hand the bars to the pool.
+
+    Returns the pool's future rather than waiting on it, so the download
+    slot is free for the next symbol while this one is analyzed.
+    """
+    try:
+        symbol_guard.check_symbol(ticker)
+        fetched = _fetch(ticker)
+        if pool is None:
+            return analyze(ticker, fetched)
+        return pool.submit(analyze, ticker, fetched)
+    except BrokenProcessPool as e:
+        _discard_pool(pool)
+        return _failed(ticker, e)
+    except Exception as e:
+        return _failed(ticker, e)
+
+
+def _collect(ticker: str, outcome: ScreenerRow | Future, pool: Executor | None) -> ScreenerRow:
+    if isinstance(outcome, ScreenerRow):
+        return outcome
+    try:
+        return outcome.result()
+    except BrokenProcessPool as e:
+        _discard_pool(pool)
+        return _failed(ticker, e)
+    except Exception as e:
+        return _failed(ticker, e)
+
+
+# ── Runs ──────────────────────────────────────────────────────
+
+def run(symbols: list[str] | None = None) -> ScreenerResults:
+    """Screen *symbols* (default: the universe file) and publish the ranking."""
+    global _results
+    cfg = _cfg()
+    symbols = symbols if symbols is not None else load_universe()
+    start = time.perf_counter()
+    logger.info(f"Screening {len(symbols)} symbols")
+
+    pool = _process_pool(cfg.get("processes", 4))
+    # The thread count bounds concurrent upstream downloads
+    with ThreadPoolExecutor(
+        max_workers=cfg.get("download_concurrency", 8), thread_name_prefix="screener"
+    ) as fetchers:
+        fetched = [fetchers.submit(_screen, s, pool) for s in symbols]
+        outcomes = [f.result() for f in fetched]
+    rows = [_collect(s, o, pool) for s, o in zip(symbols, outcomes)]
+
+    results = ScreenerResults(
+        rows=rows,
+        as_of=datetime.now(timezone.utc).isoformat(),
+        duration_s=round(time.perf_counter() - start, 2),
+        universe_size=len(symbols),
+    )
+    with _lock:
+        _results = results
+    _persist(results)
+    try:
+        # Fold the refreshed constituents into the breadth series right away
+        breadth.update()
+    except Exception:
+        logger.exception("Breadth update after screener run failed")
+    failed = sum(r.error is not None for r in rows)
+    logger.info(f"Screened {len(rows)} symbols in {results.duration_s}s ({failed} failed)")
+    return results
+
+
+def start() -> bool:
+    """Run the screener in the background; False if a run is in progress."""
+    global _running
+    with _lock:
+        if _running is not None and _running.is_alive():
+            return False
+        _running = threading.Thread(target=_run_logged, name="screener", daemon=True)
+        _running.start()
+    return True
+
+
+def _run_logged() -> None:
+    try:
+        run()
+    except Exception:
+        logger.exception("Screener run failed")
+
+
+def is_running() -> bool:
+    return _running is not None and _running.is_alive()
+
+
+def _persist(results: ScreenerResults) -> None:
+    path = _results_file()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(asdict(results), f)
+    tmp.replace(path)
+
+
+def results() -> ScreenerResults:
+    """Latest ranking (from the last run, or as persisted by a previous process)."""
+    global _results, _loaded
+    with _lock:
+        if not _loaded and _results.as_of is None:
+            try:
+                with open(_results_file(), "r") as f:
+                    doc = json.load(f)
+                _results = ScreenerResults(
+                    rows=[ScreenerRow(**r) for r in doc.pop("rows")], **doc
+                )
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"Ignoring unreadable screener results: {e}")
+        _loaded = True
+        return _results
+
+
+# ── Ranking ───────────────────────────────────────────────────
+
+SORT_FIELDS = ("score", "change_1d", "rsi", "drawdown", "confidence", "close", "ticker")
+
+
+def rank(
+    rows: list[ScreenerRow],
+    sort: str = "score",
+    descending: bool = False,
+    regime: str | None = None,
+    label: str | None = None,
+    min_score: float | None = None,
+    max_score: float | None = None,
+    include_errors: bool = False,
+) -> list[ScreenerRow]:
+    """Filter *rows* and sort them by *sort*; rows missing the field go last."""
+    if sort not in SORT_FIELDS:
+        raise ValueError(f"Unknown sort field {sort!r}")
+    out = [
+        r for r in rows
+        if (include_errors or r.error is None)
+        and (regime is None or r.regime == regime)
+        and (label is None or r.label == label)
+        and (min_score is None or (r.score is not None and r.score >= min_score))
+        and (max_score is None or (r.score is not None and r.score <= max_score))
+    ]
+    present = [r for r in out if getattr(r, sort) is not None]
+    missing = [r for r in out if getattr(r, sort) is None]
+    present.sort(key=lambda r: getattr(r, sort), reverse=descending)
+    return present + missing
@@ -0,0 +1,79 @@
+"""Duplicate-call suppression for expensive per-key work.
+
+Concurrent callers for the same key share a single in-flight run and its
+result (or exception). A run that completed less than *debounce_seconds*
+ago is reused instead of starting a new one.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+        self.finished_at: float = 0.0
+
+
+class SingleFlight(Generic[T]):
+    def __init__(self, debounce_seconds: float = 0.0):
+        self.debounce_seconds = debounce_seconds
+        self._lock = threading.Lock()
+        self._inflight: dict[str, _Call[T]] = {}
+        self._recent: dict[str, _Call[T]] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            recent = self._recent.get(key)
+            if recent is not None:
+                logger.info(f"Reusing result for {key} finished {now - recent.finished_at:.1f}s ago")
+                return recent.result
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._inflight[key] = call
+
+        if not leader:
+            logger.info(f"Joining in-flight run for {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            call.finished_at = time.monotonic()
+            with self._lock:
+                self._inflight.pop(key, None)
+                if call.error is None and self.debounce_seconds > 0:
+                    self._recent[key] = call
+            call.done.set()
+        return call.result
+
+    def forget(self, key: str) -> None:
+        """Drop the debounced result for *key* so the next call runs again."""
+        with self._lock:
+            self._recent.pop(key, None)
+
+    def _prune(self, now: float) -> None:
+        expired = [
+            k for k, c in self._recent.items()
+            if now - c.finished_at >= self.debounce_seconds
+        ]
+        for k in expired:
+            del self._recent[k]
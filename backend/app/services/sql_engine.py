@@ -0,0 +1,220 @@
+"""Read-only SQL over the store, executed by embedded DuckDB.
+
+Each query gets a fresh in-memory DuckDB connection exposing two views:
+
+    bars        ticker, timeframe, Datetime, Open, High, Low, Close, Volume
+                (the consolidated parquet dataset, scanned in place)
+    indicators  ticker, timeframe, Datetime and every indicator column
+                (the persisted Arrow frames, memory-mapped, not copied)
+
+The endpoint is off unless ``sql.enabled`` is set and an admin token is
+configured (``sql.token`` or the ``SQL_TOKEN`` environment variable). The
+sandbox admits exactly one SELECT statement. File access is limited to the
+consolidated dataset and the configuration is locked before the query runs,
+so a query can neither write nor read anything else. Results stream back as
+NDJSON in record batches. The query is capped at ``sql.max_rows`` rows and
+is interrupted after ``sql.timeout_seconds``.
+"""
+
+from __future__ import annotations
+
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from typing import Iterator
+
+from app.config import get_config
+from app.services import dataset, metrics, parquet_store
+from app.lazy import lazy_import
+
+pa = lazy_import("pyarrow")
+
+logger = logging.getLogger(__name__)
+
+_BATCH_ROWS = 10_000
+
+_slots_lock = threading.Lock()
+_slots: threading.Semaphore | None = None
+
+
+class QueryRejected(ValueError):
+    """Not a single SELECT, or DuckDB could not parse or bind it."""
+
+
+class QueryBusy(RuntimeError):
+    """All query slots are taken."""
+
+
+class QueryTimeout(RuntimeError):
+    """The query ran past ``sql.timeout_seconds`` before returning rows."""
+
+
+def _cfg() -> dict:
+    return get_config().get("sql", {})
+
+
+def _token() -> str | None:
+    return os.environ.get("SQL_TOKEN") or _cfg().get("token") or None
+
+
+def enabled() -> bool:
+    return bool(_cfg().get("enabled", False) and _token())
+
+
+def authorized(token: str | None) -> bool:
+    expected = _token()
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(token.encode(), str(expected).encode())
+
+
+def _acquire_slot() -> threading.Semaphore:
+    global _slots
+    with _slots_lock:
+        if _slots is None:
+            _slots = threading.Semaphore(_cfg().get("max_concurrent", 2))
+    if not _slots.acquire(blocking=False):
+        raise QueryBusy("too many SQL queries running")
+    return _slots
+
+
+def _literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _indicator_table() -> pa.Table | None:
+    """All persisted indicator frames as one table, sharing the mapped buffers."""
+    tables = []
+    for meta_file in sorted(parquet_store.DATA_DIR.glob("*/metadata.json")):
+        name = meta_file.parent.name
+        ticker = (parquet_store._read_manifest(name) or {}).get("ticker", name)
+        for timeframe in ("daily", "hourly"):
+            frame = parquet_store.load_indicators(timeframe, ticker=name)
+            if frame is None or frame.empty:
+                continue
+            table = frame.table
+            index_col = table.schema.pandas_metadata["index_columns"][0]
+            table = table.rename_columns(
+                [dataset.TIME_COLUMN if c == index_col else c for c in table.column_names]
+            ).replace_schema_metadata(None)
+            n = table.num_rows
+            table = table.add_column(0, "timeframe", pa.array([timeframe] * n))
+            table = table.add_column(0, "ticker", pa.array([ticker] * n))
+            tables.append(table)
+    if not tables:
+        return None
+    # Compact-mode frames may be float32; only mismatched columns are cast
+    return pa.concat_tables(tables, promote_options="permissive")
+
+
+def _connect():
+    import duckdb
+
+    cfg = _cfg()
+    con = duckdb.connect(":memory:", config={
+        "threads": cfg.get("threads", 2),
+        "memory_limit": cfg.get("memory_limit", "512MB"),
+        "autoinstall_known_extensions": False,
+        "autoload_known_extensions": False,
+    })
+    parts = dataset.root() / "*" / "*" / "part.parquet"
+    if any(dataset.root().glob("timeframe=*/ticker=*/part.parquet")):
+        con.execute(
+            f"CREATE VIEW bars AS SELECT * FROM read_parquet({_literal(str(parts))}, "
+            "hive_partitioning = true)"
+        )
+    indicators = _indicator_table()
+    if indicators is not None:
+        con.register("_indicators", indicators)
+        con.execute("CREATE VIEW indicators AS SELECT * FROM _indicators")
+
+    # Indicator frames are registered from memory above; only the dataset
+    # is read by DuckDB itself
+    allowed = str(dataset.root().resolve()).rstrip("/") + "/"
+    con.execute(f"SET allowed_directories = [{_literal(allowed)}]")
+    con.execute("SET enable_external_access = false")
+    con.execute("SET lock_configuration = true")
+    return con
+
+
+def _check_read_only(con, query: str) -> None:
+    import duckdb
+
+    statements = con.extract_statements(query)
+    if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+        raise QueryRejected("Only a single SELECT statement is allowed")
+
+
+def stream(query: str, max_rows: int | None = None) -> Iterator[str]:
+    """Start *query* and return an iterator over its NDJSON result lines.
+
+    Errors that are known before the first row (rejected, busy, timed out)
+    are raised here. The last line is always a ``{"_summary": ...}`` object:
+    row count, whether the row limit cut the result, elapsed time, and any
+    error hit while streaming.
+    """
+    import duckdb
+
+    cfg = _cfg()
+    limit = min(max_rows or cfg.get("max_rows", 100_000), cfg.get("max_rows", 100_000))
+    timeout = cfg.get("timeout_seconds", 10)
+    slots = _acquire_slot()
+    start = time.perf_counter()
+    con = timer = None
+    try:
+        con = _connect()
+        _check_read_only(con, query)
+        timer = threading.Timer(timeout, con.interrupt)
+        timer.daemon = True
+        timer.start()
+        reader = con.execute(query).to_arrow_reader(_BATCH_ROWS)
+    except Exception as e:
+        if timer is not None:
+            timer.cancel()
+        if con is not None:
+            con.close()
+        slots.release()
+        outcome = "timeout" if isinstance(e, duckdb.InterruptException) else "rejected"
+        metrics.SQL_QUERY_SECONDS.observe(time.perf_counter() - start, outcome=outcome)
+        if isinstance(e, duckdb.InterruptException):
+            raise QueryTimeout(f"query exceeded {timeout}s") from e
+        if isinstance(e, duckdb.Error):
+            raise QueryRejected(str(e)) from e
+        raise
+    return _lines(con, reader, timer, slots, limit, start)
+
+
+def _lines(con, reader, timer, slots, limit: int, start: float) -> Iterator[str]:
+    import duckdb
+
+    rows, truncated, error = 0, False, None
+    try:
+        for batch in reader:
+            if rows + batch.num_rows > limit:
+                batch = batch.slice(0, limit - rows)
+                truncated = True
+            if batch.num_rows:
+                # pandas' JSON writer is vectorized and maps NaN to null
+                yield batch.to_pandas().to_json(orient="records", lines=True, date_format="iso")
+            rows += batch.num_rows
+            if truncated:
+                break
+    except duckdb.InterruptException:
+        error = "query timed out"
+    except duckdb.Error as e:
+        error = str(e)
+    finally:
+        timer.cancel()
+        con.close()
+        slots.release()
+    elapsed = time.perf_counter() - start
+    outcome = "ok" if error is None else ("timeout" if error == "query timed out" else "error")
+    metrics.SQL_QUERY_SECONDS.observe(elapsed, outcome=outcome)
+    logger.info(f"SQL query returned {rows} rows in {elapsed * 1000:.0f} ms ({outcome})")
+    summary = {"rows": rows, "truncated": truncated, "elapsed_ms": round(elapsed * 1000, 1)}
+    if error is not None:
+        summary["error"] = error
+    yield json.dumps({"_summary": summary}) + "\n"
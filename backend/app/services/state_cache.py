@@ -0,0 +1,206 @@
+"""Bounded LRU cache for per-ticker pipeline states.
+
+Entries are accounted by the deep memory usage of their frames, report and
+results. When the cache exceeds its entry count or byte budget, the least
+recently used unpinned states are dropped; their data stays in the parquet
+store and is reloaded on the next request.
+"""
+
+from __future__ import annotations
+
+import logging
+import itertools
+import resource
+import sys
+import threading
+from dataclasses import dataclass, fields, is_dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from app.services.arrow_frames import ArrowFrame
+from app.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    entries: int
+    pinned: int
+    resident_bytes: int
+    max_entries: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+@dataclass
+class StateMemory:
+    """Memory held by one state. Mapped bytes live in the shared page cache
+    and are reported separately from the private (resident) total."""
+
+    hourly_bytes: int
+    daily_bytes: int
+    report_bytes: int
+    results_bytes: int
+    mapped_bytes: int
+
+    @property
+    def total_bytes(self) -> int:
+        return self.hourly_bytes + self.daily_bytes + self.report_bytes + self.results_bytes
+
+
+def frame_nbytes(df: pd.DataFrame | ArrowFrame) -> int:
+    if isinstance(df, ArrowFrame):
+        # Mapped from disk: pages live in the shared page cache, not our heap
+        return 0
+    return int(df.memory_usage(deep=True).sum())
+
+
+def object_nbytes(obj: Any, _seen: set[int] | None = None) -> int:
+    """Deep size of plain Python results (dataclasses, containers, scalars)."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen or isinstance(obj, (Enum, type)) or obj is None:
+        return 0
+    _seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if is_dataclass(obj):
+        size += sum(object_nbytes(getattr(obj, f.name), _seen) for f in fields(obj))
+    elif isinstance(obj, dict):
+        size += sum(object_nbytes(k, _seen) + object_nbytes(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(object_nbytes(v, _seen) for v in obj)
+    return size
+
+
+def state_memory(state: Any) -> StateMemory:
+    mapped = sum(
+        df.mapped_nbytes for df in (state.hourly_df, state.daily_df) if isinstance(df, ArrowFrame)
+    )
+    return StateMemory(
+        hourly_bytes=frame_nbytes(state.hourly_df),
+        daily_bytes=frame_nbytes(state.daily_df),
+        report_bytes=sys.getsizeof(state.report),
+        results_bytes=sum(
+            object_nbytes(r)
+            for r in (
+                state.regime, state.heat_score, state.dca,
+                state.intraday_heat_score, state.intraday_regime, state.intraday_bar,
+            )
+        ),
+        mapped_bytes=mapped,
+    )
+
+
+def state_nbytes(state: Any) -> int:
+    return state_memory(state).total_bytes
+
+
+def process_memory() -> tuple[int | None, int]:
+    """Current and peak resident set size of this process, in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = peak if sys.platform == "darwin" else peak * 1024
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024, peak
+    except OSError:
+        pass
+    return None, peak
+
+
+class StateCache:
+    """Ticker → immutable state snapshot.
+
+    Readers never lock: a lookup is a single dict read, and publishing a new
+    snapshot is a single reference swap. Only writers (put/evict) serialize.
+    Recency is tracked with a monotonic access stamp instead of reordering,
+    so hit/miss counters are approximate under heavy contention.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[Any, StateMemory]] = {}
+        self._access: dict[str, int] = {}
+        self._clock = itertools.count()
+        self._pinned: set[str] = set()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def pin(self, tickers: list[str]) -> None:
+        """Never evict these tickers (the configured ETFs)."""
+        with self._lock:
+            self._pinned.update(tickers)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._entries
+
+    def get(self, ticker: str, default: Any = None) -> Any:
+        entry = self._entries.get(ticker)
+        if entry is None:
+            self._misses += 1
+            return default
+        self._hits += 1
+        self._access[ticker] = next(self._clock)
+        return entry[0]
+
+    def peek(self, ticker: str, default: Any = None) -> Any:
+        """Like get, for internal lookups: no hit/miss counted, recency kept."""
+        entry = self._entries.get(ticker)
+        return default if entry is None else entry[0]
+
+    def put(self, ticker: str, state: Any) -> StateMemory:
+        mem = state_memory(state)
+        with self._lock:
+            old = self._entries.get(ticker)
+            self._entries[ticker] = (state, mem)
+            self._access[ticker] = next(self._clock)
+            self._bytes += mem.total_bytes - (old[1].total_bytes if old is not None else 0)
+            self._evict(keep=ticker)
+        return mem
+
+    def memory(self) -> dict[str, StateMemory]:
+        """Per-ticker memory breakdown of the cached states."""
+        with self._lock:
+            return {t: mem for t, (_, mem) in self._entries.items()}
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                entries=len(self._entries),
+                pinned=sum(1 for t in self._entries if t in self._pinned),
+                resident_bytes=self._bytes,
+                max_entries=self.max_entries,
+                max_bytes=self.max_bytes,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+            )
+
+    def _evict(self, keep: str) -> None:
+        if len(self._entries) <= self.max_entries and self._bytes <= self.max_bytes:
+            return
+        # Least recently used first; the entry just inserted always survives
+        candidates = sorted(
+            (t for t in self._entries if t != keep and t not in self._pinned),
+            key=lambda t: self._access.get(t, -1),
+        )
+        for ticker in candidates:
+            if len(self._entries) <= self.max_entries and self._bytes <= self.max_bytes:
+                break
+            _, mem = self._entries.pop(ticker)
+            size = mem.total_bytes
+            self._access.pop(ticker, None)
+            self._bytes -= size
+            self._evictions += 1
+            logger.info(f"Evicted state for {ticker} ({size / 1e6:.1f} MB)")
@@ -0,0 +1,113 @@
+"""Fast rejection of malformed and known-bad ticker symbols.
+
+Symbols upstream confirmed as unknown are remembered in a TTL'd negative
+cache persisted under DATA_DIR, so repeated lookups for typos, delisted
+names or bot traffic are answered without touching yfinance.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+
+from app.config import DATA_DIR, get_config
+
+logger = logging.getLogger(__name__)
+
+# Yahoo symbols: letters, digits and . - = ^ (indices, FX, share classes)
+_SYMBOL_RE = re.compile(r"^[A-Za-z0-9^][A-Za-z0-9.\-=^]{0,19}$")
+
+
+class UnknownTickerError(LookupError):
+    def __init__(self, ticker: str, reason: str):
+        super().__init__(f"Unknown ticker {ticker!r}: {reason}")
+        self.ticker = ticker
+        self.reason = reason
+
+
+class NegativeCache:
+    def __init__(self, path, ttl_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] | None = None
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self.path, "r") as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable negative cache {self.path}: {e}")
+                self._entries = {}
+        return self._entries
+
+    def _persist(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._entries, f, indent=2)
+        tmp.replace(self.path)
+
+    def get(self, ticker: str) -> str | None:
+        """Reason the ticker is cached as bad, or None if it isn't (or expired)."""
+        entry = self._load().get(ticker)
+        if entry is None:
+            return None
+        if entry["expires"] <= time.time():
+            self.discard(ticker)
+            return None
+        return entry["reason"]
+
+    def add(self, ticker: str, reason: str) -> None:
+        with self._lock:
+            entries = self._load()
+            entries[ticker] = {"expires": time.time() + self.ttl_seconds, "reason": reason}
+            # Drop expired entries while we're rewriting the file anyway
+            now = time.time()
+            for k in [k for k, v in entries.items() if v["expires"] <= now]:
+                del entries[k]
+            self._persist()
+        logger.info(f"Negatively cached {ticker} for {self.ttl_seconds / 3600:.1f}h: {reason}")
+
+    def discard(self, ticker: str) -> None:
+        with self._lock:
+            if self._load().pop(ticker, None) is not None:
+                self._persist()
+
+
+_negative_cache = NegativeCache(
+    DATA_DIR / "negative_symbols.json",
+    ttl_seconds=get_config().get("symbols", {}).get("negative_cache_ttl_hours", 12) * 3600,
+)
+
+
+def configured_symbols() -> set[str]:
+    cfg = get_config()
+    return {e["symbol"] for e in cfg.get("etfs", [])} | {
+        cfg["tickers"]["primary"],
+        cfg["tickers"]["fallback"],
+    }
+
+
+def metric_label(ticker: str) -> str:
+    """*ticker* as a metric label value: configured symbols keep their name,
+    anything else is ``other``, so per-request tickers can't grow the label
+    sets of long-lived counters and histograms."""
+    return ticker if ticker in configured_symbols() else "other"
+
+
+def check_symbol(ticker: str) -> None:
+    """Raise UnknownTickerError for malformed or negatively cached symbols."""
+    if not _SYMBOL_RE.match(ticker):
+        raise UnknownTickerError(ticker, "malformed symbol")
+    reason = _negative_cache.get(ticker)
+    if reason is not None:
+        raise UnknownTickerError(ticker, reason)
+
+
+def mark_unknown(ticker: str, reason: str) -> None:
+    _negative_cache.add(ticker, reason)
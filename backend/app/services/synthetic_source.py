@@ -0,0 +1,75 @@
+"""Deterministic offline stand-in for yfinance.
+
+Selected with ``data.source: synthetic`` in config.yaml or the
+``DATA_SOURCE=synthetic`` environment variable. Every symbol gets its own
+seeded random walk over a fixed calendar, so repeated downloads return the
+same bars and a later download only adds the bars that have closed since.
+``SYNTHETIC_LATENCY_MS`` adds a per-download delay to mimic the upstream.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+import zlib
+from datetime import datetime, timezone
+
+from app.lazy import lazy_import
+
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+
+_EPOCH = "2015-01-02"
+# US regular session as hourly bars (UTC, ignoring DST), like yfinance's 1h
+_SESSION_HOURS = (14, 15, 16, 17, 18, 19, 20)
+
+
+def _period_start(period: str, now: datetime) -> datetime:
+    m = re.fullmatch(r"(\d+)(d|mo|y)", period)
+    if m is None:
+        raise ValueError(f"Unsupported period {period!r}")
+    n, unit = int(m.group(1)), m.group(2)
+    days = {"d": 1, "mo": 31, "y": 366}[unit] * n
+    return now - pd.Timedelta(days=days)
+
+
+def _bar_index(interval: str, now: datetime) -> pd.DatetimeIndex:
+    days = pd.bdate_range(_EPOCH, now.date(), tz="UTC")
+    if interval == "1d":
+        return days[days <= now]
+    if interval == "1h":
+        hours = pd.to_timedelta(list(_SESSION_HOURS), unit="h")
+        index = (days.values[:, None] + hours.values[None, :]).ravel()
+        index = pd.DatetimeIndex(index, tz="UTC")
+        # Only bars that have closed
+        return index[index + pd.Timedelta(hours=1) <= now]
+    raise ValueError(f"Unsupported interval {interval!r}")
+
+
+def download(ticker: str, interval: str, period: str) -> pd.DataFrame:
+    latency_ms = float(os.environ.get("SYNTHETIC_LATENCY_MS", 0))
+    if latency_ms:
+        time.sleep(latency_ms / 1000)
+
+    now = datetime.now(timezone.utc)
+    index = _bar_index(interval, now)
+    n = len(index)
+    rng = np.random.RandomState(zlib.crc32(f"{ticker}/{interval}".encode()))
+
+    drift, vol = (0.0003, 0.012) if interval == "1d" else (0.00004, 0.004)
+    start_price = 50.0 + zlib.crc32(ticker.encode()) % 450
+    # One row of draws per bar, so earlier bars don't change as new ones close
+    z = rng.standard_normal((n, 5))
+    close = start_price * np.exp(np.cumsum(drift + vol * z[:, 0]))
+    high = close * (1 + np.abs(z[:, 1]) * vol / 2)
+    low = close * (1 - np.abs(z[:, 2]) * vol / 2)
+    open_ = close * (1 + z[:, 3] * vol / 4)
+    volume = np.round(100_000 + np.abs(z[:, 4]) * 2_000_000)
+
+    df = pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+        index=index,
+    )
+    df.index.name = "Datetime"
+    return df[df.index >= _period_start(period, now)]
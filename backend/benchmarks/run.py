@@ -0,0 +1,222 @@
+"""Pipeline benchmark suite.
+
+Times each pipeline stage on synthetic OHLCV data (the generator from
+tests/conftest.py) at increasing row counts, and the full pipeline across
+increasing ticker counts. Results are written as JSON and can be compared
+against a stored baseline:
+
+    cd backend
+    python -m benchmarks.run --out bench.json --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --out bench.json --baseline benchmarks/baseline.json
+
+The comparison exits non-zero when any stage's median is more than
+``--threshold`` times its baseline. Baselines are machine specific; record
+one on the machine that runs the comparison.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.i18n import translate_report
+from app.main import app
+from app.services import parquet_store
+from app.services.data_validator import validate
+from app.services.dca_engine import compute_dca
+from app.services.heat_score import compute_heat_score
+from app.services.indicator_engine import compute_indicators
+from app.services.orchestrator import PipelineState
+from app.services.regime_detector import detect_regime
+from app.services.report_generator import generate_report
+from tests.conftest import make_ohlcv
+
+DEFAULT_SIZES = [250, 10_000, 100_000, 1_000_000]
+DEFAULT_TICKERS = [1, 10, 100]
+
+
+def _time(fn: Callable[[], object], repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {"median_s": statistics.median(samples), "min_s": min(samples), "repeat": repeat}
+
+
+def _report(ind) -> str:
+    """Scores and report from an indicator frame, as the orchestrator does."""
+    latest = ind.iloc[-1].to_dict()
+    prev_row = ind.iloc[-2].to_dict()
+    regime = detect_regime(latest, prev_row)
+    heat = compute_heat_score(latest)
+    dca = compute_dca(heat.score, heat.label, regime.regime.value)
+    return generate_report(
+        heat=heat, regime=regime, dca=dca, active_ticker="BENCH",
+        used_fallback=False, fallback_reason=None, latest=latest,
+    )
+
+
+def bench_stages(rows: int, repeat: int, max_serialize_rows: int) -> dict:
+    """Time every stage once per repeat on a single *rows*-bar frame."""
+    raw = make_ohlcv(rows, seed=rows % 2**31, freq="h")
+    results: dict[str, dict] = {}
+
+    results["validate"] = _time(lambda: validate(raw, label="bench"), repeat)
+    clean = validate(raw, label="bench")
+
+    counter = iter(range(10**9))
+    results["parquet_save"] = _time(
+        lambda: parquet_store.save(clean, "hourly", ticker=f"SAVE{next(counter)}"), repeat
+    )
+    parquet_store.save(clean, "hourly", ticker="LOAD")
+    results["parquet_load"] = _time(lambda: parquet_store.load("hourly", ticker="LOAD"), repeat)
+
+    results["compute_indicators"] = _time(lambda: compute_indicators(clean), repeat)
+    ind = compute_indicators(clean)
+    latest = ind.iloc[-1].to_dict()
+    prev_row = ind.iloc[-2].to_dict()
+
+    results["compute_heat_score"] = _time(lambda: compute_heat_score(latest), repeat)
+    results["detect_regime"] = _time(lambda: detect_regime(latest, prev_row), repeat)
+    heat = compute_heat_score(latest)
+    regime = detect_regime(latest, prev_row)
+    dca = compute_dca(heat.score, heat.label, regime.regime.value)
+    results["generate_report"] = _time(
+        lambda: generate_report(
+            heat=heat, regime=regime, dca=dca, active_ticker="BENCH",
+            used_fallback=False, fallback_reason=None, latest=latest,
+        ),
+        repeat,
+    )
+    report = _report(ind)
+    results["translate_report"] = _time(lambda: translate_report(report, "tr"), repeat)
+
+    if rows <= max_serialize_rows:
+        state = PipelineState(active_ticker="BENCH", daily_df=ind, hourly_df=ind, ready=True)
+        with patch("app.services.orchestrator.initialize"), \
+                patch("app.routers.indicators.get_state", return_value=state):
+            with TestClient(app) as client:
+                def _get():
+                    resp = client.get("/api/indicators?timeframe=daily")
+                    assert resp.status_code == 200, resp.text
+                results["api_indicators"] = _time(_get, repeat)
+    return results
+
+
+def bench_tickers(count: int, rows: int, repeat: int) -> dict:
+    """Full pipeline (validate → save → indicators → scores → report) over *count* tickers."""
+    frames = [make_ohlcv(rows, seed=i, freq="h") for i in range(count)]
+    counter = iter(range(10**9))
+
+    def _run():
+        run = next(counter)
+        for i, raw in enumerate(frames):
+            clean = validate(raw, label="bench")
+            parquet_store.save(clean, "hourly", ticker=f"T{i}R{run}")
+            _report(compute_indicators(clean))
+
+    result = _time(_run, repeat)
+    result["per_ticker_s"] = result["median_s"] / count
+    return result
+
+
+def run(
+    sizes: list[int],
+    tickers: list[int],
+    ticker_rows: int,
+    repeat: int,
+    max_serialize_rows: int,
+) -> dict:
+    results = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": repeat,
+        },
+        "stages": {},
+        "tickers": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp, \
+            patch.object(parquet_store, "DATA_DIR", Path(tmp)):
+        for rows in sizes:
+            print(f"stages @ {rows} rows", file=sys.stderr)
+            results["stages"][str(rows)] = bench_stages(rows, repeat, max_serialize_rows)
+        for count in tickers:
+            print(f"pipeline @ {count} tickers x {ticker_rows} rows", file=sys.stderr)
+            results["tickers"][str(count)] = bench_tickers(count, ticker_rows, repeat)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Describe every measurement whose median exceeds *threshold* × baseline."""
+    regressions = []
+    for group in ("stages", "tickers"):
+        for size, current in results.get(group, {}).items():
+            base = baseline.get(group, {}).get(size)
+            if base is None:
+                continue
+            entries = current.items() if group == "stages" else [("pipeline", current)]
+            for name, stat in entries:
+                ref = base.get(name) if group == "stages" else base
+                if not ref or ref["median_s"] <= 0:
+                    continue
+                ratio = stat["median_s"] / ref["median_s"]
+                if ratio > threshold:
+                    regressions.append(
+                        f"{group}/{size}/{name}: {stat['median_s']:.4f}s vs "
+                        f"{ref['median_s']:.4f}s baseline ({ratio:.2f}x)"
+                    )
+    return regressions
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=_int_list, default=DEFAULT_SIZES)
+    parser.add_argument("--tickers", type=_int_list, default=DEFAULT_TICKERS)
+    parser.add_argument("--ticker-rows", type=int, default=2_000,
+                        help="rows per ticker in the multi-ticker runs")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-serialize-rows", type=int, default=100_000,
+                        help="skip the /api/indicators timing above this size")
+    parser.add_argument("--out", type=Path, default=Path("bench.json"))
+    parser.add_argument("--baseline", type=Path, help="compare against this results file")
+    parser.add_argument("--save-baseline", type=Path, help="also write results here")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.tickers, args.ticker_rows, args.repeat, args.max_serialize_rows)
+    args.out.write_text(json.dumps(results, indent=2))
+    print(f"Wrote {args.out}", file=sys.stderr)
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(results, indent=2))
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    # Per-save INFO logs would dominate the output
+    logging.disable(logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""Offline HTTP load test.
+
+Starts the API under uvicorn against the synthetic data source (no network)
+in a scratch DATA_DIR, then drives dashboard-like traffic at a configurable
+concurrency and reports throughput, latency percentiles and the server's
+peak RSS per scenario:
+
+    cd backend
+    python -m loadtest.run --concurrency 50 --duration 20
+    python -m loadtest.run --scenarios refresh_storm --latency-ms 800 --out load.json
+
+Scenarios:
+  dashboard      every client polls the six dashboard endpoints in turn
+  refresh_storm  dashboard polling while a share of clients keep POSTing /refresh
+  many_tickers   clients spread the dashboard mix over --tickers distinct symbols
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+DASHBOARD = [
+    ("GET", "/api/health"),
+    ("GET", "/api/heat-score"),
+    ("GET", "/api/indicators?timeframe=daily"),
+    ("GET", "/api/regime"),
+    ("GET", "/api/action-plan"),
+    ("GET", "/api/report"),
+]
+
+
+@dataclass
+class ScenarioResult:
+    scenario: str
+    concurrency: int
+    duration_s: float
+    requests: int
+    errors: int
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    peak_rss_mb: float | None
+    status_counts: dict[str, int] = field(default_factory=dict)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of *samples* (0 for no samples)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(
+    scenario: str,
+    concurrency: int,
+    elapsed: float,
+    latencies: list[float],
+    statuses: list[int | str],
+    peak_rss_mb: float | None,
+) -> ScenarioResult:
+    counts: dict[str, int] = {}
+    for s in statuses:
+        counts[str(s)] = counts.get(str(s), 0) + 1
+    errors = sum(n for s, n in counts.items() if not s.startswith(("2", "3")))
+    return ScenarioResult(
+        scenario=scenario,
+        concurrency=concurrency,
+        duration_s=round(elapsed, 3),
+        requests=len(statuses),
+        errors=errors,
+        throughput_rps=round(len(statuses) / elapsed, 2) if elapsed else 0.0,
+        p50_ms=round(percentile(latencies, 50) * 1000, 2),
+        p95_ms=round(percentile(latencies, 95) * 1000, 2),
+        p99_ms=round(percentile(latencies, 99) * 1000, 2),
+        peak_rss_mb=peak_rss_mb,
+        status_counts=counts,
+    )
+
+
+# ── Server process ────────────────────────────────────────────
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _rss_mb(pid: int) -> float | None:
+    """Resident set size of *pid* and its children (Linux /proc only)."""
+    pids = [pid]
+    try:
+        children = Path(f"/proc/{pid}/task/{pid}/children").read_text().split()
+        pids += [int(c) for c in children]
+    except OSError:
+        pass
+    total = 0
+    for p in pids:
+        try:
+            for line in Path(f"/proc/{p}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total += int(line.split()[1])
+        except OSError:
+            return None
+    return total / 1024
+
+
+class Server:
+    def __init__(self, workers: int, latency_ms: float, data_dir: Path):
+        self.port = _free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        env = dict(
+            os.environ,
+            DATA_SOURCE="synthetic",
+            DATA_DIR=str(data_dir),
+            SYNTHETIC_LATENCY_MS=str(latency_ms),
+        )
+        # App logs go to a file so they don't drown the report
+        self.log = open(data_dir / "server.log", "w")
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app",
+             "--host", "127.0.0.1", "--port", str(self.port),
+             "--workers", str(workers), "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+            env=env,
+            stdout=self.log,
+            stderr=subprocess.STDOUT,
+        )
+
+    async def wait_ready(self, timeout: float = 120.0) -> None:
+        deadline = time.monotonic() + timeout
+        async with httpx.AsyncClient(base_url=self.base_url) as client:
+            while time.monotonic() < deadline:
+                if self.proc.poll() is not None:
+                    raise RuntimeError("server exited during startup")
+                try:
+                    resp = await client.get("/api/health")
+                    if resp.status_code == 200 and resp.json()["ready"]:
+                        return
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.25)
+        raise TimeoutError("server did not become ready")
+
+    def stop(self) -> None:
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+        self.log.close()
+
+
+# ── Traffic ───────────────────────────────────────────────────
+
+def _with_ticker(path: str, ticker: str | None) -> str:
+    if ticker is None:
+        return path
+    return f"{path}{'&' if '?' in path else '?'}ticker={ticker}"
+
+
+async def _client_loop(
+    client: httpx.AsyncClient,
+    deadline: float,
+    requests: list[tuple[str, str]],
+    latencies: list[float],
+    statuses: list[int | str],
+) -> None:
+    i = random.randrange(len(requests))
+    while time.monotonic() < deadline:
+        method, path = requests[i % len(requests)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            resp = await client.request(method, path)
+            statuses.append(resp.status_code)
+        except httpx.HTTPError as e:
+            statuses.append(type(e).__name__)
+        latencies.append(time.perf_counter() - start)
+
+
+def _scenario_requests(name: str, clients: int, tickers: int) -> list[list[tuple[str, str]]]:
+    """Request cycle for each virtual client."""
+    if name == "dashboard":
+        return [DASHBOARD] * clients
+    if name == "refresh_storm":
+        # One client in five hammers /refresh on the default ticker
+        storm = [("POST", "/api/refresh")]
+        return [storm if i % 5 == 0 else DASHBOARD for i in range(clients)]
+    if name == "many_tickers":
+        symbols = [f"LT{n:04d}" for n in range(tickers)]
+        return [
+            [(m, _with_ticker(p, symbols[(i + j) % tickers])) for j, (m, p) in enumerate(DASHBOARD)]
+            for i in range(clients)
+        ]
+    raise ValueError(f"Unknown scenario {name!r}")
+
+
+async def run_scenario(
+    server: Server, name: str, concurrency: int, duration: float, tickers: int
+) -> ScenarioResult:
+    latencies: list[float] = []
+    statuses: list[int | str] = []
+    peak = [None]
+
+    async def sample_rss():
+        while True:
+            rss = _rss_mb(server.proc.pid)
+            if rss is not None:
+                peak[0] = max(peak[0] or 0.0, rss)
+            await asyncio.sleep(0.1)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=server.base_url, limits=limits, timeout=120) as client:
+        sampler = asyncio.create_task(sample_rss())
+        start = time.monotonic()
+        deadline = start + duration
+        await asyncio.gather(*[
+            _client_loop(client, deadline, reqs, latencies, statuses)
+            for reqs in _scenario_requests(name, concurrency, tickers)
+        ])
+        elapsed = time.monotonic() - start
+        sampler.cancel()
+
+    peak_mb = round(peak[0], 1) if peak[0] is not None else None
+    return summarize(name, concurrency, elapsed, latencies, statuses, peak_mb)
+
+
+async def main_async(args: argparse.Namespace) -> list[ScenarioResult]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        server = Server(args.workers, args.latency_ms, Path(tmp))
+        try:
+            await server.wait_ready()
+            for name in args.scenarios:
+                print(f"running {name} ({args.concurrency} clients, {args.duration}s)", file=sys.stderr)
+                results.append(
+                    await run_scenario(server, name, args.concurrency, args.duration, args.tickers)
+                )
+        finally:
+            server.stop()
+    return results
+
+
+def _print_table(results: list[ScenarioResult]) -> None:
+    header = f"{'scenario':<14} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'peak RSS MB':>12}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        rss = f"{r.peak_rss_mb:.1f}" if r.peak_rss_mb is not None else "n/a"
+        print(
+            f"{r.scenario:<14} {r.throughput_rps:>9.1f} {r.p50_ms:>9.1f} {r.p95_ms:>9.1f} "
+            f"{r.p99_ms:>9.1f} {r.errors:>7} {rss:>12}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", type=lambda v: v.split(","),
+                        default=["dashboard", "refresh_storm", "many_tickers"])
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per scenario")
+    parser.add_argument("--tickers", type=int, default=50, help="symbols for many_tickers")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="simulated upstream latency per download")
+    parser.add_argument("--out", type=Path, help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(main_async(args))
+    _print_table(results)
+    if args.out:
+        args.out.write_text(json.dumps([asdict(r) for r in results], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
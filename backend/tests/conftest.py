@@ -3,22 +3,38 @@ import pandas as pd
 import pytest
 
 
-@pytest.fixture
-def sample_ohlcv() -> pd.DataFrame:
-    """Generate synthetic OHLCV data (250 trading days)."""
-    np.random.seed(42)
-    n = 250
-    dates = pd.bdate_range("2024-01-02", periods=n, tz="UTC")
-
-    # Random walk for close prices starting at 500
-    returns = np.random.normal(0.0004, 0.012, n)
-    close = 500.0 * np.exp(np.cumsum(returns))
-
-    # Build OHLCV
-    high = close * (1 + np.abs(np.random.normal(0, 0.005, n)))
-    low = close * (1 - np.abs(np.random.normal(0, 0.005, n)))
-    open_ = close * (1 + np.random.normal(0, 0.003, n))
-    volume = np.random.randint(1_000_000, 10_000_000, n).astype(float)
+def make_ohlcv(
+    n: int = 250,
+    seed: int = 42,
+    start_price: float = 500.0,
+    drift: float = 0.0004,
+    vol: float = 0.012,
+    open_bias: float | None = None,
+    freq: str = "B",
+    start: str = "2024-01-02",
+) -> pd.DataFrame:
+    """Synthetic OHLCV random walk of *n* bars.
+
+    With *open_bias* the bars have fixed ±0.5% wicks and open at
+    ``close * open_bias``; otherwise wicks and opens are random. Use
+    ``freq="h"`` for large *n* (business days run past pandas' date range
+    beyond ~60k rows). Also used by the benchmark suite.
+    """
+    rng = np.random.RandomState(seed)
+    dates = pd.date_range(start, periods=n, tz="UTC", freq=freq)
+
+    returns = rng.normal(drift, vol, n)
+    close = start_price * np.exp(np.cumsum(returns))
+
+    if open_bias is None:
+        high = close * (1 + np.abs(rng.normal(0, 0.005, n)))
+        low = close * (1 - np.abs(rng.normal(0, 0.005, n)))
+        open_ = close * (1 + rng.normal(0, 0.003, n))
+    else:
+        high = close * 1.005
+        low = close * 0.995
+        open_ = close * open_bias
+    volume = rng.randint(1_000_000, 10_000_000, n).astype(float)
 
     df = pd.DataFrame(
         {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
@@ -29,48 +45,18 @@ def sample_ohlcv() -> pd.DataFrame:
 
 
 @pytest.fixture
-def bullish_ohlcv() -> pd.DataFrame:
-    """Generate strongly uptrending data."""
-    np.random.seed(10)
-    n = 250
-    dates = pd.bdate_range("2024-01-02", periods=n, tz="UTC")
-
-    # Consistent uptrend
-    returns = np.random.normal(0.003, 0.008, n)
-    close = 400.0 * np.exp(np.cumsum(returns))
+def sample_ohlcv() -> pd.DataFrame:
+    """Generate synthetic OHLCV data (250 trading days)."""
+    return make_ohlcv(250, seed=42)
 
-    high = close * 1.005
-    low = close * 0.995
-    open_ = close * 0.999
-    volume = np.random.randint(1_000_000, 10_000_000, n).astype(float)
 
-    df = pd.DataFrame(
-        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
-        index=dates,
-    )
-    df.index.name = "Datetime"
-    return df
+@pytest.fixture
+def bullish_ohlcv() -> pd.DataFrame:
+    """Generate strongly uptrending data."""
+    return make_ohlcv(250, seed=10, start_price=400.0, drift=0.003, vol=0.008, open_bias=0.999)
 
 
 @pytest.fixture
 def bearish_ohlcv() -> pd.DataFrame:
     """Generate strongly downtrending data."""
-    np.random.seed(20)
-    n = 250
-    dates = pd.bdate_range("2024-01-02", periods=n, tz="UTC")
-
-    # Consistent downtrend
-    returns = np.random.normal(-0.003, 0.008, n)
-    close = 600.0 * np.exp(np.cumsum(returns))
-
-    high = close * 1.005
-    low = close * 0.995
-    open_ = close * 1.001
-    volume = np.random.randint(1_000_000, 10_000_000, n).astype(float)
-
-    df = pd.DataFrame(
-        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
-        index=dates,
-    )
-    df.index.name = "Datetime"
-    return df
+    return make_ohlcv(250, seed=20, start_price=600.0, drift=-0.003, vol=0.008, open_bias=1.001)
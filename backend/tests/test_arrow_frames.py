@@ -0,0 +1,46 @@
+import numpy as np
+
+from app.services.arrow_frames import ArrowFrame, as_pandas, write_frame
+from app.services.indicator_engine import compute_indicators
+
+
+def test_roundtrip_keeps_nans_and_index(tmp_path, sample_ohlcv):
+    df = compute_indicators(sample_ohlcv)
+    write_frame(df, tmp_path / "daily.arrow")
+    out = ArrowFrame(tmp_path / "daily.arrow").to_pandas()
+    assert out.index.equals(df.index)
+    assert list(out.columns) == list(df.columns)
+    np.testing.assert_array_equal(out["SMA_200"].to_numpy(), df["SMA_200"].to_numpy())
+
+
+def test_views_are_zero_copy_and_read_only(tmp_path, sample_ohlcv):
+    write_frame(compute_indicators(sample_ohlcv), tmp_path / "daily.arrow")
+    close = ArrowFrame(tmp_path / "daily.arrow").to_pandas()["SMA_20"].to_numpy()
+    assert not close.flags.writeable
+    assert not close.flags.owndata
+
+
+def test_handle_is_lazy(tmp_path, sample_ohlcv):
+    write_frame(sample_ohlcv, tmp_path / "daily.arrow")
+    frame = ArrowFrame(tmp_path / "daily.arrow")
+    assert len(frame) == len(sample_ohlcv)
+    assert frame._view is None
+    df = frame.to_pandas()
+    assert frame.to_pandas() is df
+
+
+def test_tail(tmp_path, sample_ohlcv):
+    write_frame(sample_ohlcv, tmp_path / "daily.arrow")
+    tail = ArrowFrame(tmp_path / "daily.arrow").tail(2)
+    assert tail.index.equals(sample_ohlcv.index[-2:])
+
+
+def test_since_converts_only_the_slice(tmp_path, sample_ohlcv):
+    write_frame(sample_ohlcv, tmp_path / "daily.arrow")
+    start = sample_ohlcv.index[-10]
+    out = ArrowFrame(tmp_path / "daily.arrow").since(start)
+    assert out.index.equals(sample_ohlcv.index[-10:])
+
+
+def test_as_pandas_passes_frames_through(sample_ohlcv):
+    assert as_pandas(sample_ohlcv) is sample_ohlcv
@@ -0,0 +1,24 @@
+import json
+
+from benchmarks import run as bench
+
+
+def test_suite_runs_and_flags_regressions(tmp_path):
+    out = tmp_path / "bench.json"
+    assert bench.main([
+        "--sizes", "300", "--tickers", "2", "--ticker-rows", "300",
+        "--repeat", "1", "--out", str(out), "--save-baseline", str(tmp_path / "base.json"),
+    ]) == 0
+
+    results = json.loads(out.read_text())
+    stages = results["stages"]["300"]
+    for name in ("validate", "parquet_save", "parquet_load", "compute_indicators",
+                 "compute_heat_score", "detect_regime", "generate_report",
+                 "translate_report", "api_indicators"):
+        assert stages[name]["median_s"] >= 0
+    assert results["tickers"]["2"]["per_ticker_s"] > 0
+
+    assert bench.compare(results, results, threshold=1.25) == []
+    slower = json.loads(out.read_text())
+    slower["stages"]["300"]["validate"]["median_s"] = stages["validate"]["median_s"] * 10 + 1
+    assert bench.compare(slower, results, threshold=1.25)[0].startswith("stages/300/validate")
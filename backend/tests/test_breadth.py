@@ -0,0 +1,99 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import breadth, dataset, orchestrator, parquet_store
+from app.services.regime_detector import detect_regime
+from app.services.state_cache import StateCache
+from tests.conftest import make_ohlcv
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(parquet_store, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(orchestrator, "_derived_versions", {})
+    return tmp_path
+
+
+def _save(ticker, n=400, seed=0, start="2023-01-02"):
+    parquet_store.save(make_ohlcv(n, seed=seed, start=start), "daily", ticker=ticker)
+
+
+def _closes(tickers):
+    return breadth._read_closes(tickers, None)
+
+
+def test_matches_per_ticker_regimes():
+    idx = pd.bdate_range("2023-01-02", periods=300, tz="UTC")
+    closes = pd.DataFrame(
+        {f"T{i}": make_ohlcv(300, seed=i, drift=(i - 2) * 0.002)["Close"].to_numpy() for i in range(5)},
+        index=idx,
+    )
+    result = breadth.compute(closes, high_low_window=100)
+
+    regimes = []
+    for ticker in closes:
+        c = closes[ticker]
+        latest = {"Close": c.iloc[-1], "SMA_50": c.rolling(50).mean().iloc[-1], "SMA_200": c.rolling(200).mean().iloc[-1]}
+        regimes.append(detect_regime(latest).regime.value)
+    last = result.iloc[-1]
+    assert last["pct_trend_up"] == pytest.approx(100 * regimes.count("Trend Up") / 5)
+    assert last["pct_trend_down"] == pytest.approx(100 * regimes.count("Trend Down") / 5)
+    assert last["pct_trend_up"] + last["pct_trend_down"] + last["pct_range"] == pytest.approx(100)
+
+    change = closes.diff()
+    assert (result["advancers"].iloc[1:] == (change > 0).sum(axis=1).iloc[1:]).all()
+    assert result["ad_line"].iloc[-1] == ((change > 0).sum(axis=1) - (change < 0).sum(axis=1)).sum()
+    highs = (closes >= closes.rolling(100).max()).sum(axis=1)
+    assert (result["new_highs"] == highs).all()
+    # Not enough history for the 200-session average yet
+    assert np.isnan(result["pct_above_sma200"].iloc[100]) and result["members"].iloc[0] == 5
+
+
+def test_incremental_update_matches_full_recompute(store):
+    for seed, ticker in enumerate(["SPY", "QQQ", "SAP.DE"]):
+        _save(ticker, seed=seed)
+    assert breadth.update() is not None
+    assert breadth.TICKER not in dataset.tickers("daily")
+    version = breadth.update()
+    assert breadth.update() == version  # nothing changed
+
+    # A refresh rewrites the last bar and appends new sessions
+    last = parquet_store.load("daily", ticker="QQQ").index[-1]
+    _save("QQQ", n=6, seed=9, start=last.strftime("%Y-%m-%d"))
+    with patch.object(breadth, "compute", wraps=breadth.compute) as compute:
+        assert breadth.update() != version
+    stored = breadth.load()
+    full = breadth.compute(_closes(breadth.constituents()), 252)
+    # Only the recent window was read and recomputed
+    assert len(compute.call_args.args[0]) < len(full) - 50
+    pd.testing.assert_frame_equal(stored, full, check_freq=False, check_names=False)
+
+
+def test_new_constituent_recomputes_everything(store):
+    _save("SPY", seed=1)
+    _save("QQQ", seed=2)
+    breadth.update()
+    _save("IWM", seed=3, start="2023-03-01")
+    breadth.update()
+    assert breadth.load()["members"].max() == 3
+    full = breadth.compute(_closes(["IWM", "QQQ", "SPY"]), 252)
+    pd.testing.assert_frame_equal(breadth.load(), full, check_freq=False, check_names=False)
+
+
+def test_served_as_pseudo_ticker(store, monkeypatch):
+    monkeypatch.setattr(orchestrator, "_states", StateCache(max_entries=4, max_bytes=1 << 30))
+    _save("SPY", seed=1)
+    _save("QQQ", seed=2)
+    with patch("app.services.orchestrator.initialize"), TestClient(app) as client:
+        resp = client.get("/api/indicators?ticker=@BREADTH")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["ohlcv"] == [] and set(data["breadth"]) == set(breadth.SERIES)
+        assert len(data["breadth"]["ad_line"]) == 400
+        assert client.get("/api/heat-score?ticker=@BREADTH").status_code == 503
+        assert client.get("/api/indicators?ticker=@OTHER").status_code in (400, 404)
@@ -0,0 +1,78 @@
+"""Tolerances for compact storage mode.
+
+float32 keeps a relative error of at most 2**-24 per value; these tests pin
+that bound on real indicator output and check that it stays below what the
+dashboard displays (2 decimals on prices, scores and percentages).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import indicator_engine, parquet_store
+from app.services.heat_score import compute_heat_score
+from app.services.indicator_engine import compact, compute_indicators
+from app.services.regime_detector import detect_regime
+from tests.conftest import make_ohlcv
+
+
+@pytest.fixture
+def compact_mode(monkeypatch):
+    real = indicator_engine.get_config()
+    cfg = {**real, "storage": {**real.get("storage", {}), "compact": True}}
+    monkeypatch.setattr(indicator_engine, "get_config", lambda: cfg)
+
+
+@pytest.fixture
+def frames(monkeypatch):
+    raw = make_ohlcv(600)
+    full = compute_indicators(raw)
+    return raw, full, compact(full)
+
+
+def test_dtypes(frames):
+    _, _, small = frames
+    assert small["Close"].dtype == np.float64
+    assert small["Volume"].dtype == np.uint32
+    for col in small.columns.drop(["Close", "Volume"]):
+        assert small[col].dtype == np.float32, col
+
+
+def test_relative_error_within_float32_bound(frames):
+    _, full, small = frames
+    for col in full.columns:
+        a = full[col].to_numpy(dtype=np.float64)
+        b = small[col].to_numpy(dtype=np.float64)
+        assert np.array_equal(np.isnan(a), np.isnan(b)), col
+        ok = ~np.isnan(a)
+        err = np.abs(a[ok] - b[ok])
+        assert (err <= np.abs(a[ok]) * 2.0**-24 + 1e-30).all(), col
+
+
+def test_scores_match_at_display_precision(frames):
+    _, full, small = frames
+    latest_full = full.iloc[-1].to_dict()
+    latest_small = small.iloc[-1].to_dict()
+    assert abs(compute_heat_score(latest_full).score - compute_heat_score(latest_small).score) < 0.005
+    prev_full, prev_small = full.iloc[-2].to_dict(), small.iloc[-2].to_dict()
+    assert detect_regime(latest_full, prev_full).regime == detect_regime(latest_small, prev_small).regime
+
+
+def test_memory_roughly_halves(frames):
+    _, full, small = frames
+    ratio = small.memory_usage(index=False).sum() / full.memory_usage(index=False).sum()
+    assert ratio < 0.6
+
+
+def test_compact_mode_applies_to_indicators_and_store(compact_mode, tmp_path, monkeypatch):
+    monkeypatch.setattr(parquet_store, "DATA_DIR", tmp_path)
+    raw = make_ohlcv(300)
+    assert compute_indicators(raw)["RSI_14"].dtype == np.float32
+
+    parquet_store.save(raw.iloc[:200], "daily", ticker="SPY")
+    parquet_store.save(raw.iloc[150:], "daily", ticker="SPY")
+    stored = parquet_store.load("daily", ticker="SPY")
+    assert len(stored) == 300
+    assert stored["High"].dtype == np.float32
+    assert stored["Volume"].dtype == np.uint32
+    pd.testing.assert_series_equal(stored["Close"], raw["Close"], check_freq=False)
@@ -0,0 +1,145 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import correlation, parquet_store
+from tests.conftest import make_ohlcv
+
+
+def _closes(n=200, seed=0):
+    rng = np.random.RandomState(seed)
+    idx = pd.bdate_range("2024-01-02", periods=n, tz="UTC") + pd.Timedelta(hours=5)
+    market = rng.normal(0, 0.01, n)
+    returns = {
+        "SPY": market,
+        "QQQ": 1.5 * market + rng.normal(0, 0.005, n),
+        "GLD": rng.normal(0, 0.008, n),
+    }
+    return pd.DataFrame({t: 100 * np.exp(np.cumsum(r)) for t, r in returns.items()}, index=idx)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(parquet_store, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(correlation, "_cache", type(correlation._cache)())
+    return tmp_path
+
+
+def test_matches_pandas():
+    closes = _closes()
+    result = correlation.compute(closes, window=60, benchmark="SPY")
+    returns = np.log(closes).diff().iloc[1:].tail(60)
+    np.testing.assert_allclose(result.correlation, returns.corr().to_numpy(), atol=1e-12)
+    np.testing.assert_allclose(result.covariance, returns.cov().to_numpy(), atol=1e-15)
+    betas = [np.polyfit(returns["SPY"], returns[t], 1)[0] for t in result.tickers]
+    np.testing.assert_allclose(result.beta, betas, atol=1e-10)
+    assert result.beta[result.tickers.index("QQQ")] == pytest.approx(1.5, abs=0.2)
+
+    growth = closes.iloc[-1] / closes.iloc[-61]
+    assert result.relative_strength[1, 0] == pytest.approx(growth["QQQ"] / growth["SPY"])
+    assert result.observations == 60 and result.as_of == closes.index[-1].date().isoformat()
+
+
+def test_rolling_moments_match_pandas():
+    closes = _closes()
+    result = correlation.compute(closes, window=30, benchmark="SPY", history=50)
+    returns = np.log(closes).diff().iloc[1:]
+    beta = returns.rolling(30).cov(returns["SPY"]).div(returns["SPY"].rolling(30).var(), axis=0)
+    corr = returns.rolling(30).corr(returns["SPY"])
+    np.testing.assert_allclose(result.rolling_beta, beta.tail(50).to_numpy(), atol=1e-8)
+    np.testing.assert_allclose(result.rolling_correlation, corr.tail(50).to_numpy(), atol=1e-8)
+    assert len(result.history_dates) == 50
+
+
+def test_sessions_align_across_exchanges():
+    closes = _closes(50)
+    # Frankfurt daily bars are stamped 22:00 UTC the day before
+    shifted = closes[["GLD"]].set_axis(closes.index - pd.Timedelta(hours=7))
+    mixed = pd.concat([closes[["SPY"]], shifted], axis=1)
+    result = correlation.compute(mixed, window=20, benchmark="SPY")
+    assert result.observations == 20
+    expected = np.log(closes[["SPY", "GLD"]]).diff().tail(20).corr().to_numpy()
+    np.testing.assert_allclose(result.correlation, expected, atol=1e-12)
+
+
+def test_short_history_is_nan():
+    result = correlation.compute(_closes(2), window=60, benchmark="XXX")
+    assert result.observations == 1 and result.benchmark is None
+    assert np.isnan(result.correlation).all() and np.isnan(result.beta).all()
+
+
+def _gappy(n=200, seed=0):
+    closes = _closes(n, seed)
+    rng = np.random.RandomState(seed + 1)
+    # GLD misses scattered sessions; NEW only listed 30 sessions ago
+    closes.iloc[rng.choice(n, 15, replace=False), closes.columns.get_loc("GLD")] = np.nan
+    closes["NEW"] = np.nan
+    closes.iloc[-30:, closes.columns.get_loc("NEW")] = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 30)))
+    return closes
+
+
+def test_gappy_ticker_keeps_the_window_and_short_one_is_excluded():
+    closes = _gappy()
+    result = correlation.compute(closes, window=60, benchmark="SPY")
+    assert result.excluded == ["NEW"] and result.tickers == ["SPY", "QQQ", "GLD"]
+    assert result.observations == 60
+    returns = np.log(closes[result.tickers]).diff().iloc[1:].tail(60)
+    np.testing.assert_allclose(result.correlation, returns.corr().to_numpy(), atol=1e-12)
+    np.testing.assert_allclose(result.covariance, returns.cov().to_numpy(), atol=1e-15)
+    pair = returns[["GLD", "SPY"]].dropna()
+    gld = result.tickers.index("GLD")
+    assert result.beta[gld] == pytest.approx(np.polyfit(pair["SPY"], pair["GLD"], 1)[0])
+
+
+def test_rolling_matrices_match_pandas():
+    closes = _gappy()[["SPY", "QQQ", "GLD"]]
+    result = correlation.compute(closes, window=30, benchmark="SPY", matrix_history=40)
+    returns = np.log(closes).diff().iloc[1:]
+    assert len(result.matrix_dates) == 40 and result.matrix_dates[-1] == result.as_of
+    assert result.rolling_correlation_matrix.shape == (40, 3, 3)
+    for k in (0, 17, 39):
+        end = len(returns) - 39 + k
+        block = returns.iloc[end - 30:end]
+        np.testing.assert_allclose(result.rolling_covariance_matrix[k], block.cov().to_numpy(), atol=1e-14)
+        np.testing.assert_allclose(result.rolling_correlation_matrix[k], block.corr().to_numpy(), atol=1e-10)
+    np.testing.assert_allclose(result.rolling_correlation_matrix[-1], result.correlation, atol=1e-10)
+
+
+def test_cached_until_refresh(store):
+    start = (pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=300)).strftime("%Y-%m-%d")
+    for seed, ticker in enumerate(["SPY", "QQQ"]):
+        parquet_store.save(make_ohlcv(200, seed=seed, start=start), "daily", ticker=ticker)
+    first = correlation.matrix(window=60)
+    assert first.tickers == ["QQQ", "SPY"] and first.observations == 60
+    assert correlation.matrix(window=60) is first
+
+    parquet_store.save(make_ohlcv(5, seed=7, start=pd.Timestamp.now().strftime("%Y-%m-%d")), "daily", ticker="QQQ")
+    assert correlation.matrix(window=60) is not first
+
+
+def test_endpoint(store, monkeypatch):
+    start = (pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=300)).strftime("%Y-%m-%d")
+    for seed, ticker in enumerate(["SPY", "QQQ", "GLD"]):
+        parquet_store.save(make_ohlcv(200, seed=seed, start=start), "daily", ticker=ticker)
+    with patch("app.services.orchestrator.initialize"), TestClient(app) as client:
+        resp = client.get("/api/correlation?tickers=spy,qqq&window=20&history=5")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["tickers"] == ["QQQ", "SPY"] and data["benchmark"] == "SPY"
+        assert data["correlation"][1][1] == 1.0 and data["beta"][1] == 1.0
+        assert len(data["rolling_beta"]) == 5 and len(data["history_dates"]) == 5
+        assert data["excluded"] == [] and data["rolling_correlation_matrix"] == []
+
+        data = client.get("/api/correlation?tickers=spy,qqq,gld&window=20&matrix_history=3").json()
+        assert len(data["matrix_dates"]) == 3 and data["matrix_dates"][-1] == data["as_of"]
+        assert np.array(data["rolling_correlation_matrix"], dtype=float).shape == (3, 3, 3)
+
+        real = correlation.get_config()
+        cfg = {**real, "correlation": {**real["correlation"], "max_matrix_cells": 20}}
+        monkeypatch.setattr(correlation, "get_config", lambda: cfg)
+        assert client.get("/api/correlation?tickers=spy,qqq,gld&matrix_history=3").status_code == 400
+        assert client.get("/api/correlation?window=2").status_code == 422
@@ -0,0 +1,136 @@
+import dataclasses
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.services import data_plane, file_lock, parquet_store
+from app.services.indicator_engine import compute_indicators
+from app.services.orchestrator import PipelineState
+from app.services.regime_detector import detect_regime
+from app.services.heat_score import compute_heat_score
+from app.services.dca_engine import compute_dca
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(parquet_store, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(data_plane, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(data_plane, "_current_cache", {})
+    return tmp_path
+
+
+def _state(df) -> PipelineState:
+    ind = compute_indicators(df)
+    latest = ind.iloc[-1].to_dict()
+    regime = detect_regime(latest)
+    heat = compute_heat_score(latest)
+    return PipelineState(
+        active_ticker="SPY",
+        hourly_df=ind,
+        daily_df=ind,
+        regime=regime,
+        heat_score=heat,
+        dca=compute_dca(heat.score, heat.label, regime.regime.value),
+        report="# Report",
+        last_refresh="2024-01-01T00:00:00+00:00",
+        ready=True,
+        intraday_heat_score=compute_heat_score(latest, timeframe="hourly"),
+        intraday_regime=detect_regime(latest, timeframe="hourly"),
+        intraday_bar=[ind.index[-1].isoformat(), latest["Close"]],
+    )
+
+
+def _fields(state: PipelineState) -> dict:
+    return {f.name: getattr(state, f.name) for f in dataclasses.fields(state)}
+
+
+def test_publish_and_load_roundtrip(data_dir, sample_ohlcv):
+    state = _state(sample_ohlcv)
+    with data_plane.ticker_lock("SPY"):
+        version = data_plane.publish("SPY", _fields(state))
+    assert version == 1
+    assert data_plane.current_version("SPY") == 1
+
+    loaded = PipelineState(**data_plane.load("SPY", version))
+    assert loaded.version == 1
+    assert loaded.heat_score == state.heat_score
+    assert loaded.regime == state.regime
+    assert loaded.dca == state.dca
+    assert loaded.intraday_heat_score == state.intraday_heat_score
+    assert loaded.intraday_regime == state.intraday_regime
+    assert loaded.intraday_bar == state.intraday_bar
+    daily = loaded.frame("daily")
+    assert daily.index.equals(state.daily_df.index)
+    np.testing.assert_array_equal(
+        daily["SMA_200"].to_numpy(), state.daily_df["SMA_200"].to_numpy()
+    )
+
+
+def test_versions_increase_and_old_ones_are_pruned(data_dir, sample_ohlcv):
+    fields = _fields(_state(sample_ohlcv))
+    for _ in range(4):
+        version = data_plane.publish("SPY", fields)
+    assert version == 4
+    kept = sorted(p.name for p in (data_dir / "SPY" / "snapshots").iterdir() if p.is_dir())
+    assert kept == ["3", "4"]
+
+
+def test_published_within(data_dir, sample_ohlcv):
+    assert data_plane.published_within("SPY", 30) is None
+    data_plane.publish("SPY", _fields(_state(sample_ohlcv)))
+    assert data_plane.published_within("SPY", 30) == 1
+    assert data_plane.published_within("SPY", 0) is None
+
+
+def test_file_lock_is_reentrant(tmp_path):
+    path = tmp_path / ".lock"
+    with file_lock.locked(path):
+        with file_lock.locked(path):
+            pass
+
+
+def test_concurrent_first_load_and_refresh_do_not_deadlock(data_dir, monkeypatch):
+    from app.services import orchestrator
+    from app.services.data_fetcher import FetchResult
+    from app.services.singleflight import SingleFlight
+    from app.services.state_cache import StateCache
+    from tests.conftest import make_ohlcv
+
+    cfg = {**data_plane.get_config(), "data_plane": {"enabled": True}}
+    monkeypatch.setattr(data_plane, "get_config", lambda: cfg)
+    monkeypatch.setattr(orchestrator, "_states", StateCache(max_entries=4, max_bytes=1 << 30))
+    monkeypatch.setattr(orchestrator, "_refresh_flight", SingleFlight(30))
+    monkeypatch.setattr(orchestrator, "_init_flight", SingleFlight())
+
+    def slow_fetch(ticker):
+        time.sleep(0.2)
+        return FetchResult(
+            hourly=make_ohlcv(300, seed=3, freq="h"),
+            daily=make_ohlcv(300, seed=3),
+            active_ticker=ticker,
+            used_fallback=False,
+            fallback_reason=None,
+        )
+
+    def slow_is_stale(ticker):
+        # Widen the gap between the first load deciding to refresh and
+        # joining the refresh flight, so the explicit refresh leads it
+        time.sleep(0.5)
+        return True
+
+    monkeypatch.setattr(orchestrator, "fetch_ticker_data", slow_fetch)
+    monkeypatch.setattr(orchestrator, "_is_stale", slow_is_stale)
+    results = {}
+    loader = threading.Thread(target=lambda: results.update(get=orchestrator.get_state("MSFT")), daemon=True)
+    refresher = threading.Thread(
+        target=lambda: results.update(refresh=orchestrator.refresh_ticker("MSFT")), daemon=True
+    )
+    loader.start()
+    time.sleep(0.2)
+    refresher.start()
+    loader.join(timeout=10)
+    refresher.join(timeout=10)
+    assert not loader.is_alive() and not refresher.is_alive()
+    assert results["get"].ready and results["refresh"].ready
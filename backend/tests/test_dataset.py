@@ -0,0 +1,82 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import dataset, parquet_store
+from tests.conftest import make_ohlcv
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(parquet_store, "DATA_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def frames():
+    # Staggered starts so the tickers only partly overlap
+    return {
+        "SPY": make_ohlcv(500, seed=1, freq="h", start="2024-01-01"),
+        "BRK.B": make_ohlcv(500, seed=2, freq="h", start="2024-01-03"),
+        "X/Y": make_ohlcv(500, seed=3, freq="h", start="2024-01-05"),
+    }
+
+
+def _save_all(frames):
+    for ticker, df in frames.items():
+        parquet_store.save(df, "hourly", ticker=ticker)
+
+
+def test_save_keeps_partitions_in_sync(store, frames):
+    _save_all(frames)
+    parquet_store.save(make_ohlcv(24, seed=9, freq="h", start="2024-01-21 20:00"), "hourly", ticker="SPY")
+    spy = dataset.read_matrix("hourly", tickers=["SPY"])
+    assert len(spy) == len(parquet_store.load("hourly", ticker="SPY"))
+    parts = sorted(p.parent.name for p in (store / "_dataset" / "timeframe=hourly").glob("*/part.parquet"))
+    assert parts == ["ticker=BRK.B", "ticker=SPY", "ticker=X%2FY"]
+
+
+def test_read_matrix_aligns_tickers(store, frames):
+    _save_all(frames)
+    wide = dataset.read_matrix("hourly")
+    assert list(wide.columns) == ["BRK.B", "SPY", "X/Y"]
+    assert wide.index.is_monotonic_increasing and str(wide.index.tz) == "UTC"
+    for ticker, df in frames.items():
+        col = wide[ticker].dropna()
+        np.testing.assert_array_equal(col.index, df.index)
+        np.testing.assert_allclose(col.to_numpy(), df["Close"].to_numpy())
+    # Before BRK.B starts only SPY has bars
+    assert wide.loc[: "2024-01-02 23:00", "BRK.B"].isna().all()
+
+
+def test_read_matrix_filters(store, frames):
+    _save_all(frames)
+    start = pd.Timestamp("2024-01-06", tz="UTC")
+    end = pd.Timestamp("2024-01-07", tz="UTC")
+    wide = dataset.read_matrix("hourly", tickers=["X/Y", "SPY", "QQQ"], start=start, end=end, column="Volume")
+    assert list(wide.columns) == ["X/Y", "SPY"]
+    assert len(wide) == 24 and wide.index.min() == start
+    expected = frames["SPY"].loc[(frames["SPY"].index >= start) & (frames["SPY"].index < end), "Volume"]
+    np.testing.assert_array_equal(wide["SPY"].to_numpy(), expected.to_numpy())
+    assert dataset.read_matrix("daily").empty
+    with pytest.raises(ValueError):
+        dataset.read_matrix("hourly", column="RSI_14")
+
+
+def test_rebuild_backfills_existing_store(store, frames):
+    _save_all(frames)
+    before = dataset.read_matrix("hourly")
+    shutil.rmtree(store / "_dataset")
+    dataset.ensure()
+    pd.testing.assert_frame_equal(dataset.read_matrix("hourly"), before)
+
+
+def test_compact_frames_use_shared_schema(store):
+    df = make_ohlcv(100, freq="h")
+    small = df.astype({"Open": "float32", "Volume": "uint32"})
+    with parquet_store.ticker_lock("SPY"):
+        dataset.sync("SPY", "hourly", small)
+    wide = dataset.read_matrix("hourly", column="Open")
+    assert wide["SPY"].dtype == np.float64
@@ -1,3 +1,5 @@
+import pytest
+
 from app.services.heat_score import compute_heat_score
 
 
@@ -95,3 +97,33 @@ def test_neutral_conditions():
     }
     result = compute_heat_score(latest)
     assert 30 <= result.score <= 70
+
+
+def test_intraday_ranges_scale_with_bar_length():
+    from app.services.heat_score import bar_scale
+
+    daily = {
+        "RSI_14": 62, "MACDh_12_26_9": 0.8, "BBP_20_2.0": 0.7, "dist_ma50": 0.04,
+        "drawdown": -0.03, "volatility": 0.18, "momentum_5d": 0.02, "dist_ma200": 0.08,
+    }
+    scale = bar_scale("hourly")
+    assert scale == pytest.approx((1 / 7) ** 0.5)
+    # The same relative moves on hourly bars are smaller by the scale factor
+    scaled = ("MACDh_12_26_9", "dist_ma50", "volatility", "momentum_5d", "dist_ma200")
+    hourly = {k: v * scale if k in scaled else v for k, v in daily.items()}
+    assert compute_heat_score(hourly, timeframe="hourly").score == pytest.approx(compute_heat_score(daily).score)
+    # Unscaled, the hourly row would read as much colder
+    assert compute_heat_score(hourly).score < compute_heat_score(daily).score - 3
+
+
+def test_intraday_normalization_override(monkeypatch):
+    from app.services import heat_score
+
+    real = heat_score.get_config()
+    intraday = {"bars_per_session": 4, "normalization": {"macd_clamp": [-1, 1]}}
+    cfg = {**real, "heat_score": {**real["heat_score"], "intraday": intraday}}
+    monkeypatch.setattr(heat_score, "get_config", lambda: cfg)
+    norm = heat_score.normalization("hourly")
+    assert norm["macd_clamp"] == [-1, 1]
+    assert norm["momentum_range"] == pytest.approx([-0.025, 0.025])
+    assert norm["drawdown_range"] == real["heat_score"]["normalization"]["drawdown_range"]
@@ -0,0 +1,98 @@
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.enums import MarketRegime, RiskFlag
+from app.services import latest_table
+from app.services.dca_engine import DCAResult
+from app.services.heat_score import HeatScoreResult
+from app.services.latest_table import Condition, LatestTable
+from app.services.orchestrator import PipelineState
+from app.services.regime_detector import RegimeResult
+
+
+def _state(ticker, score, rsi, regime=MarketRegime.RANGE, flags=(), close=100.0, version=1):
+    idx = pd.date_range("2024-01-01", periods=2, freq="D", tz="UTC")
+    daily = pd.DataFrame({"Close": [close / 1.01, close], "RSI_14": [50.0, rsi]}, index=idx)
+    return PipelineState(
+        active_ticker=ticker,
+        daily_df=daily,
+        regime=RegimeResult(regime=regime, risk_flags=list(flags), confidence=0.7),
+        heat_score=HeatScoreResult(score=score, label="Hot" if score > 60 else "Cold", components=[]),
+        dca=DCAResult("Reduce" if score > 60 else "Buy", 500, 1.0, 500, "EUR", []),
+        ready=True,
+        version=version,
+    )
+
+
+@pytest.fixture
+def table():
+    t = LatestTable()
+    t.upsert("SPY", _state("SPY", 72.0, 68.0, MarketRegime.TREND_UP, [RiskFlag.OVERBOUGHT]))
+    t.upsert("MSFT", _state("MSFT", 25.0, 27.0, MarketRegime.TREND_UP, [RiskFlag.OVERSOLD]))
+    t.upsert("SXRF.DE", _state("SXRF.DE", 30.0, 29.0, MarketRegime.TREND_DOWN, [RiskFlag.OVERSOLD]))
+    return t
+
+
+def test_filters(table):
+    total, rows = table.query([Condition.parse("rsi<30")], regime="Trend Up")
+    assert total == 1 and rows[0]["ticker"] == "MSFT"
+    assert rows[0]["risk_flags"] == ["Oversold"] and rows[0]["action"] == "Buy"
+    assert rows[0]["change_1d"] == pytest.approx(0.01)
+
+    assert table.query(flags=["Oversold"])[0] == 2
+    assert table.query(label="Lukewarm") == (0, [])
+    with pytest.raises(ValueError):
+        table.query(flags=["Sleepy"])
+    with pytest.raises(ValueError):
+        Condition.parse("heat>3")
+
+
+def test_sort_and_top_k(table):
+    _, rows = table.query(sort="score", descending=True)
+    assert [r["ticker"] for r in rows] == ["SPY", "SXRF.DE", "MSFT"]
+    _, rows = table.query(sort="score", limit=2)
+    assert [r["ticker"] for r in rows] == ["MSFT", "SXRF.DE"]
+    _, rows = table.query(sort="ticker")
+    assert [r["ticker"] for r in rows] == ["MSFT", "SPY", "SXRF.DE"]
+
+
+def test_refresh_overwrites_row_in_place(table):
+    table.upsert("MSFT", _state("MSFT", 55.0, 45.0, version=2))
+    assert len(table) == 3
+    _, rows = table.query(sort="score")
+    msft = next(r for r in rows if r["ticker"] == "MSFT")
+    assert msft["score"] == 55.0 and msft["regime"] == "Range" and msft["risk_flags"] == []
+    assert msft["version"] == 2
+    assert table.query(flags=["Oversold"])[0] == 1
+
+
+def test_many_tickers_top_k_matches_full_sort():
+    t = LatestTable()
+    rng = np.random.RandomState(0)
+    scores = rng.uniform(0, 100, 2000)
+    for i, s in enumerate(scores):
+        t.upsert(f"T{i}", _state(f"T{i}", float(s), float(rng.uniform(10, 90))))
+    start = time.perf_counter()
+    total, top = t.query([Condition.parse("rsi<=50")], sort="score", descending=True, limit=10)
+    elapsed = time.perf_counter() - start
+    _, everything = t.query([Condition.parse("rsi<=50")], sort="score", descending=True)
+    assert [r["ticker"] for r in top] == [r["ticker"] for r in everything[:10]]
+    assert total == len(everything)
+    assert elapsed < 0.05
+
+
+def test_endpoint(table):
+    with patch.object(latest_table, "TABLE", table), \
+            patch("app.services.orchestrator.initialize"), TestClient(app) as client:
+        resp = client.get("/api/latest?where=rsi<30&flag=Oversold&sort=score&order=desc")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["total"] == 2
+        assert [r["ticker"] for r in data["rows"]] == ["SXRF.DE", "MSFT"]
+        assert client.get("/api/latest?where=rsi~30").status_code == 400
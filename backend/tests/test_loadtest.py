@@ -0,0 +1,25 @@
+from loadtest.run import DASHBOARD, _scenario_requests, percentile, summarize
+
+
+def test_percentiles_use_nearest_rank():
+    samples = [i / 1000 for i in range(1, 101)]
+    assert percentile(samples, 50) == 0.050
+    assert percentile(samples, 99) == 0.099
+    assert percentile([], 95) == 0.0
+
+
+def test_summary_counts_errors_and_throughput():
+    result = summarize("dashboard", 2, 2.0, [0.01, 0.02, 0.03, 0.04], [200, 200, 503, "ReadTimeout"], 120.0)
+    assert result.requests == 4
+    assert result.errors == 2
+    assert result.throughput_rps == 2.0
+    assert result.status_counts == {"200": 2, "503": 1, "ReadTimeout": 1}
+
+
+def test_scenarios_build_request_mixes():
+    assert _scenario_requests("dashboard", 3, 0) == [DASHBOARD] * 3
+    storm = _scenario_requests("refresh_storm", 10, 0)
+    assert sum(r == [("POST", "/api/refresh")] for r in storm) == 2
+    many = _scenario_requests("many_tickers", 4, 3)
+    tickers = {path.split("ticker=")[1] for reqs in many for _, path in reqs}
+    assert tickers == {"LT0000", "LT0001", "LT0002"}
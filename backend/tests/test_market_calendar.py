@@ -0,0 +1,90 @@
+from datetime import date, datetime, timedelta, timezone
+
+from app.services.market_calendar import (
+    NYSE,
+    XETRA,
+    EURONEXT_AMS,
+    FRANKFURT,
+    exchange_for,
+    holidays,
+    is_trading_day,
+    next_expected_bar,
+)
+
+
+def _utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_exchange_for_suffixes():
+    assert exchange_for("SPY") is NYSE
+    assert exchange_for("SXRF.DE") is XETRA
+    assert exchange_for("VUAA.AS") is EURONEXT_AMS
+    assert exchange_for("BTC-USD") is None
+    assert exchange_for("^GSPC") is None
+    assert exchange_for("FOO.XX") is None
+    assert exchange_for("SXRF.F") is FRANKFURT
+
+
+def test_dashed_symbols():
+    for pair in ("BTC-USD", "ETH-EUR", "SOL-USDT", "ETH-BTC"):
+        assert exchange_for(pair) is None
+    # Share classes trade on US exchanges
+    assert exchange_for("BRK-B") is NYSE
+    assert exchange_for("BF-B") is NYSE
+
+
+def test_frankfurt_floor_session():
+    assert FRANKFURT.tz == XETRA.tz and FRANKFURT.close > XETRA.close
+    assert holidays("FRA", 2024) == holidays("XETRA", 2024)
+
+
+def test_nyse_holidays_2024():
+    h = holidays("NYSE", 2024)
+    assert date(2024, 1, 1) in h
+    assert date(2024, 3, 29) in h   # Good Friday
+    assert date(2024, 5, 27) in h   # Memorial Day
+    assert date(2024, 6, 19) in h   # Juneteenth
+    assert date(2024, 7, 4) in h
+    assert date(2024, 11, 28) in h  # Thanksgiving
+    assert date(2024, 12, 25) in h
+    assert date(2024, 4, 1) not in h  # Easter Monday trades in New York
+
+
+def test_observed_holidays():
+    # July 4th 2026 is a Saturday → observed Friday
+    assert date(2026, 7, 3) in holidays("NYSE", 2026)
+    # New Year's Day 2022 was a Saturday and is not observed
+    assert date(2021, 12, 31) not in holidays("NYSE", 2021)
+
+
+def test_european_holidays():
+    assert not is_trading_day(XETRA, date(2024, 4, 1))         # Easter Monday
+    assert not is_trading_day(XETRA, date(2024, 12, 24))
+    assert is_trading_day(EURONEXT_AMS, date(2024, 12, 24))
+    assert not is_trading_day(EURONEXT_AMS, date(2024, 5, 1))
+
+
+def test_next_bar_within_session():
+    # 14:30 New York bar fetched at 14:50 → next bar at 15:30
+    last_bar = _utc(2024, 3, 5, 19, 30)
+    due = next_expected_bar(NYSE, last_bar, _utc(2024, 3, 5, 19, 50))
+    assert due == last_bar + timedelta(hours=1)
+
+
+def test_last_bar_fetched_before_close_waits_for_close():
+    # 15:30 bar fetched at 15:45 is still forming until the 16:00 close
+    due = next_expected_bar(NYSE, _utc(2024, 3, 5, 20, 30), _utc(2024, 3, 5, 20, 45))
+    assert due == _utc(2024, 3, 5, 21, 0)
+
+
+def test_weekend_stays_fresh_until_monday_open():
+    # Friday's final bar fetched after the close
+    due = next_expected_bar(NYSE, _utc(2024, 3, 8, 20, 30), _utc(2024, 3, 8, 22, 0))
+    assert due == _utc(2024, 3, 11, 13, 30)  # Monday 09:30 EDT
+
+
+def test_holiday_is_skipped():
+    # Thursday before Good Friday 2024 → next session is Monday
+    due = next_expected_bar(XETRA, _utc(2024, 3, 28, 16, 0), _utc(2024, 3, 28, 17, 0))
+    assert due == _utc(2024, 4, 2, 7, 0)  # Tuesday after Easter Monday, 09:00 CEST
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.metrics import Counter, Histogram, render
+from tests.test_routers import _mock_state
+
+
+def test_histogram_buckets_are_cumulative():
+    h = Histogram("test_latency_seconds", "test", ("route",), buckets=(0.1, 1.0))
+    h.observe(0.05, route="/a")
+    h.observe(0.5, route="/a")
+    h.observe(5.0, route="/a")
+    lines = h.render()
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'test_latency_seconds_count{route="/a"} 3' in lines
+
+
+def test_counter_escapes_labels():
+    c = Counter("test_rows_total", "test", ("ticker",))
+    c.inc(3, ticker='we"ird')
+    c.inc(2, ticker='we"ird')
+    assert 'test_rows_total{ticker="we\\"ird"} 5.0' in c.render()
+
+
+def test_metrics_endpoint_reports_request_timings():
+    with patch("app.services.orchestrator.initialize"), \
+            patch("app.routers.regime.get_state", return_value=_mock_state()):
+        with TestClient(app) as client:
+            assert client.get("/api/regime").status_code == 200
+            resp = client.get("/api/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert "# TYPE pipeline_stage_seconds histogram" in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/regime",status="200"}' in body
+    assert 'http_response_serialization_seconds_count{route="/api/regime"}' in body
+    assert render().startswith("# HELP")
+
+
+def test_pipeline_ticker_labels_are_bounded(tmp_path, monkeypatch):
+    from app.services import parquet_store
+    from tests.conftest import make_ohlcv
+
+    monkeypatch.setattr(parquet_store, "DATA_DIR", tmp_path)
+    parquet_store.save(make_ohlcv(30, seed=1), "daily", ticker="ZZZQ")
+    parquet_store.save(make_ohlcv(30, seed=1), "daily", ticker="SPY")
+    text = render()
+    assert 'store_bytes_written_total{ticker="other",timeframe="daily"}' in text
+    assert 'store_bytes_written_total{ticker="SPY",timeframe="daily"}' in text
+    assert "ZZZQ" not in text
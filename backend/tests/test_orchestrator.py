@@ -0,0 +1,37 @@
+from unittest.mock import patch
+
+from app.services import orchestrator
+from app.services.arrow_frames import ArrowFrame, write_frame
+from app.services.indicator_engine import compute_indicators
+from app.services.orchestrator import PipelineState
+from app.services.state_cache import StateCache
+
+
+def test_intraday_reused_until_hourly_bar_changes(monkeypatch, sample_ohlcv):
+    cache = StateCache(max_entries=4, max_bytes=1 << 30)
+    monkeypatch.setattr(orchestrator, "_states", cache)
+    hourly = compute_indicators(sample_ohlcv)
+    first = orchestrator._intraday("SPY", hourly)
+    assert first["intraday_bar"][0] == hourly.index[-1].isoformat()
+    cache.put("SPY", PipelineState(active_ticker="SPY", ready=True, **first))
+
+    with patch.object(orchestrator, "compute_heat_score") as score:
+        again = orchestrator._intraday("SPY", hourly)
+    score.assert_not_called()
+    assert again["intraday_heat_score"] is first["intraday_heat_score"]
+    # Internal lookups leave the request-facing cache counters alone
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (0, 0)
+
+    # The forming bar moved
+    moved = hourly.copy()
+    moved.iloc[-1, moved.columns.get_loc("Close")] *= 1.01
+    assert orchestrator._intraday("SPY", moved)["intraday_bar"] != first["intraday_bar"]
+
+
+def test_intraday_on_a_mapped_frame(monkeypatch, sample_ohlcv, tmp_path):
+    monkeypatch.setattr(orchestrator, "_states", StateCache(max_entries=4, max_bytes=1 << 30))
+    hourly = compute_indicators(sample_ohlcv)
+    write_frame(hourly, tmp_path / "hourly.arrow")
+    mapped = orchestrator._intraday("SPY", ArrowFrame(tmp_path / "hourly.arrow"))
+    assert mapped["intraday_bar"] == orchestrator._intraday("SPY", hourly)["intraday_bar"]
@@ -0,0 +1,186 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from app.services import parquet_store
+from app.services.arrow_frames import write_frame
+from app.services.indicator_engine import compute_indicators
+from tests.conftest import make_ohlcv
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(parquet_store, "DATA_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def hourly():
+    # ~125 days of hourly bars spanning five calendar months
+    return make_ohlcv(3000, freq="h", start="2024-01-01")
+
+
+def test_row_groups_follow_periods(store, hourly):
+    parquet_store.save(hourly, "hourly", ticker="SPY")
+    meta = pq.ParquetFile(parquet_store._parquet_path("SPY", "hourly")).metadata
+    months = hourly.index.to_series().dt.strftime("%Y-%m").nunique()
+    assert meta.num_row_groups == months
+    col = meta.row_group(0).column(0)
+    assert col.compression == "ZSTD"
+    assert "BYTE_STREAM_SPLIT" in str(col.encodings)
+
+
+def test_load_projects_columns_and_time_range(store, hourly):
+    parquet_store.save(hourly, "hourly", ticker="SPY")
+    start = pd.Timestamp("2024-03-01", tz="UTC")
+    end = pd.Timestamp("2024-03-15", tz="UTC")
+    out = parquet_store.load("hourly", ticker="SPY", columns=["Close"], start=start, end=end)
+    expected = hourly.loc[(hourly.index >= start) & (hourly.index < end), ["Close"]]
+    assert list(out.columns) == ["Close"]
+    pd.testing.assert_frame_equal(out, expected, check_freq=False)
+
+
+def test_merge_roundtrip(store, hourly):
+    parquet_store.save(hourly.iloc[:2000], "hourly", ticker="SPY")
+    parquet_store.save(hourly.iloc[1500:], "hourly", ticker="SPY")
+    pd.testing.assert_frame_equal(parquet_store.load("hourly", ticker="SPY"), hourly, check_freq=False)
+
+
+def test_manifest_names_versioned_files_and_prunes(store, hourly):
+    for lo in (0, 1000, 2000):
+        parquet_store.save(hourly.iloc[lo:lo + 1000], "hourly", ticker="SPY")
+    manifest = parquet_store._read_manifest("SPY")
+    assert manifest["version"] == 3
+    assert manifest["files"]["hourly"] == "hourly/hourly.3.parquet"
+    files = sorted(p.name for p in (store / "SPY" / "hourly").glob("*.parquet"))
+    assert files == ["hourly.2.parquet", "hourly.3.parquet"]
+    assert parquet_store.load_metadata("SPY") is None  # no completed refresh yet
+
+    meta = parquet_store.save_metadata("SPY", False, None, ticker="SPY")
+    assert meta["version"] == 4 and meta["files"] == manifest["files"]
+    assert parquet_store.load_metadata("SPY") == meta
+
+
+def test_crashed_write_leaves_previous_state(store, hourly, monkeypatch):
+    parquet_store.save(hourly.iloc[:1000], "hourly", ticker="SPY")
+    before = parquet_store._read_manifest("SPY")
+
+    def torn(df, path, timeframe):
+        path.write_bytes(b"PAR1 half a file")
+        raise OSError("disk full")
+
+    with monkeypatch.context() as m, pytest.raises(OSError):
+        m.setattr(parquet_store, "_write_parquet", torn)
+        parquet_store.save(hourly.iloc[1000:], "hourly", ticker="SPY")
+
+    assert parquet_store._read_manifest("SPY") == before
+    pd.testing.assert_frame_equal(
+        parquet_store.load("hourly", ticker="SPY"), hourly.iloc[:1000], check_freq=False
+    )
+    # The next writer clears the leftover temp file
+    parquet_store.save(hourly.iloc[1000:], "hourly", ticker="SPY")
+    assert not list((store / "SPY" / "hourly").glob("*.tmp"))
+    assert len(parquet_store.load("hourly", ticker="SPY")) == len(hourly)
+
+
+def test_reader_keeps_resolved_file_across_a_write(store, hourly):
+    parquet_store.save(hourly.iloc[:1000], "hourly", ticker="SPY")
+    resolved = parquet_store._parquet_path("SPY", "hourly")
+    parquet_store.save(hourly.iloc[1000:], "hourly", ticker="SPY")
+    assert len(pq.read_table(resolved)) == 1000
+
+
+def test_concurrent_writers_serialize(store, hourly):
+    chunks = [hourly.iloc[i:i + 300] for i in range(0, 3000, 300)]
+    with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+        list(pool.map(lambda c: parquet_store.save(c, "hourly", ticker="SPY"), chunks))
+    pd.testing.assert_frame_equal(parquet_store.load("hourly", ticker="SPY"), hourly, check_freq=False)
+    assert parquet_store._read_manifest("SPY")["version"] == len(chunks)
+
+
+def test_legacy_layout_is_read_and_migrated(store, hourly):
+    (store / "SPY" / "hourly").mkdir(parents=True)
+    hourly.iloc[:1000].to_parquet(store / "SPY" / "hourly" / "hourly.parquet")
+    (store / "SPY" / "metadata.json").write_text('{"last_refresh": "2024-01-01T00:00:00+00:00"}')
+    assert len(parquet_store.load("hourly", ticker="SPY")) == 1000
+
+    parquet_store.save(hourly.iloc[1000:], "hourly", ticker="SPY")
+    assert parquet_store._parquet_path("SPY", "hourly").name == "hourly.1.parquet"
+    assert len(parquet_store.load("hourly", ticker="SPY")) == len(hourly)
+    assert parquet_store.load_metadata("SPY")["last_refresh"].startswith("2024-01-01")
+
+
+@pytest.fixture
+def recheck(monkeypatch):
+    real = parquet_store.get_config()
+    def set_(seconds):
+        cfg = {**real, "storage": {**real["storage"], "metadata_recheck_seconds": seconds}}
+        monkeypatch.setattr(parquet_store, "get_config", lambda: cfg)
+    return set_
+
+
+def _no_io(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("metadata read from disk")
+    monkeypatch.setattr(parquet_store, "open", fail, raising=False)
+
+
+def test_metadata_served_from_memory(store, recheck, monkeypatch):
+    recheck(60)
+    written = parquet_store.save_metadata("SPY", False, None, ticker="SPY")
+    _no_io(monkeypatch)
+    assert parquet_store.load_metadata("SPY") is written
+    assert parquet_store.needs_refresh(1.0, ticker="SPY") is False
+    assert parquet_store.needs_refresh(0.0, ticker="SPY") is True  # rule change recomputes
+
+
+def test_other_process_writes_are_noticed(store, recheck):
+    recheck(60)
+    parquet_store.save_metadata("SPY", False, None, ticker="SPY")
+    # Another worker replaces the file behind our back
+    other = store / "SPY" / "metadata.json.other"
+    other.write_text('{"last_refresh": "2020-01-01T00:00:00+00:00", "version": 9}')
+    os.replace(other, store / "SPY" / "metadata.json")
+
+    assert parquet_store.load_metadata("SPY")["version"] == 1  # within the recheck window
+    assert parquet_store.needs_refresh(1.0, ticker="SPY") is False
+    recheck(0)
+    assert parquet_store.load_metadata("SPY")["version"] == 9
+    assert parquet_store.needs_refresh(1.0, ticker="SPY") is True
+
+
+def test_preload(store, recheck, monkeypatch):
+    recheck(60)
+    for t in ("SPY", "BRK.B"):
+        parquet_store.save_metadata(t, False, None, ticker=t)
+    parquet_store._manifests.clear()
+    assert parquet_store.preload_metadata() == 2
+    _no_io(monkeypatch)
+    assert parquet_store.load_metadata("BRK.B")["active_ticker"] == "BRK.B"
+
+
+def test_indicator_frames_stamped_with_config(store, monkeypatch):
+    raw = make_ohlcv(300, seed=4)
+    parquet_store.save(raw, "daily", ticker="SPY")
+    parquet_store.save_indicators(compute_indicators(raw), "daily", ticker="SPY")
+    assert parquet_store.load_indicators("daily", ticker="SPY") is not None
+
+    real = parquet_store.get_config()
+    cfg = {**real, "indicators": {**real["indicators"], "rsi_period": 21}}
+    monkeypatch.setattr(parquet_store, "get_config", lambda: cfg)
+    assert parquet_store.load_indicators("daily", ticker="SPY") is None
+    monkeypatch.setattr(parquet_store, "get_config", lambda: real)
+
+    monkeypatch.setattr(parquet_store, "_INDICATOR_SCHEMA_VERSION", 2)
+    assert parquet_store.load_indicators("daily", ticker="SPY") is None
+
+
+def test_unstamped_indicator_frames_are_recomputed(store):
+    raw = make_ohlcv(300, seed=4)
+    parquet_store.save(raw, "daily", ticker="SPY")
+    path = parquet_store._indicators_path("SPY", "daily")
+    write_frame(compute_indicators(raw), path)
+    assert parquet_store.load_indicators("daily", ticker="SPY") is None
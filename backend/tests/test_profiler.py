@@ -0,0 +1,85 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import profiler
+from tests.test_routers import _mock_state
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def profiles(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILE_TOKEN", TOKEN)
+    monkeypatch.setattr(profiler, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(profiler, "_last_start", float("-inf"))
+    monkeypatch.setattr(profiler, "_cfg", lambda: {"min_interval_seconds": 60, "max_profiles": 2})
+    monkeypatch.setattr(profiler, "_armed", set())
+    return tmp_path / "profiles"
+
+
+@pytest.fixture
+def client():
+    with patch("app.services.orchestrator.initialize"), \
+            patch("app.routers.regime.get_state", return_value=_mock_state()):
+        with TestClient(app) as c:
+            yield c
+
+
+def test_capture_is_rate_limited(profiles):
+    with profiler.capture("first") as result:
+        sum(range(1000))
+    assert (profiles / result["name"]).exists()
+
+    with pytest.raises(profiler.ProfilerBusy):
+        with profiler.capture("second"):
+            pass
+
+
+def test_armed_target_is_captured_once(profiles):
+    profiler.arm("refresh:SPY")
+    with profiler.capture_if_armed("refresh:SPY"):
+        pass
+    with profiler.capture_if_armed("refresh:SPY"):
+        pass
+    assert len(profiler.list_profiles()) == 1
+
+
+def test_profiled_request_can_be_retrieved(profiles, client):
+    resp = client.get("/api/regime", headers={"X-Profile-Token": TOKEN})
+    assert resp.status_code == 200
+    name = resp.headers["X-Profile-Id"]
+
+    listing = client.get("/api/admin/profiles", headers={"X-Profile-Token": TOKEN})
+    assert [p["name"] for p in listing.json()["profiles"]] == [name]
+
+    summary = client.get(f"/api/admin/profiles/{name}", headers={"X-Profile-Token": TOKEN})
+    assert summary.status_code == 200
+    assert "cumulative" in summary.text
+
+    # The rate limit turns a second profiled request away
+    again = client.get("/api/regime", headers={"X-Profile-Token": TOKEN})
+    assert again.status_code == 429
+
+
+def test_token_in_query_string_is_ignored(profiles, client):
+    resp = client.get(f"/api/regime?profile_token={TOKEN}")
+    assert resp.status_code == 200
+    assert "X-Profile-Id" not in resp.headers and profiler.list_profiles() == []
+
+
+def test_profiling_requires_token(profiles, client):
+    assert client.get("/api/regime", headers={"X-Profile-Token": "wrong"}).status_code == 403
+    assert client.get("/api/admin/profiles").status_code == 403
+    assert client.get("/api/admin/profiles/../x.pstats", headers={"X-Profile-Token": TOKEN}).status_code == 404
+
+
+def test_profiling_disabled_without_token(client, monkeypatch):
+    monkeypatch.delenv("PROFILE_TOKEN", raising=False)
+    assert client.get("/api/admin/profiles").status_code == 404
+    # The header is ignored and the request served normally
+    resp = client.get("/api/regime", headers={"X-Profile-Token": "anything"})
+    assert resp.status_code == 200
+    assert "X-Profile-Id" not in resp.headers
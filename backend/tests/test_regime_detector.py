@@ -126,3 +126,10 @@ def test_death_cross():
     }
     result = detect_regime(latest, prev)
     assert RiskFlag.DEATH_CROSS in result.risk_flags
+
+
+def test_intraday_volatility_threshold_is_scaled():
+    latest = {"Close": 550, "SMA_50": 530, "SMA_200": 500, "RSI_14": 55, "volatility": 0.15, "drawdown": -0.02}
+    assert RiskFlag.HIGH_VOLATILITY not in detect_regime(latest).risk_flags
+    # 15% annualized from hourly returns is a lot more than 15% from daily ones
+    assert RiskFlag.HIGH_VOLATILITY in detect_regime(latest, timeframe="hourly").risk_flags
@@ -0,0 +1,89 @@
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import orchestrator, parquet_store, resample
+from app.services.state_cache import StateCache
+from tests.conftest import make_ohlcv
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(parquet_store, "DATA_DIR", tmp_path)
+    return tmp_path
+
+
+def _hourly(days, tz, open_="09:30", bars=7):
+    stamps = [
+        pd.Timestamp(f"{d.date()} {open_}", tz=tz) + pd.Timedelta(hours=h)
+        for d in days for h in range(bars)
+    ]
+    df = make_ohlcv(len(stamps), seed=3)
+    df.index = pd.DatetimeIndex(stamps).tz_convert("UTC").rename("Datetime")
+    return df
+
+
+def test_4h_buckets_start_at_the_session_open():
+    # Spans the US DST change on 2024-03-10
+    hourly = _hourly(pd.bdate_range("2024-03-07", periods=3), "America/New_York")
+    bars = resample.resample(hourly, "4h", "SPY")
+    local = bars.index.tz_convert("America/New_York")
+    assert [t.strftime("%H:%M") for t in local] == ["09:30", "13:30"] * 3
+    first, second = hourly.iloc[:4], hourly.iloc[4:7]
+    assert bars.iloc[0]["Open"] == first["Open"].iloc[0]
+    assert bars.iloc[0]["High"] == first["High"].max() and bars.iloc[0]["Low"] == first["Low"].min()
+    assert bars.iloc[1]["Close"] == second["Close"].iloc[-1]
+    assert bars.iloc[1]["Volume"] == second["Volume"].sum()
+
+    hourly = _hourly(pd.bdate_range("2024-03-07", periods=2), "Europe/Berlin", "09:00", 9)
+    xetra = resample.resample(hourly, "4h", "SXRF.DE")
+    assert [t.strftime("%H:%M") for t in xetra.index.tz_convert("Europe/Berlin")] == ["09:00", "13:00", "17:00"] * 2
+
+
+def test_weekly_and_monthly_follow_sessions():
+    # New York daily bars, stamped at local midnight; Good Friday 2024-03-29 missing
+    days = [d for d in pd.bdate_range("2024-03-18", "2024-04-12") if d != pd.Timestamp("2024-03-29")]
+    daily = make_ohlcv(len(days), seed=4)
+    daily.index = pd.DatetimeIndex([d.tz_localize("America/New_York") for d in days]).tz_convert("UTC")
+
+    weekly = resample.resample(daily, "weekly", "SPY")
+    assert [t.date().isoformat() for t in weekly.index.tz_convert("America/New_York")] == [
+        "2024-03-18", "2024-03-25", "2024-04-01", "2024-04-08",
+    ]
+    assert weekly["Volume"].sum() == daily["Volume"].sum()
+    assert weekly["Close"].iloc[1] == daily.loc[daily.index < "2024-03-30", "Close"].iloc[-1]
+
+    # Frankfurt bars are stamped 22:00/23:00 UTC the day before
+    daily.index = pd.DatetimeIndex([d.tz_localize("Europe/Berlin") for d in days]).tz_convert("UTC")
+    monthly = resample.resample(daily, "monthly", "SXRF.DE")
+    assert len(monthly) == 2 and monthly["Open"].iloc[1] == daily.loc[daily.index >= "2024-03-31", "Open"].iloc[0]
+
+
+def test_cached_per_store_version(store):
+    parquet_store.save(make_ohlcv(400, seed=1), "daily", ticker="SPY")
+    first = resample.indicators("SPY", "weekly")
+    assert "RSI_14" in first.columns and len(first) < 100
+    assert resample.indicators("SPY", "weekly") is first
+
+    parquet_store.save(make_ohlcv(3, seed=2, start="2025-06-02"), "daily", ticker="SPY")
+    assert resample.indicators("SPY", "weekly") is not first
+
+
+def test_endpoint_serves_derived_timeframes(store, monkeypatch):
+    monkeypatch.setattr(orchestrator, "_states", StateCache(max_entries=4, max_bytes=1 << 30))
+    parquet_store.save(make_ohlcv(400, seed=1), "daily", ticker="SPY")
+    parquet_store.save(make_ohlcv(700, seed=1, freq="h"), "hourly", ticker="SPY")
+    parquet_store.save_metadata("SPY", False, None, ticker="SPY")
+    with patch("app.services.orchestrator.initialize"), \
+            patch("app.services.orchestrator._is_stale", return_value=False), \
+            patch("app.services.orchestrator.fetch_ticker_data") as fetch, \
+            TestClient(app) as client:
+        for timeframe in ("4h", "weekly", "monthly"):
+            resp = client.get(f"/api/indicators?ticker=SPY&timeframe={timeframe}")
+            assert resp.status_code == 200, timeframe
+            assert resp.json()["timeframe"] == timeframe and resp.json()["ohlcv"]
+        assert client.get("/api/indicators?ticker=SPY&timeframe=2h").status_code == 422
+    fetch.assert_not_called()
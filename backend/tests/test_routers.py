@@ -1,4 +1,5 @@
 import pytest
+from dataclasses import replace
 from unittest.mock import patch
 from fastapi.testclient import TestClient
 
@@ -8,6 +9,7 @@ from app.services.regime_detector import RegimeResult
 from app.services.heat_score import HeatScoreResult, ScoreComponent
 from app.services.dca_engine import DCAResult
 from app.models.enums import MarketRegime
+from app.services.symbol_guard import UnknownTickerError
 import pandas as pd
 
 
@@ -87,6 +89,21 @@ def test_heat_score(client):
     assert len(data["components"]) > 0
 
 
+def test_heat_score_with_intraday(client):
+    state = replace(
+        _mock_state(),
+        intraday_heat_score=HeatScoreResult(score=71.0, label="Hot", components=[]),
+        intraday_regime=RegimeResult(regime=MarketRegime.TREND_UP, risk_flags=[], confidence=0.8),
+        intraday_bar=["2024-01-02T15:30:00+00:00", 101.0],
+    )
+    assert client.get("/api/heat-score").json()["intraday"] is None
+    with patch("app.routers.heat_score.get_state", return_value=state):
+        data = client.get("/api/heat-score").json()
+    assert data["score"] == 50.0
+    assert data["intraday"]["score"] == 71.0 and data["intraday"]["regime"] == "Trend Up"
+    assert data["intraday"]["bar_time"] == "2024-01-02T15:30:00+00:00"
+
+
 def test_regime(client):
     resp = client.get("/api/regime")
     assert resp.status_code == 200
@@ -110,3 +127,37 @@ def test_report(client):
     data = resp.json()
     assert "markdown" in data
     assert len(data["markdown"]) > 0
+
+
+def test_cache_stats(client):
+    resp = client.get("/api/health/cache")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["entries"] >= 0
+    assert "evictions" in data
+
+
+def test_memory_footprint(client):
+    assert client.get("/api/health").json()["memory_bytes"] > 0
+    resp = client.get("/api/health/memory")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["peak_rss_bytes"] > 0
+    assert data["cached_bytes"] == sum(s["total_bytes"] for s in data["states"])
+
+
+def test_indicators_days_window(client):
+    idx = pd.date_range(end=pd.Timestamp.now(tz="UTC"), periods=90, freq="D")
+    df = pd.DataFrame({"Open": 1.0, "High": 1.0, "Low": 1.0, "Close": 1.0, "Volume": 1.0}, index=idx)
+    state = PipelineState(active_ticker="SPY", daily_df=df, hourly_df=df, ready=True)
+    with patch("app.routers.indicators.get_state", return_value=state):
+        full = client.get("/api/indicators")
+        recent = client.get("/api/indicators?days=30")
+    assert len(full.json()["ohlcv"]) == 90
+    assert 29 <= len(recent.json()["ohlcv"]) <= 31
+
+
+def test_unknown_ticker_returns_404(client):
+    with patch("app.routers.regime.get_state", side_effect=UnknownTickerError("GARBAGE", "empty")):
+        resp = client.get("/api/regime?ticker=GARBAGE")
+    assert resp.status_code == 404
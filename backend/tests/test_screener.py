@@ -0,0 +1,126 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import parquet_store, screener, symbol_guard
+from app.services.screener import ScreenerRow
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_SOURCE", "synthetic")
+    monkeypatch.setattr(parquet_store, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(screener, "_results", screener.ScreenerResults())
+    monkeypatch.setattr(screener, "_loaded", False)
+    return tmp_path
+
+
+@pytest.fixture
+def screener_cfg(monkeypatch):
+    real = screener.get_config()
+    def set_(**overrides):
+        cfg = {**real, "screener": {**real["screener"], **overrides}}
+        monkeypatch.setattr(screener, "get_config", lambda: cfg)
+    return set_
+
+
+def test_load_universe(tmp_path):
+    path = tmp_path / "u.txt"
+    path.write_text("# header\nspy\nQQQ  # nasdaq\n\nSPY\nbrk-b\n")
+    assert screener.load_universe(path) == ["SPY", "QQQ", "BRK-B"]
+    assert "SPY" in screener.load_universe()
+
+
+def test_run_scores_and_persists(env, screener_cfg):
+    screener_cfg(processes=0, download_concurrency=4)
+    results = screener.run(["AAA", "BBB", "CCC"])
+    assert results.universe_size == 3
+    assert all(r.error is None and 0 <= r.score <= 100 and r.regime for r in results.rows)
+    assert (env / "screener.json").exists()
+
+    # A new process picks the ranking up from disk
+    screener._results, screener._loaded = screener.ScreenerResults(), False
+    assert [r.ticker for r in screener.results().rows] == ["AAA", "BBB", "CCC"]
+
+
+def test_refetch_is_incremental(env, screener_cfg):
+    screener_cfg(processes=0)
+    assert screener._fetch_period("AAA") == screener.get_config()["data"]["daily_period"]
+    screener.run(["AAA"])
+    stored = len(parquet_store.load("daily", ticker="AAA"))
+    assert screener._fetch_period("AAA") in ("5d", "1mo")
+    screener.run(["AAA"])
+    assert len(parquet_store.load("daily", ticker="AAA")) == stored
+
+
+def test_failures_are_reported_per_symbol(env, screener_cfg):
+    screener_cfg(processes=0)
+    real = screener.fetch_daily
+    def flaky(ticker, period):
+        if ticker == "BAD":
+            raise ConnectionError("upstream down")
+        return real(ticker, period)
+    with patch.object(screener, "fetch_daily", flaky):
+        rows = screener.run(["AAA", "BAD"]).rows
+    assert rows[0].error is None
+    assert rows[1] == ScreenerRow(ticker="BAD", error="upstream down")
+
+
+def test_process_pool(env, screener_cfg):
+    screener_cfg(processes=2, download_concurrency=2)
+    try:
+        rows = screener.run(["AAA", "BBB"]).rows
+        assert [r.error for r in rows] == [None, None]
+        assert (env / "BBB" / "metadata.json").exists()
+
+        # Later runs reuse the started workers
+        pool = screener._pool
+        assert pool is not None
+        assert screener.run(["CCC"]).rows[0].error is None
+        assert screener._pool is pool
+    finally:
+        screener.shutdown()
+    assert screener._pool is None
+
+
+def test_universe_symbols_are_guarded(env, screener_cfg, tmp_path, monkeypatch):
+    screener_cfg(processes=0)
+    cache = symbol_guard.NegativeCache(tmp_path / "negative_symbols.json", ttl_seconds=3600)
+    monkeypatch.setattr(symbol_guard, "_negative_cache", cache)
+    symbol_guard.mark_unknown("GONE", "unknown symbol upstream")
+    with patch.object(screener, "fetch_daily", wraps=screener.fetch_daily) as fetch:
+        rows = screener.run(["AAA", "GONE", "BAD;SYM"]).rows
+    assert [c.args[0] for c in fetch.call_args_list] == ["AAA"]
+    assert rows[0].error is None
+    assert "unknown symbol upstream" in rows[1].error and "malformed" in rows[2].error
+
+
+def test_rank():
+    rows = [
+        ScreenerRow("A", score=70.0, regime="Trend Up", label="Hot"),
+        ScreenerRow("B", score=20.0, regime="Trend Down", label="Cold"),
+        ScreenerRow("C", score=45.0, regime="Trend Up", label="Neutral"),
+        ScreenerRow("D", error="no data"),
+    ]
+    assert [r.ticker for r in screener.rank(rows)] == ["B", "C", "A"]
+    assert [r.ticker for r in screener.rank(rows, descending=True, include_errors=True)] == ["A", "C", "B", "D"]
+    assert [r.ticker for r in screener.rank(rows, regime="Trend Up", min_score=50)] == ["A"]
+    with pytest.raises(ValueError):
+        screener.rank(rows, sort="volume")
+
+
+def test_endpoints(env, screener_cfg):
+    screener_cfg(processes=0)
+    screener.run(["AAA", "BBB", "CCC"])
+    with patch("app.services.orchestrator.initialize"), TestClient(app) as client:
+        data = client.get("/api/screener?sort=score&order=desc&limit=2").json()
+        assert data["total"] == 3 and len(data["entries"]) == 2
+        scores = [e["score"] for e in data["entries"]]
+        assert scores == sorted(scores, reverse=True)
+        assert client.get("/api/screener?sort=bogus").status_code == 422
+
+        with patch.object(screener, "run"):
+            resp = client.post("/api/screener/refresh")
+        assert resp.status_code == 202 and resp.json()["started"] is True
@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+
+from app.services.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_run():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def work():
+        calls.append(1)
+        release.wait(2)
+        return "result"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("SPY", work)))
+        for _ in range(5)
+    ]
+    for th in threads:
+        th.start()
+    time.sleep(0.05)
+    release.set()
+    for th in threads:
+        th.join()
+
+    assert len(calls) == 1
+    assert results == ["result"] * 5
+
+
+def test_different_keys_run_independently():
+    flight = SingleFlight()
+    assert flight.do("SPY", lambda: 1) == 1
+    assert flight.do("MSFT", lambda: 2) == 2
+
+
+def test_debounce_reuses_recent_result():
+    flight = SingleFlight(debounce_seconds=60)
+    calls = []
+
+    def work():
+        calls.append(1)
+        return len(calls)
+
+    assert flight.do("SPY", work) == 1
+    assert flight.do("SPY", work) == 1
+    flight.forget("SPY")
+    assert flight.do("SPY", work) == 2
+
+
+def test_without_debounce_sequential_calls_rerun():
+    flight = SingleFlight()
+    calls = []
+    flight.do("SPY", lambda: calls.append(1))
+    flight.do("SPY", lambda: calls.append(1))
+    assert len(calls) == 2
+
+
+def test_errors_propagate_and_are_not_cached():
+    flight = SingleFlight(debounce_seconds=60)
+
+    def boom():
+        raise ValueError("download failed")
+
+    with pytest.raises(ValueError):
+        flight.do("SPY", boom)
+    assert flight.do("SPY", lambda: "ok") == "ok"
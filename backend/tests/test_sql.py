@@ -0,0 +1,117 @@
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import parquet_store, sql_engine
+from app.services.indicator_engine import compute_indicators
+from tests.conftest import make_ohlcv
+
+pytest.importorskip("duckdb")
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(parquet_store, "DATA_DIR", tmp_path)
+    frames = {}
+    for i, ticker in enumerate(("SPY", "QQQ")):
+        raw = make_ohlcv(400, seed=i + 1, drift=-0.001, vol=0.02)
+        parquet_store.save(raw, "daily", ticker=ticker)
+        frames[ticker] = compute_indicators(raw)
+        parquet_store.save_indicators(frames[ticker], "daily", ticker=ticker)
+    return frames
+
+
+@pytest.fixture
+def sql_cfg(monkeypatch):
+    real = sql_engine.get_config()
+    monkeypatch.delenv("SQL_TOKEN", raising=False)
+    def set_(**overrides):
+        cfg = {**real, "sql": {**real["sql"], "enabled": True, "token": "secret", **overrides}}
+        monkeypatch.setattr(sql_engine, "get_config", lambda: cfg)
+    set_()
+    return set_
+
+
+@pytest.fixture
+def client(sql_cfg):
+    with patch("app.services.orchestrator.initialize"):
+        with TestClient(app) as c:
+            yield c
+
+
+def _query(client, query, **body):
+    resp = client.post("/api/sql", json={"query": query, **body}, headers={"X-SQL-Token": "secret"})
+    if resp.status_code != 200:
+        return resp, None, None
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    return resp, lines[:-1], lines[-1]["_summary"]
+
+
+def test_cross_ticker_indicator_query(client, store):
+    resp, rows, summary = _query(client, """
+        SELECT ticker, count(*) AS n FROM indicators
+        WHERE timeframe = 'daily' AND RSI_14 < 30 AND drawdown < -0.10
+        GROUP BY ticker ORDER BY ticker
+    """)
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    expected = {
+        t: int(((df["RSI_14"] < 30) & (df["drawdown"] < -0.10)).sum()) for t, df in store.items()
+    }
+    assert {r["ticker"]: r["n"] for r in rows} == {t: n for t, n in expected.items() if n}
+    assert summary["rows"] == len(rows) and summary["truncated"] is False
+
+
+def test_bars_view_reads_the_dataset(client, store):
+    _, rows, _ = _query(client, """
+        SELECT ticker, max(Close) AS high_close, min(Datetime) AS first FROM bars
+        WHERE timeframe = 'daily' GROUP BY ticker ORDER BY ticker
+    """)
+    assert [r["ticker"] for r in rows] == ["QQQ", "SPY"]
+    assert rows[1]["high_close"] == pytest.approx(store["SPY"]["Close"].max())
+    assert rows[0]["first"].startswith("2024-01-02")
+
+
+@pytest.mark.parametrize("query", [
+    "CREATE TABLE t AS SELECT 1",
+    "COPY (SELECT 1) TO 'out.csv'",
+    "SELECT 1; SELECT 2",
+    "SELECT * FROM read_csv('/etc/passwd')",
+    "SELECT * FROM read_json('{data_dir}/SPY/metadata.json')",
+    "SELECT * FROM read_parquet('{data_dir}/SPY/daily/*.parquet')",
+    "SET enable_external_access = true",
+    "SELECT * FROM no_such_table",
+])
+def test_rejects_anything_but_a_sandboxed_select(client, store, query):
+    resp, _, _ = _query(client, query.format(data_dir=parquet_store.DATA_DIR))
+    assert resp.status_code == 400
+
+
+def test_row_limit_truncates(client, store, sql_cfg):
+    sql_cfg(max_rows=50)
+    _, rows, summary = _query(client, "SELECT * FROM indicators", max_rows=1000)
+    assert len(rows) == 50 and summary == {**summary, "rows": 50, "truncated": True}
+
+
+def test_timeout_interrupts(client, store, sql_cfg):
+    sql_cfg(timeout_seconds=0.2)
+    resp, _, _ = _query(client, "SELECT sum(a.range * b.range) FROM range(100000) a, range(100000) b")
+    assert resp.status_code == 504
+
+
+def test_busy_and_disabled(client, store, sql_cfg, monkeypatch):
+    monkeypatch.setattr(sql_engine, "_slots", threading.Semaphore(0))
+    assert _query(client, "SELECT 1")[0].status_code == 429
+    sql_cfg(enabled=False)
+    assert _query(client, "SELECT 1")[0].status_code == 404
+
+
+def test_requires_a_configured_token(client, store, sql_cfg):
+    resp = client.post("/api/sql", json={"query": "SELECT 1"}, headers={"X-SQL-Token": "wrong"})
+    assert resp.status_code == 403
+    assert client.post("/api/sql", json={"query": "SELECT 1"}).status_code == 403
+    sql_cfg(token="")
+    assert _query(client, "SELECT 1")[0].status_code == 404
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Budgets are generous for slow CI machines; locally import takes ~0.5s
+IMPORT_BUDGET_SECONDS = 2.0
+FIRST_RESPONSE_BUDGET_SECONDS = 1.0
+
+_IMPORT_PROBE = """
+import sys, time
+t = time.perf_counter()
+import app.main
+print(time.perf_counter() - t)
+loaded = [m for m in ("yfinance.base", "ta.momentum", "pandas.core.frame", "pyarrow.lib")
+          if m in sys.modules]
+print(",".join(loaded))
+"""
+
+
+def test_import_time_budget_and_lazy_heavy_libraries():
+    out = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    ).stdout.splitlines()
+    elapsed, loaded = float(out[0]), out[1] if len(out) > 1 else ""
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"import app.main took {elapsed:.2f}s"
+    assert loaded == "", f"Heavy modules loaded at import: {loaded}"
+
+
+def test_health_answers_while_warming_up():
+    release = threading.Event()
+
+    def slow_initialize():
+        release.wait(10)
+
+    with patch("app.services.orchestrator.initialize", side_effect=slow_initialize):
+        start = time.perf_counter()
+        with TestClient(app) as client:
+            resp = client.get("/api/health")
+            elapsed = time.perf_counter() - start
+            release.set()
+
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "initializing"
+    assert resp.json()["ready"] is False
+    assert elapsed < FIRST_RESPONSE_BUDGET_SECONDS, f"first response took {elapsed:.2f}s"
@@ -0,0 +1,108 @@
+import dataclasses
+
+import pandas as pd
+import pytest
+
+from app.services.heat_score import compute_heat_score
+from app.services.indicator_engine import compute_indicators
+from app.services.orchestrator import PipelineState
+from app.services.regime_detector import detect_regime
+from app.services.state_cache import StateCache, state_memory, state_nbytes
+
+
+def _state(rows: int = 100) -> PipelineState:
+    df = pd.DataFrame({"Close": [100.0] * rows})
+    return PipelineState(active_ticker="X", hourly_df=df, daily_df=df, ready=True)
+
+
+def test_hit_miss_counters():
+    cache = StateCache(max_entries=4, max_bytes=10**9)
+    cache.put("SPY", _state())
+    assert cache.get("SPY") is not None
+    assert cache.get("MSFT") is None
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.entries == 1
+
+
+def test_lru_eviction_by_count():
+    cache = StateCache(max_entries=2, max_bytes=10**9)
+    cache.put("A", _state())
+    cache.put("B", _state())
+    cache.get("A")  # B is now least recently used
+    cache.put("C", _state())
+    assert "A" in cache
+    assert "B" not in cache
+    assert "C" in cache
+    assert cache.stats().evictions == 1
+
+
+def test_eviction_by_bytes():
+    one = state_nbytes(_state())
+    cache = StateCache(max_entries=100, max_bytes=int(one * 2.5))
+    for t in ["A", "B", "C", "D"]:
+        cache.put(t, _state())
+    stats = cache.stats()
+    assert stats.entries == 2
+    assert stats.resident_bytes <= stats.max_bytes
+
+
+def test_pinned_entries_survive():
+    cache = StateCache(max_entries=1, max_bytes=10**9)
+    cache.pin(["SPY"])
+    cache.put("SPY", _state())
+    cache.put("A", _state())
+    cache.put("B", _state())
+    assert "SPY" in cache
+    assert "B" in cache
+    assert "A" not in cache
+
+
+def test_replacing_entry_keeps_bytes_consistent():
+    cache = StateCache(max_entries=4, max_bytes=10**9)
+    cache.put("SPY", _state(10))
+    cache.put("SPY", _state(1000))
+    assert cache.stats().resident_bytes == state_nbytes(_state(1000))
+
+
+def test_states_are_immutable_snapshots():
+    state = _state()
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        state.ready = False
+
+
+def test_publish_swaps_whole_snapshot():
+    cache = StateCache(max_entries=4, max_bytes=10**9)
+    first = PipelineState(active_ticker="SPY", ready=True, version=1)
+    cache.put("SPY", first)
+    pinned = cache.get("SPY")
+    cache.put("SPY", PipelineState(active_ticker="SPY", ready=True, version=2))
+    # A reader holding the old snapshot keeps a consistent view
+    assert pinned.version == 1
+    assert cache.get("SPY").version == 2
+
+
+def test_memory_breakdown_per_ticker():
+    cache = StateCache(max_entries=4, max_bytes=10**9)
+    small, large = _state(100), _state(10_000)
+    cache.put("A", small)
+    mem = cache.put("B", dataclasses.replace(large, report="x" * 5000))
+    assert mem.hourly_bytes == mem.daily_bytes >= 10_000 * 8
+    assert mem.report_bytes >= 5000
+    assert mem.mapped_bytes == 0
+    breakdown = cache.memory()
+    assert set(breakdown) == {"A", "B"}
+    assert cache.stats().resident_bytes == sum(m.total_bytes for m in breakdown.values())
+
+
+def test_intraday_results_count_towards_memory(sample_ohlcv):
+    latest = compute_indicators(sample_ohlcv).iloc[-1].to_dict()
+    base = _state()
+    intraday = dataclasses.replace(
+        base,
+        intraday_heat_score=compute_heat_score(latest, timeframe="hourly"),
+        intraday_regime=detect_regime(latest, timeframe="hourly"),
+        intraday_bar=["2024-01-02T15:00:00+00:00", latest["Close"]],
+    )
+    assert state_memory(intraday).results_bytes > state_memory(base).results_bytes
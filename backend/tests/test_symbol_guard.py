@@ -0,0 +1,82 @@
+import time
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+
+from app.services import data_fetcher, orchestrator, symbol_guard
+from app.services.data_fetcher import FetchResult, UpstreamUnavailable
+from app.services.symbol_guard import NegativeCache, UnknownTickerError
+
+
+@pytest.fixture
+def negative_cache(tmp_path, monkeypatch):
+    cache = NegativeCache(tmp_path / "negative_symbols.json", ttl_seconds=3600)
+    monkeypatch.setattr(symbol_guard, "_negative_cache", cache)
+    return cache
+
+
+def test_malformed_symbols_rejected(negative_cache):
+    for bad in ["", "SPY;DROP", "../etc", "A" * 30, "SP Y"]:
+        with pytest.raises(UnknownTickerError):
+            symbol_guard.check_symbol(bad)
+
+
+def test_valid_symbols_pass(negative_cache):
+    for good in ["SPY", "SXRF.DE", "BRK-B", "^GSPC", "EURUSD=X"]:
+        symbol_guard.check_symbol(good)
+
+
+def test_cached_symbol_rejected_and_persisted(negative_cache, tmp_path):
+    symbol_guard.mark_unknown("GARBAGE", "no bars returned by upstream")
+    with pytest.raises(UnknownTickerError, match="no bars"):
+        symbol_guard.check_symbol("GARBAGE")
+
+    reloaded = NegativeCache(tmp_path / "negative_symbols.json", ttl_seconds=3600)
+    assert reloaded.get("GARBAGE") == "no bars returned by upstream"
+
+
+def test_entries_expire(tmp_path):
+    cache = NegativeCache(tmp_path / "negative_symbols.json", ttl_seconds=0.01)
+    cache.add("GARBAGE", "empty")
+    time.sleep(0.02)
+    assert cache.get("GARBAGE") is None
+
+
+def test_configured_symbols_include_etfs():
+    assert {"SPY", "SXRF.DE", "MSFT", "VUAA.AS"} <= symbol_guard.configured_symbols()
+
+
+def _empty_fetch(ticker):
+    empty = pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"])
+    return FetchResult(hourly=empty, daily=empty, active_ticker=ticker, used_fallback=False)
+
+
+@pytest.mark.parametrize("fetch", [_empty_fetch, Mock(side_effect=ConnectionError("rate limited"))])
+def test_transient_failures_do_not_blacklist(negative_cache, monkeypatch, fetch):
+    monkeypatch.setattr(orchestrator, "fetch_ticker_data", fetch)
+    monkeypatch.setattr(orchestrator, "symbol_exists", lambda ticker: None)
+    with pytest.raises((UpstreamUnavailable, ConnectionError)):
+        orchestrator._fetch_and_publish("NVDA")
+    symbol_guard.check_symbol("NVDA")
+
+
+def test_confirmed_unknown_symbol_is_cached(negative_cache, monkeypatch):
+    monkeypatch.setattr(orchestrator, "fetch_ticker_data", _empty_fetch)
+    monkeypatch.setattr(orchestrator, "symbol_exists", lambda ticker: False)
+    with pytest.raises(UnknownTickerError):
+        orchestrator._fetch_and_publish("NOPE")
+    with pytest.raises(UnknownTickerError, match="unknown symbol"):
+        symbol_guard.check_symbol("NOPE")
+
+
+def test_symbol_exists_only_false_when_upstream_says_missing(monkeypatch):
+    from yfinance.exceptions import YFRateLimitError, YFTzMissingError
+
+    monkeypatch.setenv("DATA_SOURCE", "yfinance")
+    yf = Mock()
+    monkeypatch.setattr(data_fetcher, "yf", yf)
+    yf.Ticker.return_value.history.side_effect = YFTzMissingError("NOPE")
+    assert data_fetcher.symbol_exists("NOPE") is False
+    yf.Ticker.return_value.history.side_effect = YFRateLimitError()
+    assert data_fetcher.symbol_exists("NVDA") is None
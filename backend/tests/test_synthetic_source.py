@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from app.services import data_fetcher, synthetic_source
+
+
+def test_download_is_deterministic_per_symbol():
+    a = synthetic_source.download("SPY", "1d", "2y")
+    b = synthetic_source.download("SPY", "1d", "2y")
+    other = synthetic_source.download("MSFT", "1d", "2y")
+    assert a.equals(b)
+    assert not a["Close"].equals(other["Close"])
+    assert (a["High"] >= a["Close"]).all() and (a["Low"] <= a["Close"]).all()
+
+
+def test_hourly_bars_are_closed_session_hours():
+    df = synthetic_source.download("SPY", "1h", "30d")
+    assert set(df.index.hour) <= set(synthetic_source._SESSION_HOURS)
+    assert df.index.max() <= datetime.now(timezone.utc)
+    assert df.index.is_monotonic_increasing
+
+
+def test_earlier_bars_are_stable_as_time_passes():
+    early = datetime(2025, 3, 3, 18, tzinfo=timezone.utc)
+    later = datetime(2025, 3, 5, 18, tzinfo=timezone.utc)
+    a = synthetic_source._bar_index("1h", early)
+    b = synthetic_source._bar_index("1h", later)
+    assert b[: len(a)].equals(a)
+
+
+def test_fetcher_uses_synthetic_source(monkeypatch):
+    monkeypatch.setenv("DATA_SOURCE", "synthetic")
+    with patch.object(data_fetcher.yf, "download", side_effect=AssertionError("network")):
+        result = data_fetcher.fetch_ticker_data("QQQ")
+    assert len(result.hourly) > 100 and len(result.daily) > 100
+    assert result.daily.index.tz is not None
@@ -17,6 +17,8 @@ export interface HealthResponse {
   hourly_rows: number;
   daily_rows: number;
   ready: boolean;
+  version: number;
+  memory_bytes: number;
 }
 
 export interface ScoreComponent {